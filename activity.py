@@ -0,0 +1,268 @@
+"""
+Compact, bounded in-memory user activity tracking.
+
+Each tracked user is a `UserRecord` with `__slots__`, epoch-second
+timestamps and a bitmask of activity types. `ActivityTracker` caps the number
+of users kept in memory, evicting the least recently active ones and anything
+idle for longer than the TTL. Evicted users are handed to `on_evict` so they
+can be spilled to the persistent store; the active-user window may count a
+returning evicted user twice until their old minute leaves it (see
+ActivityTracker).
+
+`ActivityWindow` keeps per-minute buckets of users by last activity so that
+/stats can report active users for the last hour, day and week in constant
+time.
+"""
+import time
+from itertools import chain, islice, pairwise
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Bit positions are persisted, so only ever append to this tuple
+ACTIVITY_TYPES = ("message", "start_command", "left_group")
+_ACTIVITY_BITS = {name: 1 << index for index, name in enumerate(ACTIVITY_TYPES)}
+
+
+def activity_bit(activity_type: str) -> int:
+    """Return the bitmask for an activity type."""
+    bit = _ACTIVITY_BITS.get(activity_type)
+    if bit is None:
+        raise ValueError(f"Unknown activity type: {activity_type}")
+    return bit
+
+
+def activity_names(mask: int) -> List[str]:
+    """Expand a bitmask back into activity type names."""
+    return [name for name, bit in _ACTIVITY_BITS.items() if mask & bit]
+
+
+class ActivityWindow:
+    """Sliding-window count of users by the minute of their last activity.
+
+    Every user sits in exactly one bucket (the minute they were last active),
+    so summing buckets counts distinct users. Running sums per view are moved
+    forward lazily as the clock advances, making `count` O(1) amortized.
+    """
+
+    VIEWS = {"1h": 3600, "24h": 86400, "7d": 7 * 86400}
+
+    def __init__(self, bucket_seconds: int = 60, views: Optional[Dict[str, int]] = None):
+        self.bucket_seconds = bucket_seconds
+        self.views = {name: max(1, span // bucket_seconds) for name, span in (views or self.VIEWS).items()}
+        self.horizon = max(self.views.values())
+        self._buckets = [0] * self.horizon
+        self._sums = dict.fromkeys(self.views, 0)
+        self._head: Optional[int] = None
+
+    def _advance(self, bucket: int) -> None:
+        head = self._head
+        if head is None or bucket - head >= self.horizon:
+            self._buckets = [0] * self.horizon
+            self._sums = dict.fromkeys(self.views, 0)
+            self._head = bucket
+            return
+        buckets, horizon = self._buckets, self.horizon
+        for step in range(head + 1, bucket + 1):
+            for name, span in self.views.items():
+                self._sums[name] -= buckets[(step - span) % horizon]
+            buckets[step % horizon] = 0
+        self._head = max(head, bucket)
+
+    def add(self, timestamp: int, delta: int = 1) -> None:
+        """Count (or with delta=-1 uncount) a user last active at `timestamp`."""
+        bucket = timestamp // self.bucket_seconds
+        if self._head is None or bucket > self._head:
+            self._advance(bucket)
+        age = self._head - bucket
+        if age >= self.horizon:
+            return
+        self._buckets[bucket % self.horizon] += delta
+        for name, span in self.views.items():
+            if age < span:
+                self._sums[name] += delta
+
+    def move(self, old_timestamp: int, new_timestamp: int) -> None:
+        """Move a user from the bucket of `old_timestamp` to that of `new_timestamp`."""
+        if old_timestamp // self.bucket_seconds == new_timestamp // self.bucket_seconds:
+            return
+        self.add(new_timestamp)
+        self.add(old_timestamp, -1)
+
+    def count(self, view: str = "24h", now: Optional[int] = None) -> int:
+        """Return the number of users active within the given view."""
+        if now is not None:
+            bucket = now // self.bucket_seconds
+            if self._head is None or bucket > self._head:
+                self._advance(bucket)
+        return self._sums[view]
+
+
+class UserRecord:
+    """Activity of one user."""
+    __slots__ = ("username", "first_seen", "last_activity", "message_count", "activity_mask")
+
+    def __init__(self, username: Optional[str], first_seen: int, last_activity: int,
+                 message_count: int = 0, activity_mask: int = 0):
+        self.username = username
+        self.first_seen = first_seen
+        self.last_activity = last_activity
+        self.message_count = message_count
+        self.activity_mask = activity_mask
+
+    @property
+    def activity_types(self) -> List[str]:
+        return activity_names(self.activity_mask)
+
+
+class ActivityTracker:
+    """Bounded user_id -> UserRecord map with approximate LRU and TTL eviction.
+
+    Message totals and the active-user window are maintained incrementally.
+    Evicted users stay counted in the window at their last activity. A user
+    evicted by the size cap who comes back is counted again at the new
+    minute, so they are counted twice in every view whose span still covers
+    the old minute: up to an hour in "1h", a day in "24h" and a week in "7d".
+    With the default cap this only happens once more users are active within
+    a week than fit in memory.
+
+    Records live in a plain dict kept in last-activity order by re-inserting
+    on every touch, which is cheaper in memory than an OrderedDict. When the
+    cap is exceeded the oldest `evict_batch` users are dropped in one pass.
+    """
+
+    def __init__(
+        self,
+        max_users: int = 100_000,
+        ttl: float = 30 * 86400,
+        evict_batch: int = 0,
+        on_evict: Optional[Callable[[int, UserRecord], None]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_users = max_users
+        self.ttl = ttl
+        self.evict_batch = evict_batch or max(1, max_users // 100)
+        self.on_evict = on_evict
+        self.clock = clock
+        self.evicted = 0
+        self.total_messages = 0
+        self.window = ActivityWindow()
+        self._records: Dict[int, UserRecord] = {}
+        self._next_ttl_sweep = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._records
+
+    def get(self, user_id: int) -> Optional[UserRecord]:
+        return self._records.get(user_id)
+
+    def values(self) -> Iterator[UserRecord]:
+        return iter(self._records.values())
+
+    def items(self) -> Iterator[Tuple[int, UserRecord]]:
+        return iter(self._records.items())
+
+    def track(self, user_id: int, username: Optional[str], activity_type: str,
+              now: Optional[int] = None) -> UserRecord:
+        """Record one activity for a user and return the updated record."""
+        if now is None:
+            now = int(self.clock())
+        records = self._records
+        record = records.pop(user_id, None)
+        if record is None:
+            record = UserRecord(username, now, now)
+            self.window.add(now)
+        else:
+            self.window.move(record.last_activity, now)
+            record.last_activity = now
+            if username:
+                record.username = username
+        if activity_type == "message":
+            record.message_count += 1
+            self.total_messages += 1
+        record.activity_mask |= activity_bit(activity_type)
+        records[user_id] = record
+
+        if len(records) > self.max_users:
+            self._evict_oldest(len(records) - self.max_users + self.evict_batch - 1)
+        if now >= self._next_ttl_sweep:
+            self.evict_expired(now)
+        return record
+
+    def merge(self, rows: Iterable[Tuple[int, Optional[str], int, int, int, int]]) -> None:
+        """Merge saved records, e.g. while warming up from the store.
+
+        Rows are (user_id, username, first_seen, last_activity,
+        message_count, activity_mask). Saved records are usually older than
+        the users tracked since startup, so the map is rebuilt in
+        last-activity order instead of appending them; eviction then drops
+        the stalest users, saved or live.
+        """
+        loaded = []
+        moved = False
+        for user_id, username, first_seen, last_activity, message_count, activity_mask in rows:
+            self.total_messages += message_count
+            record = self._records.get(user_id)
+            if record is None:
+                self.window.add(last_activity)
+                loaded.append((user_id, UserRecord(username, first_seen, last_activity,
+                                                   message_count, activity_mask)))
+                continue
+            # The user was seen again before the saved record was loaded
+            record.username = record.username or username
+            record.first_seen = min(record.first_seen, first_seen)
+            if last_activity > record.last_activity:
+                self.window.move(record.last_activity, last_activity)
+                record.last_activity = last_activity
+                moved = True
+            record.message_count += message_count
+            record.activity_mask |= activity_mask
+
+        times = chain((self._newest(),), (record.last_activity for _, record in loaded))
+        if not moved and all(earlier <= later for earlier, later in pairwise(times)):
+            # Everything loaded is newer than the users in memory: appending keeps the order
+            self._records.update(loaded)
+        else:
+            # Both parts are (nearly) sorted runs, which sorted() merges in about linear time
+            self._records = dict(sorted(chain(self._records.items(), loaded),
+                                        key=lambda item: item[1].last_activity))
+
+        if len(self._records) > self.max_users:
+            self._evict_oldest(len(self._records) - self.max_users)
+        self.evict_expired()
+
+    def _newest(self) -> int:
+        """Last activity of the most recently active user in memory, or 0."""
+        for record in reversed(self._records.values()):
+            return record.last_activity
+        return 0
+
+    def active_users(self, view: str = "24h") -> int:
+        """Return users active within `view` ("1h", "24h" or "7d") in O(1)."""
+        return self.window.count(view, int(self.clock()))
+
+    def _evict(self, user_ids: List[int]) -> None:
+        for user_id in user_ids:
+            record = self._records.pop(user_id)
+            if self.on_evict:
+                self.on_evict(user_id, record)
+        self.evicted += len(user_ids)
+
+    def _evict_oldest(self, count: int) -> None:
+        self._evict(list(islice(self._records, count)))
+
+    def evict_expired(self, now: Optional[int] = None) -> int:
+        """Evict users idle for longer than the TTL and return how many were dropped."""
+        if now is None:
+            now = int(self.clock())
+        # Sweep at most once per hundredth of the TTL
+        self._next_ttl_sweep = now + max(1, int(self.ttl / 100))
+        cutoff = now - self.ttl
+        expired = []
+        for user_id, record in self._records.items():
+            if record.last_activity >= cutoff:
+                break
+            expired.append(user_id)
+        self._evict(expired)
+        return len(expired)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for user activity tracking.
+
+Reports bytes per tracked user for the compact ActivityTracker and, with
+--legacy, for the old dict-of-dicts representation.
+
+Usage: python bench_activity_memory.py [--users 100000 1000000] [--legacy]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime
+
+from activity import ActivityTracker
+
+
+def fill_tracker(count: int) -> ActivityTracker:
+    tracker = ActivityTracker(max_users=count)
+    now = int(time.time())
+    for user_id in range(count):
+        tracker.track(user_id, f"user{user_id}", "message", now=now)
+    return tracker
+
+
+def fill_legacy(count: int) -> dict:
+    user_activity = {}
+    for user_id in range(count):
+        current_time = datetime.now()
+        user_activity[user_id] = {
+            'username': f"user{user_id}",
+            'first_seen': current_time,
+            'last_activity': current_time,
+            'message_count': 1,
+            'activity_types': ['message']
+        }
+    return user_activity
+
+
+def measure(fill, count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    data = fill(count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+    return current / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--legacy", action="store_true", help="also measure the old dict representation")
+    args = parser.parse_args()
+
+    for count in args.users:
+        print(f"👥 {count:>9,} users - ActivityTracker: {measure(fill_tracker, count):6.1f} bytes/user")
+        if args.legacy:
+            print(f"👥 {count:>9,} users - legacy dicts:     {measure(fill_legacy, count):6.1f} bytes/user")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+End-to-end throughput benchmark for the bot's handler pipeline.
+
+Feeds synthetic Update objects straight into `Application.process_update`
+with the HTTP backend replaced by StubRequest, and measures each scenario:
+
+- group_message: handle_group_message (plus the group-0 debug trace)
+- button: button_handler
+- chat_member: handle_chat_member_update / welcome_new_member
+- debug_trace: debug_all_messages alone (private text message)
+
+Reports updates/s, p50/p99 latency and peak bytes allocated per update, and
+writes the results as JSON so runs can be compared with --compare.
+
+With --queued the updates go through the running application's update
+queue instead, so they are processed concurrently (per-chat ordered, up to
+UPDATE_CONCURRENCY at once) and latency is measured from enqueueing to the
+last handler. Combine with --latency to see what concurrency buys when the
+Bot API is slow:
+
+    UPDATE_CONCURRENCY=1 python bench_handlers.py --queued --latency 0.2 --updates 500
+    python bench_handlers.py --queued --latency 0.2 --updates 500
+
+Usage: python bench_handlers.py [--updates 5000] [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import asyncio
+import atexit
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("BOT_TOKEN_ENG", "123456:BENCHMARK")
+os.environ.setdefault("BOT_DB_PATH", os.path.join(tempfile.mkdtemp(), "bench.sqlite3"))
+# Measure handler cost, not the outbound rate cap
+os.environ.setdefault("OUTBOUND_RATE", "1000000")
+
+import telegram  # noqa: E402
+from telegram import Update  # noqa: E402
+from telegram.ext import TypeHandler  # noqa: E402
+
+import bot  # noqa: E402
+from fake_bot_api import BOT_USER, StubRequest  # noqa: E402
+from logging_setup import parse_sampling, setup_logging  # noqa: E402
+
+GROUP_ID = -1001234567890
+MESSAGES = ["hello everyone", "how does mining work?", "download link please", "привет",
+            "any news?", "what about the token?", "nice project", "help"]
+BUTTONS = ["overview", "points", "missions", "referral", "roadmap", "download",
+           "security", "faq", "social", "language_groups", "back"]
+
+
+def user(user_id: int) -> dict:
+    return {"id": user_id, "is_bot": False, "first_name": f"User{user_id}", "username": f"user{user_id}"}
+
+
+def make_update(scenario: str, index: int, rng: random.Random) -> dict:
+    now = int(time.time())
+    group = {"id": GROUP_ID - index % 50, "type": "supergroup", "title": "Benchmark Group"}
+    if scenario == "group_message":
+        return {"update_id": index, "message": {
+            "message_id": index, "date": now, "chat": group,
+            "from": user(1000 + index % 5000), "text": rng.choice(MESSAGES)}}
+    if scenario == "debug_trace":
+        sender = user(1000 + index % 5000)
+        return {"update_id": index, "message": {
+            "message_id": index, "date": now, "chat": {"id": sender["id"], "type": "private"},
+            "from": sender, "text": rng.choice(MESSAGES)}}
+    if scenario == "button":
+        return {"update_id": index, "callback_query": {
+            "id": str(index), "from": user(1000 + index % 5000), "chat_instance": "1",
+            "data": rng.choice(BUTTONS),
+            "message": {"message_id": index % 200, "date": now, "chat": group,
+                        "from": BOT_USER, "text": "Main menu:"}}}
+    if scenario == "chat_member":
+        member = user(1000 + index)
+        return {"update_id": index, "chat_member": {
+            "chat": group, "from": member, "date": now,
+            "old_chat_member": {"status": "left", "user": member},
+            "new_chat_member": {"status": "member", "user": member}}}
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run_scenario(application, scenario: str, count: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    random.seed(seed)
+    updates = [Update.de_json(make_update(scenario, index, rng), application.bot) for index in range(count)]
+
+    # Warm-up pass, then timed pass
+    for update in updates[: min(200, count)]:
+        await application.process_update(update)
+
+    latencies = []
+    started = time.perf_counter()
+    for update in updates:
+        update_started = time.perf_counter()
+        await application.process_update(update)
+        latencies.append(time.perf_counter() - update_started)
+    elapsed = time.perf_counter() - started
+
+    # Allocation pass on a sample, traced separately so tracing does not skew timings
+    sample = updates[: min(500, count)]
+    tracemalloc.start()
+    peak_total = 0
+    for update in sample:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        await application.process_update(update)
+        peak_total += tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    return {
+        "updates": count,
+        "updates_per_second": round(count / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "peak_alloc_bytes_per_update": round(peak_total / len(sample)),
+    }
+
+
+async def run_queued_scenario(application, scenario: str, count: int, seed: int,
+                              finished: dict) -> dict:
+    rng = random.Random(seed)
+    random.seed(seed)
+    updates = [Update.de_json(make_update(scenario, index, rng), application.bot) for index in range(count)]
+
+    enqueued = {}
+    finished.clear()
+    started = time.perf_counter()
+    for update in updates:
+        enqueued[update.update_id] = time.perf_counter()
+        await application.update_queue.put(update)
+    await application.update_queue.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = [finished[update_id] - enqueued[update_id] for update_id in enqueued]
+    return {
+        "updates": count,
+        "updates_per_second": round(count / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "peak_alloc_bytes_per_update": 0,
+    }
+
+
+async def run(args) -> dict:
+    request = StubRequest(latency=args.latency)
+    application = bot.build_application(request=request)
+    finished = {}
+    if args.queued:
+        async def mark_finished(update: Update, context) -> None:
+            finished[update.update_id] = time.perf_counter()
+        # Runs after every other handler group
+        application.add_handler(TypeHandler(Update, mark_finished), group=1000)
+    await application.initialize()
+    if args.queued:
+        await application.start()
+    try:
+        results = {}
+        for scenario in args.scenarios:
+            if args.queued:
+                results[scenario] = await run_queued_scenario(application, scenario, args.updates, args.seed, finished)
+            else:
+                results[scenario] = await run_scenario(application, scenario, args.updates, args.seed)
+            print(f"⚡ {scenario:14} {results[scenario]['updates_per_second']:>9,.0f} updates/s  "
+                  f"p50 {results[scenario]['p50_ms']:.3f}ms  p99 {results[scenario]['p99_ms']:.3f}ms  "
+                  f"{results[scenario]['peak_alloc_bytes_per_update']:,} B/update")
+    finally:
+        if application.running:
+            await application.stop()
+        await application.shutdown()
+    return {
+        "meta": {
+            "timestamp": int(time.time()),
+            "python": platform.python_version(),
+            "python_telegram_bot": telegram.__version__,
+            "updates_per_scenario": args.updates,
+            "api_latency": args.latency,
+            "queued": args.queued,
+            "update_concurrency": bot.UPDATE_CONCURRENCY if args.queued else 1,
+            "api_calls": dict(request.calls),
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline_path: str) -> None:
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    print(f"\n📊 Compared with {baseline_path}:")
+    for scenario, result in current["results"].items():
+        if scenario not in baseline:
+            continue
+        before, after = baseline[scenario]["updates_per_second"], result["updates_per_second"]
+        change = (after - before) / before * 100 if before else 0.0
+        print(f"   {scenario:14} {before:>9,.0f} -> {after:>9,.0f} updates/s ({change:+.1f}%)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--updates", type=int, default=5000, help="updates per scenario")
+    parser.add_argument("--scenarios", nargs="+", default=["group_message", "button", "chat_member", "debug_trace"])
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated Bot API latency in seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--queued", action="store_true",
+                        help="feed updates through the running application's update queue (concurrent)")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON file from an earlier run")
+    args = parser.parse_args()
+
+    # Same logging pipeline as the bot (LOG_SAMPLING applies), output discarded
+    atexit.unregister(bot.log_listener.stop)
+    bot.log_listener.stop()
+    listener = setup_logging(
+        json_output=os.getenv("LOG_FORMAT", "json") == "json",
+        sampling=parse_sampling(os.getenv("LOG_SAMPLING", "")),
+        stream=open(os.devnull, "w"),
+    )
+
+    results = asyncio.run(run(args))
+    listener.stop()
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Memory and CPU of N language bots: one process per bot versus one process hosting all.
+
+Runs the local Bot API stand-in in this process, with synthetic traffic
+spread evenly over N bot tokens, then starts bot.py in two setups:
+
+- separate: N processes, each with one bot in BOT_TOKENS;
+- hosted: one process with all N bots in BOT_TOKENS.
+
+After a warm-up it samples the bot processes for the measurement window:
+resident memory (RSS, and PSS where the kernel reports it, which splits
+shared pages between processes instead of counting them once per process)
+and CPU time (user + system), along with the updates they confirmed.
+
+Usage: python bench_hosting.py [--bots 4] [--rate 100] [--warmup 10] [--duration 30] [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+from fake_bot_api import FakeBotAPI, TrafficDriver
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+
+def memory_bytes(pid: int) -> Dict[str, int]:
+    """Resident and proportional set size of a process, in bytes."""
+    sizes = {}
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                sizes["rss"] = int(line.split()[1]) * 1024
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    sizes["pss"] = int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return sizes
+
+
+def cpu_seconds(pid: int) -> float:
+    """User plus system CPU time of a process."""
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    # utime and stime are fields 14 and 15 of /proc/<pid>/stat
+    return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+
+def bot_env(bots: List[Tuple[str, str]], base_url: str, port: int, workdir: str) -> dict:
+    env = dict(os.environ)
+    env.update(
+        BOT_TOKENS=",".join(f"{name}={token}" for name, token in bots),
+        BOT_API_BASE_URL=base_url,
+        BOT_DB_PATH=os.path.join(workdir, f"bot-{port}.sqlite3"),
+        PORT=str(port),
+        LOG_LEVEL="WARNING",
+        LOG_FORMAT="text",
+    )
+    return env
+
+
+async def run_setup(name: str, api: FakeBotAPI, processes: List[List[Tuple[str, str]]],
+                    base_url: str, args, workdir: str) -> dict:
+    """Start one bot.py per entry of `processes`, then measure them."""
+    procs = [
+        subprocess.Popen(
+            [sys.executable, os.path.join(HERE, "bot.py")], cwd=HERE,
+            env=bot_env(bots, base_url, args.port + 1 + index, workdir),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        for index, bots in enumerate(processes)
+    ]
+    try:
+        await asyncio.sleep(args.warmup)
+        for proc in procs:
+            if proc.poll() is not None:
+                raise RuntimeError(f"bot.py exited with {proc.returncode} during warm-up ({name})")
+
+        cpu_before = sum(cpu_seconds(proc.pid) for proc in procs)
+        confirmed_before = api.confirmed_updates
+        started = time.monotonic()
+        samples: List[Dict[str, int]] = []
+        while time.monotonic() - started < args.duration:
+            await asyncio.sleep(1.0)
+            sample: Dict[str, int] = {}
+            for proc in procs:
+                for kind, size in memory_bytes(proc.pid).items():
+                    sample[kind] = sample.get(kind, 0) + size
+            samples.append(sample)
+        elapsed = time.monotonic() - started
+        cpu = sum(cpu_seconds(proc.pid) for proc in procs) - cpu_before
+        updates = api.confirmed_updates - confirmed_before
+    finally:
+        for proc in procs:
+            proc.send_signal(signal.SIGINT)
+        for proc in procs:
+            try:
+                proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    def mean_mb(kind: str) -> Optional[float]:
+        values = [sample[kind] for sample in samples if kind in sample]
+        return round(sum(values) / len(values) / 2**20, 1) if values else None
+
+    return {
+        "processes": len(procs),
+        "rss_mb": mean_mb("rss"),
+        "pss_mb": mean_mb("pss"),
+        "cpu_seconds": round(cpu, 2),
+        "cpu_percent": round(cpu / elapsed * 100, 1),
+        "updates_per_second": round(updates / elapsed, 1),
+        "cpu_ms_per_update": round(cpu / updates * 1000, 3) if updates else None,
+    }
+
+
+async def run(args) -> dict:
+    bots = [(f"l{index}", f"{100001 + index}:HOSTING") for index in range(args.bots)]
+    api = FakeBotAPI(latency=args.latency, seed=args.seed)
+    runner = web.AppRunner(api.app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", args.port).start()
+    base_url = f"http://127.0.0.1:{args.port}/bot"
+    driver = TrafficDriver(api, args.rate, seed=args.seed, tokens=[token for _, token in bots])
+    traffic = asyncio.create_task(driver.run())
+
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            setups = {
+                "separate": [[bot] for bot in bots],
+                "hosted": [bots],
+            }
+            for name in args.setups:
+                results[name] = await run_setup(name, api, setups[name], base_url, args, workdir)
+                result = results[name]
+                print(f"📦 {name:9} {result['processes']} process(es)  RSS {result['rss_mb']} MB  "
+                      f"PSS {result['pss_mb']} MB  CPU {result['cpu_percent']}%  "
+                      f"{result['updates_per_second']} updates/s  {result['cpu_ms_per_update']} ms CPU/update",
+                      flush=True)
+    finally:
+        traffic.cancel()
+        await runner.cleanup()
+
+    return {
+        "meta": {
+            "timestamp": int(time.time()),
+            "python": platform.python_version(),
+            "bots": args.bots,
+            "rate": args.rate,
+            "api_latency": args.latency,
+            "warmup": args.warmup,
+            "duration": args.duration,
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bots", type=int, default=4, help="number of language bots")
+    parser.add_argument("--rate", type=float, default=100.0, help="synthetic updates per second across all bots")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated Bot API latency in seconds")
+    parser.add_argument("--warmup", type=float, default=10.0, help="seconds before measuring")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to measure")
+    parser.add_argument("--setups", nargs="+", default=["separate", "hosted"], choices=["separate", "hosted"])
+    parser.add_argument("--port", type=int, default=8181, help="stand-in port; bots use the following ports")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    separate, hosted = results["results"].get("separate"), results["results"].get("hosted")
+    if separate and hosted:
+        print(f"\n📊 Hosting {args.bots} bots in one process: "
+              f"RSS {separate['rss_mb']} -> {hosted['rss_mb']} MB, "
+              f"PSS {separate['pss_mb']} -> {hosted['pss_mb']} MB, "
+              f"CPU {separate['cpu_percent']}% -> {hosted['cpu_percent']}%")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for the group-message keyword matcher.
+
+Builds a KeywordMatcher over the bot's keyword sets plus synthetic keywords
+in several scripts, checks that it agrees with naive substring scans, and
+reports messages per second for both approaches.
+
+Usage: python bench_keywords.py [--keywords 10000] [--messages 20000]
+"""
+import argparse
+import random
+import time
+
+from keywords import KeywordMatcher
+
+GREETING_WORDS = ["hello", "hi", "مرحبا", "السلام عليكم", "hallo", "привет", "здравствуйте", "bonjour", "नमस्ते", "merhaba", "selam"]
+MINING_WORDS = ["mining", "mine", "تعدين", "نقاط", "points", "earn", "كسب"]
+DOWNLOAD_WORDS = ["app", "download", "تحميل", "تطبيق", "link", "رابط"]
+
+ALPHABETS = [
+    "abcdefghijklmnopqrstuvwxyz",
+    "абвгдежзийклмнопрстуфхцчшщыэюя",
+    "ابتثجحخدذرزسشصضطظعغفقكلمنهوي",
+    "कखगघचछजझटठडढणतथदधनपफबभमयरलवशसह",
+    "abcçdefgğhıijklmnoöprsştuüvyz",
+]
+
+
+def random_word(rng: random.Random, min_len: int = 4, max_len: int = 10) -> str:
+    alphabet = rng.choice(ALPHABETS)
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(min_len, max_len)))
+
+
+def random_message(rng: random.Random, vocabulary: list) -> str:
+    words = [random_word(rng, 2, 8) for _ in range(rng.randint(3, 20))]
+    for _ in range(rng.randint(0, 2)):
+        words.insert(rng.randrange(len(words) + 1), rng.choice(vocabulary))
+    return " ".join(words).title() if rng.random() < 0.2 else " ".join(words)
+
+
+def naive_match(intents: dict, text: str) -> set:
+    found = set()
+    for intent, words in intents.items():
+        if any(word in text.lower() for word in words):
+            found.add(intent)
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keywords", type=int, default=10_000)
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    intents = {"greeting": GREETING_WORDS, "mining": MINING_WORDS, "download": DOWNLOAD_WORDS}
+    for index in range(args.keywords):
+        intents.setdefault(f"synthetic:{index % 500}", []).append(random_word(rng))
+    vocabulary = [word for words in intents.values() for word in words]
+    messages = [random_message(rng, vocabulary) for _ in range(args.messages)]
+
+    started = time.perf_counter()
+    matcher = KeywordMatcher(intents)
+    build_time = time.perf_counter() - started
+    print(f"🔧 Built automaton: {len(vocabulary)} keywords, {matcher.states} states in {build_time * 1000:.0f}ms")
+
+    mismatches = sum(1 for text in messages[:2000] if matcher.match(text) != naive_match(intents, text))
+    print(f"✅ Agreement with substring scan on 2000 messages: {2000 - mismatches}/2000")
+
+    started = time.perf_counter()
+    for text in messages:
+        matcher.match(text)
+    elapsed = time.perf_counter() - started
+    print(f"⚡ Aho-Corasick: {len(messages) / elapsed:,.0f} messages/s")
+
+    sample = messages[:500]
+    started = time.perf_counter()
+    for text in sample:
+        naive_match(intents, text)
+    elapsed = time.perf_counter() - started
+    print(f"🐢 Substring scan: {len(sample) / elapsed:,.0f} messages/s")
+
+
+if __name__ == "__main__":
+    main()
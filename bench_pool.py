@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Connection pool benchmark for Bot API sends.
+
+Runs the local Bot API stand-in with per-call latency and a connection
+set-up cost, then for each pool configuration sends broadcast rounds to
+--chats groups through BroadcastEngine while interactive replies arrive at
+--reply-rate, all through the same PriorityDispatcher and TunedHTTPXRequest
+the bot uses. Reports per configuration:
+
+- broadcast round duration and throughput,
+- reply latency p50/p99 (queueing in the dispatcher and the pool included),
+- calls that failed (e.g. TimedOut waiting for a free connection),
+- connections opened, i.e. how often the connection set-up cost was paid.
+
+Rounds are --gap seconds apart so idle connections may expire in between.
+The stand-in only speaks HTTP/1.1; HTTP/2 (API_HTTP_VERSION=2) cannot be
+measured here.
+
+Usage: python bench_pool.py [--chats 200] [--latency 0.15] [--connect-latency 0.1] [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import time
+from typing import Dict, List
+
+import telegram
+from aiohttp import web
+from telegram.ext import ExtBot
+
+from broadcast import BroadcastEngine
+from fake_bot_api import FakeBotAPI
+from http_pool import PoolSettings, TunedHTTPXRequest
+from outbound import BROADCAST, INTERACTIVE, PriorityDispatcher
+
+# The request objects the bot used before pools were tunable, then candidates
+CONFIGS: Dict[str, PoolSettings] = {
+    "httpx-default-1": PoolSettings(pool_size=1, keepalive_expiry=5.0, pool_timeout=1.0),
+    "previous-256": PoolSettings(pool_size=256, keepalive_expiry=5.0, pool_timeout=1.0),
+    "pool-4": PoolSettings(pool_size=4),
+    "pool-8": PoolSettings(pool_size=8),
+    "pool-16": PoolSettings(pool_size=16),
+    "pool-32": PoolSettings(pool_size=32),
+    "pool-64": PoolSettings(pool_size=64),
+    "pool-16-no-keepalive": PoolSettings(pool_size=16, keepalive=0),
+}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run_config(settings: PoolSettings, api: FakeBotAPI, base_url: str, args) -> dict:
+    bot = ExtBot("100001:POOL", base_url=base_url, request=TunedHTTPXRequest(settings),
+                 rate_limiter=PriorityDispatcher(rate=args.outbound_rate))
+    engine = BroadcastEngine(global_rate=args.broadcast_rate, chat_rate=1000,
+                             send_kwargs={"rate_limit_args": {"priority": BROADCAST}})
+    chat_ids = [-1002000000000 - index for index in range(args.chats)]
+    reply_latencies: List[float] = []
+    reply_errors = 0
+
+    async def reply(chat_id: int) -> None:
+        nonlocal reply_errors
+        started = time.perf_counter()
+        try:
+            await bot.send_message(chat_id, "reply", rate_limit_args={"priority": INTERACTIVE})
+            reply_latencies.append(time.perf_counter() - started)
+        except Exception:
+            reply_errors += 1
+
+    async def replies(stop: asyncio.Event) -> None:
+        tasks = []
+        while not stop.is_set():
+            tasks.append(asyncio.create_task(reply(chat_ids[len(tasks) % len(chat_ids)])))
+            await asyncio.sleep(1 / args.reply_rate)
+        await asyncio.gather(*tasks)
+
+    await bot.initialize()
+    connections_before = len(api.connections)
+    rounds = []
+    try:
+        for index in range(args.rounds):
+            if index:
+                await asyncio.sleep(args.gap)
+            stop = asyncio.Event()
+            reply_task = asyncio.create_task(replies(stop)) if args.reply_rate > 0 else None
+            rounds.append(await engine.broadcast(bot, chat_ids, "📢 broadcast", label="bench"))
+            stop.set()
+            if reply_task:
+                await reply_task
+    finally:
+        await bot.shutdown()
+
+    duration = sum(stats.duration for stats in rounds) / len(rounds)
+    return {
+        "settings": settings.describe(),
+        "round_seconds": round(duration, 2),
+        "messages_per_second": round(sum(stats.sent for stats in rounds) / sum(stats.duration for stats in rounds), 1),
+        "broadcast_failed": sum(stats.failed for stats in rounds),
+        "broadcast_retried": sum(stats.retried for stats in rounds),
+        "replies": len(reply_latencies) + reply_errors,
+        "reply_p50_ms": round(percentile(reply_latencies, 50) * 1000, 1),
+        "reply_p99_ms": round(percentile(reply_latencies, 99) * 1000, 1),
+        "reply_errors": reply_errors,
+        "connections_opened": len(api.connections) - connections_before,
+    }
+
+
+async def run(args) -> dict:
+    api = FakeBotAPI(latency=args.latency, jitter=args.jitter, connect_latency=args.connect_latency, seed=args.seed)
+    runner = web.AppRunner(api.app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", args.port).start()
+    base_url = f"http://127.0.0.1:{args.port}/bot"
+
+    results = {}
+    try:
+        for name in args.configs:
+            result = results[name] = await run_config(CONFIGS[name], api, base_url, args)
+            print(f"🔌 {name:21} round {result['round_seconds']:>6.2f}s  {result['messages_per_second']:>5.1f} msg/s  "
+                  f"replies p50 {result['reply_p50_ms']:>6.1f}ms p99 {result['reply_p99_ms']:>7.1f}ms  "
+                  f"errors {result['broadcast_failed'] + result['reply_errors']:>3}  "
+                  f"connections {result['connections_opened']}", flush=True)
+    finally:
+        await runner.cleanup()
+
+    return {
+        "meta": {
+            "timestamp": int(time.time()),
+            "python": platform.python_version(),
+            "python_telegram_bot": telegram.__version__,
+            "chats": args.chats,
+            "rounds": args.rounds,
+            "gap": args.gap,
+            "reply_rate": args.reply_rate,
+            "outbound_rate": args.outbound_rate,
+            "broadcast_rate": args.broadcast_rate,
+            "api_latency": args.latency,
+            "api_jitter": args.jitter,
+            "connect_latency": args.connect_latency,
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chats", type=int, default=200, help="groups per broadcast round")
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--gap", type=float, default=10.0, help="seconds between rounds")
+    parser.add_argument("--reply-rate", type=float, default=5.0, help="interactive replies per second during rounds")
+    parser.add_argument("--outbound-rate", type=float, default=30.0, help="dispatcher rate, as OUTBOUND_RATE")
+    parser.add_argument("--broadcast-rate", type=float, default=25.0, help="as BROADCAST_GLOBAL_RATE")
+    parser.add_argument("--latency", type=float, default=0.15, help="seconds per send call")
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--connect-latency", type=float, default=0.1, help="seconds per new connection")
+    parser.add_argument("--configs", nargs="+", default=list(CONFIGS), choices=list(CONFIGS))
+    parser.add_argument("--port", type=int, default=8191)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    results = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
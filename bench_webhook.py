@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Load test for the webhook server.
+
+Starts WebServer on a local port with a bounded update queue, drains the
+queue the way the Application would, and fires synthetic updates at it from
+local aiohttp clients running in separate processes. Reports accepted
+updates per second and how many were rejected with 503 under backpressure.
+
+Usage: python bench_webhook.py [--updates 20000] [--processes 4] [--concurrency 50] [--queue-size 1000]
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import aiohttp
+from telegram.ext import ApplicationBuilder
+
+from web_server import WebServer
+
+
+def make_update(update_id: int) -> dict:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": -1001234567890, "type": "supergroup", "title": "Load Test"},
+            "from": {"id": 1000 + update_id % 5000, "is_bot": False, "first_name": "User"},
+            "text": "hello, how do I start mining?",
+        },
+    }
+
+
+async def send_updates(url: str, first_id: int, count: int, concurrency: int) -> dict:
+    statuses = {}
+    next_id = first_id
+    last_id = first_id + count
+
+    async def client(session: aiohttp.ClientSession) -> None:
+        nonlocal next_id
+        while next_id < last_id:
+            update_id = next_id
+            next_id += 1
+            async with session.post(url, json=make_update(update_id)) as response:
+                statuses[response.status] = statuses.get(response.status, 0) + 1
+                await response.read()
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await asyncio.gather(*(client(session) for _ in range(concurrency)))
+    return statuses
+
+
+def run_client(url: str, first_id: int, count: int, concurrency: int) -> dict:
+    return asyncio.run(send_updates(url, first_id, count, concurrency))
+
+
+async def run(args) -> None:
+    application = (
+        ApplicationBuilder()
+        .token("123456:LOADTEST")
+        .update_queue(asyncio.Queue(maxsize=args.queue_size))
+        .build()
+    )
+    server = WebServer({"/webhook": application}, host="127.0.0.1", port=args.port,
+                       enqueue_timeout=args.enqueue_timeout)
+    await server.start()
+
+    processed = 0
+
+    async def drain() -> None:
+        nonlocal processed
+        while True:
+            await application.update_queue.get()
+            if args.handler_delay:
+                await asyncio.sleep(args.handler_delay)
+            processed += 1
+
+    drainer = asyncio.create_task(drain())
+    url = f"http://127.0.0.1:{args.port}/webhook"
+    per_process = args.updates // args.processes
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=args.processes) as pool:
+        started = time.perf_counter()
+        results = await asyncio.gather(*(
+            loop.run_in_executor(pool, run_client, url, index * per_process, per_process, args.concurrency)
+            for index in range(args.processes)
+        ))
+        elapsed = time.perf_counter() - started
+
+    statuses = {}
+    for result in results:
+        for status, count in result.items():
+            statuses[status] = statuses.get(status, 0) + count
+
+    drainer.cancel()
+    await server.stop()
+    accepted = statuses.get(200, 0)
+    print(f"📨 Sent {per_process * args.processes} updates in {elapsed:.2f}s "
+          f"from {args.processes} processes x {args.concurrency} connections")
+    print(f"⚡ Accepted {accepted / elapsed:,.0f} updates/s, processed {processed}")
+    print(f"📊 Status codes: {dict(sorted(statuses.items()))}, rejected by backpressure: {server.rejected_updates}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--updates", type=int, default=20_000)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=50, help="connections per client process")
+    parser.add_argument("--queue-size", type=int, default=1000)
+    parser.add_argument("--enqueue-timeout", type=float, default=1.0)
+    parser.add_argument("--handler-delay", type=float, default=0.0,
+                        help="simulated processing time per update, to exercise backpressure")
+    parser.add_argument("--port", type=int, default=8089)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,25 @@
 import os
+import atexit
 import logging
 import asyncio
-import threading
 import signal
 import sys
 import json
+import functools
 import random
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
 from typing import Dict, List, Optional
 from dotenv import load_dotenv
-from flask import Flask, request
 from telegram import (
     Update,
-    InlineKeyboardButton,
     InlineKeyboardMarkup,
     InputFile,
     ChatMember,
     ChatMemberUpdated,
-    Bot
+    Bot,
+    ChatPermissions,
+    User,
 )
 from telegram.ext import (
     ApplicationBuilder,
@@ -26,29 +28,59 @@ from telegram.ext import (
     ContextTypes,
     ChatMemberHandler,
     MessageHandler,
+    TypeHandler,
     filters,
 )
-from telegram.error import InvalidToken, BadRequest
+from telegram.error import InvalidToken, BadRequest, Conflict
 from telegram.constants import ChatMemberStatus
+from telegram.helpers import escape_markdown
+
+from activity import ActivityTracker
+from broadcast import BroadcastEngine
+from cache import LRUCache
+from content import ContentTable
+from flood import FloodGuard
+from groups import GroupRegistry, parse_chat_ids
+from hosting import BOT_DATA_KEY, BotConfig, HostedBot, hosted_bot, parse_bot_configs
+from http_pool import PoolSettings, TunedHTTPXRequest
+from keywords import KeywordMatcher
+from lease import LeaderElection, Lease
+from liveness import LivenessMonitor
+from logging_setup import parse_sampling, setup_logging
+from metrics import InstrumentedRequest, MetricsRegistry, instrument_handlers
+from ordering import ChatOrderedApplication
+from outbound import BROADCAST, INTERACTIVE, WELCOME, PriorityClass, PriorityDispatcher
+from replies import ReplyCandidate, ReplyPlanner
+from scheduler import Job, Scheduler
+from storage import BotStore
+from web_server import WebServer
+from welcome import WelcomeAggregator
+
+# Process start, used for time-to-first-update
+PROCESS_STARTED = time.monotonic()
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO
+# Configure logging: queued, JSON (LOG_FORMAT=text for plain lines), sampled per category,
+# e.g. LOG_SAMPLING="message_trace=0.01,group_message=0.1"
+log_listener = setup_logging(
+    level=os.getenv('LOG_LEVEL', 'INFO'),
+    json_output=os.getenv('LOG_FORMAT', 'json') == 'json',
+    sampling=parse_sampling(os.getenv('LOG_SAMPLING', '')),
 )
+atexit.register(log_listener.stop)
 logger = logging.getLogger(__name__)
 
-# Global bot application instance
-bot_app = None
+# Bots hosted by this process, built in main()
+hosted_bots: List[HostedBot] = []
+web_server = None  # Health/webhook server, started in start_services
+startup_metrics = {}  # Seconds from process start to ready / first update
+background_tasks = []  # Long-running tasks cancelled in stop_services
 
 # Global variables for bot functionality
-user_activity = {}  # Track user activity
 auto_posts = []  # Store auto-post content
 last_auto_post_time = None
-group_settings = {}  # Store group-specific settings
 admin_users = set()  # Store admin user IDs
 
 # Default auto-post messages (you can customize these)
@@ -60,11 +92,34 @@ DEFAULT_AUTO_POSTS = [
     "⚡ **Mining Tip!** ⚡\n\n💡 Keep your mining sessions active for maximum rewards!\n📊 Track your progress in the app!\n\n🎯 Complete missions for bonus points!"
 ]
 
+# Keywords that trigger smart replies in groups
+GREETING_WORDS = ["hello", "hi", "مرحبا", "السلام عليكم", "hallo", "привет", "здравствуйте", "bonjour", "नमस्ते", "merhaba", "selam"]
+MINING_WORDS = ["mining", "mine", "تعدين", "نقاط", "points", "earn", "كسب"]
+DOWNLOAD_WORDS = ["app", "download", "تحميل", "تطبيق", "link", "رابط"]
+
+# Occasional answers to common keywords (checked in this order)
+KEYWORD_RESPONSES = {
+    "mining": "⛏️ Start your 24-hour mining session in the TrustCoin app! Earn up to 1,000 points daily!",
+    "points": "💰 Earn points through mining, missions, and referrals! 1,000 points = 1 TBN token!",
+    "app": "📱 Download the TrustCoin app: https://www.trust-coin.site",
+    "referral": "🔗 Invite friends and earn 1,000 points per successful referral!",
+    "token": "💎 TBN tokens will be available after mainnet launch on Binance Smart Chain!",
+    "help": "❓ Type /start to see all available information and features!"
+}
+
+# Single-pass matcher over all keyword sets, built once at startup
+keyword_matcher = KeywordMatcher({
+    "greeting": GREETING_WORDS,
+    "mining": MINING_WORDS,
+    "download": DOWNLOAD_WORDS,
+    **{f"keyword:{keyword}": [keyword] for keyword in KEYWORD_RESPONSES},
+})
+
 # Signal handler for graceful shutdown
 def signal_handler(sig, frame):
     """Handle shutdown signals gracefully."""
     logger.info("🛑 Received shutdown signal. Stopping bot gracefully...")
-    if bot_app:
+    if hosted_bots:
         try:
             # Create health status file for Docker
             with open('/tmp/bot_healthy', 'w') as f:
@@ -81,14 +136,72 @@ except ValueError:
     # Not in main thread, skip signal handlers
     pass
 
-# Get bot token from environment variables
+# Get bot tokens from environment variables: BOT_TOKENS="en=<token>,ar=<token>" or just BOT_TOKEN_ENG
 BOT_TOKEN_ENG = os.getenv('BOT_TOKEN_ENG')
 ADMIN_USER_IDS = os.getenv('ADMIN_USER_IDS', '').split(',')  # Comma-separated admin user IDs
 AUTO_POST_INTERVAL = int(os.getenv('AUTO_POST_INTERVAL', '120'))  # Default 2 minutes (120 seconds)
+BROADCAST_GLOBAL_RATE = float(os.getenv('BROADCAST_GLOBAL_RATE', '25'))  # Messages per second across all chats
+BROADCAST_CHAT_RATE = float(os.getenv('BROADCAST_CHAT_RATE', str(20 / 60)))  # Messages per second into one chat
+BROADCAST_CONCURRENCY = int(os.getenv('BROADCAST_CONCURRENCY', '16'))  # Parallel sends per round
+BREAKER_FAILURES = int(os.getenv('BREAKER_FAILURES', '3'))  # Failed sends in a row before a chat is skipped
+BREAKER_BACKOFF = float(os.getenv('BREAKER_BACKOFF', '300'))  # First probe delay (s); doubles per failed probe
+BREAKER_MAX_BACKOFF = float(os.getenv('BREAKER_MAX_BACKOFF', '86400'))  # Longest delay between probes
+OUTBOUND_RATE = float(os.getenv('OUTBOUND_RATE', '30'))  # Bot API calls per second per bot, across all priority classes
+OUTBOUND_BROADCAST_CONCURRENCY = int(os.getenv('OUTBOUND_BROADCAST_CONCURRENCY', '8'))  # Broadcast calls in flight per bot
+OUTBOUND_BROADCAST_MAX_QUEUE = int(os.getenv('OUTBOUND_BROADCAST_MAX_QUEUE', '200'))  # Waiting broadcast calls per bot before shedding
+OUTBOUND_BROADCAST_MAX_WAIT = float(os.getenv('OUTBOUND_BROADCAST_MAX_WAIT', '10'))  # Seconds a broadcast call may wait
+OUTBOUND_WELCOME_CONCURRENCY = int(os.getenv('OUTBOUND_WELCOME_CONCURRENCY', '8'))  # Welcome calls in flight per bot
+OUTBOUND_WELCOME_MAX_WAIT = float(os.getenv('OUTBOUND_WELCOME_MAX_WAIT', '30'))  # Seconds a welcome may wait
+WELCOME_MIN_WINDOW = float(os.getenv('WELCOME_MIN_WINDOW', '2'))  # Seconds joins are collected before a welcome
+WELCOME_MAX_WINDOW = float(os.getenv('WELCOME_MAX_WINDOW', '60'))  # Longest collection window during join bursts
+WELCOME_MAX_NAMES = int(os.getenv('WELCOME_MAX_NAMES', '10'))  # Members named per welcome; the rest are counted
+WELCOME_DELETE_PREVIOUS = os.getenv('WELCOME_DELETE_PREVIOUS', '0') == '1'  # Keep only the latest welcome visible
+FLOOD_WINDOW = float(os.getenv('FLOOD_WINDOW', '60'))  # Sliding window (s) for message and reply rates
+FLOOD_MESSAGE_LIMIT = int(os.getenv('FLOOD_MESSAGE_LIMIT', '20'))  # Group messages per window before a user is flooding
+FLOOD_USER_REPLY_LIMIT = int(os.getenv('FLOOD_USER_REPLY_LIMIT', '2'))  # Bot replies one user can trigger per window
+REPLY_COOLDOWN = float(os.getenv('REPLY_COOLDOWN', '60'))  # Seconds before a chat gets the same kind of reply again
+REPLY_DEDUP_TTL = float(os.getenv('REPLY_DEDUP_TTL', '600'))  # Seconds before a chat gets the same text again
+FLOOD_RESTRICT_SECONDS = int(os.getenv('FLOOD_RESTRICT_SECONDS', '0'))  # Mute flooding users this long (0 = only report)
+FLOOD_SKETCH_WIDTH = int(os.getenv('FLOOD_SKETCH_WIDTH', str(1 << 17)))  # Counters per sketch row (power of two)
+BOT_DB_PATH = os.getenv('BOT_DB_PATH', 'bot_data.sqlite3')  # SQLite file for persistent state
+STORE_FLUSH_INTERVAL = float(os.getenv('STORE_FLUSH_INTERVAL', '5'))  # Seconds between write-behind flushes
+BOT_API_BASE_URL = os.getenv('BOT_API_BASE_URL', 'https://api.telegram.org/bot')  # e.g. a local fake_bot_api.py
+PORT = int(os.getenv('PORT', '8000'))  # Port of the health/webhook web server
+WEBHOOK_URL = os.getenv('WEBHOOK_URL')  # Public base URL; enables webhook mode when set
+WEBHOOK_PATH = os.getenv('WEBHOOK_PATH', '/webhook')
+WEBHOOK_SECRET = os.getenv('WEBHOOK_SECRET')  # Checked against X-Telegram-Bot-Api-Secret-Token
+UPDATE_QUEUE_SIZE = int(os.getenv('UPDATE_QUEUE_SIZE', '1000'))  # Bounded update queue (backpressure)
+UPDATE_CONCURRENCY = int(os.getenv('UPDATE_CONCURRENCY', '32'))  # Handlers running at once (1 = one update at a time)
+UPDATE_MAX_PENDING = int(os.getenv('UPDATE_MAX_PENDING', '1000'))  # Updates in processing, incl. waiting behind their chat
+ALLOWED_UPDATES = ["message", "callback_query", "chat_member", "my_chat_member"]
+FAST_START = os.getenv('FAST_START', '1') == '1'  # Detect conflicts instead of sleeping at boot
+LEASE_DB_PATH = os.getenv('LEASE_DB_PATH', BOT_DB_PATH)  # SQLite file shared by all instances for leases
+INSTANCE_LEASE_TTL = float(os.getenv('INSTANCE_LEASE_TTL', '15'))  # Seconds before a dead poller's lease expires
+LEADER_LEASE_TTL = float(os.getenv('LEADER_LEASE_TTL', '6'))  # Seconds before a dead scheduler leader is replaced
+CONTENT_PATH = os.getenv('CONTENT_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'content.json'))
+CONTENT_RELOAD_INTERVAL = float(os.getenv('CONTENT_RELOAD_INTERVAL', '5'))  # Seconds between content file checks
+CALLBACK_CACHE_TIME = int(os.getenv('CALLBACK_CACHE_TIME', '2'))  # Seconds clients may cache a button answer
+RENDERED_CACHE_SIZE = int(os.getenv('RENDERED_CACHE_SIZE', '10000'))  # Menu messages whose section we remember
+ACTIVITY_MAX_USERS = int(os.getenv('ACTIVITY_MAX_USERS', '100000'))  # Users kept in memory before LRU eviction
+ACTIVITY_TTL_DAYS = float(os.getenv('ACTIVITY_TTL_DAYS', '30'))  # Idle users older than this are evicted
+LOOP_LAG_DEGRADED = float(os.getenv('LOOP_LAG_DEGRADED', '0.25'))  # Event-loop lag (s) reported as degraded
+LOOP_LAG_UNHEALTHY = float(os.getenv('LOOP_LAG_UNHEALTHY', '2'))  # Event-loop lag (s) reported as unhealthy
+LOOP_STALL_THRESHOLD = float(os.getenv('LOOP_STALL_THRESHOLD', '5'))  # Blocked seconds before the loop's stack is logged
+POLL_STALE_SECONDS = float(os.getenv('POLL_STALE_SECONDS', '60'))  # getUpdates silence before degraded (3x: unhealthy)
+START_REMINDER_INTERVAL = int(os.getenv('START_REMINDER_INTERVAL', '60'))  # Seconds between /start reminders
+SCHEDULE_JITTER = float(os.getenv('SCHEDULE_JITTER', '5'))  # Max random delay (s) added to each scheduled run
+SCHEDULE_MISFIRE = os.getenv('SCHEDULE_MISFIRE', 'skip')  # Missed runs: 'skip' or 'catch_up' (run once now)
 
-# Validate that the bot token is loaded
-if not BOT_TOKEN_ENG:
-    raise ValueError("❌ BOT_TOKEN_ENG not found in environment variables. Please check your .env file.")
+# Bots to host, each with its own content (CONTENT_PATH_<NAME>) and groups (GROUP_CHAT_IDS_<NAME>)
+BOT_CONFIGS = parse_bot_configs(os.getenv('BOT_TOKENS', ''), BOT_TOKEN_ENG, CONTENT_PATH)
+
+# Validate that at least one bot token is loaded
+if not BOT_CONFIGS:
+    raise ValueError("❌ Neither BOT_TOKENS nor BOT_TOKEN_ENG found in environment variables. Please check your .env file.")
+
+# Send pool shared by all bots: API_POOL_SIZE, API_KEEPALIVE, API_KEEPALIVE_EXPIRY, API_HTTP_VERSION,
+# API_POOL_TIMEOUT (see http_pool.py and bench_pool.py); 16 connections per bot by default
+SEND_POOL = PoolSettings.from_env(pool_size=16 * len(BOT_CONFIGS))
 
 # Initialize admin users
 for admin_id in ADMIN_USER_IDS:
@@ -98,21 +211,156 @@ for admin_id in ADMIN_USER_IDS:
 # Initialize auto posts
 auto_posts = DEFAULT_AUTO_POSTS.copy()
 
-# Main menu keyboard
-def build_main_menu() -> InlineKeyboardMarkup:
-    keyboard = [
-        [InlineKeyboardButton("📋 Overview & Getting Started", callback_data="overview")],
-        [InlineKeyboardButton("⛏️ Mining & Points", callback_data="points")],
-        [InlineKeyboardButton("🎯 Missions & Rewards", callback_data="missions")],
-        [InlineKeyboardButton("👥 Referral & Community", callback_data="referral")],
-        [InlineKeyboardButton("📈 Tokenomics & Roadmap", callback_data="roadmap")],
-        [InlineKeyboardButton("📱 Download App", callback_data="download")],
-        [InlineKeyboardButton("🔒 Security & Anti-Cheat", callback_data="security")],
-        [InlineKeyboardButton("❓ FAQ", callback_data="faq")],
-        [InlineKeyboardButton("🌐 Social Links", callback_data="social")],
-        [InlineKeyboardButton("🌍 Language Groups", callback_data="language_groups")],
-    ]
-    return InlineKeyboardMarkup(keyboard)
+# Constant-memory rate tracking for group messages and bot replies
+flood_guard = FloodGuard(
+    window=FLOOD_WINDOW,
+    message_limit=FLOOD_MESSAGE_LIMIT,
+    user_reply_limit=FLOOD_USER_REPLY_LIMIT,
+    width=FLOOD_SKETCH_WIDTH,
+)
+
+# At most one group reply per message, with per-chat cooldowns per reply kind
+reply_planner = ReplyPlanner(
+    cooldown=REPLY_COOLDOWN,
+    dedup_ttl=REPLY_DEDUP_TTL,
+    on_suppressed=lambda reason: replies_suppressed.inc(reason),
+)
+
+# Persistent write-behind store (opened in start_services)
+store = BotStore(BOT_DB_PATH, flush_interval=STORE_FLUSH_INTERVAL)
+
+def spill_evicted_user(user_id: int, record) -> None:
+    """Make sure an evicted user's latest state reaches the store."""
+    store.record_user(user_id, record.username, record.first_seen, record.last_activity, 0, record.activity_mask)
+
+# Track user activity (bounded, evicted users are spilled to the store)
+user_activity = ActivityTracker(
+    max_users=ACTIVITY_MAX_USERS,
+    ttl=ACTIVITY_TTL_DAYS * 86400,
+    on_evict=spill_evicted_user,
+)
+
+# Last section shown in each menu message, keyed by (bot name, chat_id, message_id): private chat
+# and message IDs are the same across bots, so the bot is part of the key
+rendered_sections = LRUCache(RENDERED_CACHE_SIZE)
+
+# Menu API calls made and saved
+button_stats = {
+    'answers': 0,
+    'edits': 0,
+    'replies': 0,
+    'edits_skipped': 0,
+    'not_modified': 0,
+}
+
+# Periodic broadcasts; job state is persisted so schedules survive restarts
+scheduler = Scheduler(on_change=lambda job: store.save_job_state(job.name, job.state()))
+scheduler_task = None
+
+async def become_leader(token: int) -> None:
+    """Start the scheduled broadcasts where the previous leader left off."""
+    global scheduler_task
+    try:
+        # Our own pending writes go first; then the store holds everything the previous
+        # leader (and the other instances' handlers) saved since we started
+        await store.flush()
+        scheduler.restore(await store.load_job_states())
+        await load_shared_state(replace=True)
+    except Exception as e:
+        logging.error(f"❌ Error loading shared state: {e}")
+    schedule_broadcasts()
+    scheduler_task = asyncio.create_task(scheduler.run())
+    logging.info(f"✅ Scheduler started with {len(scheduler.jobs)} jobs (leader token {token})")
+
+async def step_down() -> None:
+    """Stop the scheduled broadcasts and persist their state for the next leader."""
+    global scheduler_task
+    if scheduler_task:
+        scheduler_task.cancel()
+        scheduler_task = None
+    scheduler.clear()
+    await store.flush()
+    logging.info("⏸️ Scheduler stopped - this instance is on standby")
+
+# Only the instance holding the "scheduler" lease runs broadcasts
+leader_election = LeaderElection(
+    Lease(LEASE_DB_PATH, "scheduler", ttl=LEADER_LEASE_TTL),
+    on_elected=become_leader,
+    on_demoted=step_down,
+)
+
+def reschedule_on_membership_change() -> None:
+    """Joined or left groups change the broadcast jobs' targets."""
+    if leader_election.is_leader:
+        schedule_broadcasts()
+
+# Event-loop lag and update freshness behind /health
+liveness = LivenessMonitor(
+    lag_degraded=LOOP_LAG_DEGRADED,
+    lag_unhealthy=LOOP_LAG_UNHEALTHY,
+    stall_threshold=LOOP_STALL_THRESHOLD,
+    poll_degraded=None if WEBHOOK_URL else POLL_STALE_SECONDS,
+    poll_unhealthy=None if WEBHOOK_URL else POLL_STALE_SECONDS * 3,
+)
+
+def record_api_response(bot_name: str, api_method: str, status: int) -> None:
+    if api_method == "getUpdates" and status == 200:
+        liveness.mark_get_updates(bot_name)
+
+# Metrics served on /metrics
+metrics = MetricsRegistry()
+updates_received = metrics.counter("bot_updates_total", "Updates received, by bot and update type", ["bot", "type"])
+handler_seconds = metrics.histogram("bot_handler_duration_seconds", "Handler callback latency", ["handler"])
+api_seconds = metrics.histogram("bot_api_request_duration_seconds", "Bot API call latency", ["method"])
+api_throttled = metrics.counter("bot_api_throttled_total", "Bot API calls answered with 429", ["method"])
+broadcast_retries = metrics.counter("bot_broadcast_retries_total", "Broadcast sends retried after RetryAfter", ["job"])
+broadcast_seconds = metrics.histogram(
+    "bot_broadcast_round_duration_seconds", "Duration of auto-post and reminder rounds", ["job"],
+    buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+floods_flagged = metrics.counter("bot_floods_flagged_total", "Flooding users reported to admins")
+replies_suppressed = metrics.counter("bot_replies_suppressed_total", "Group replies withheld by the flood guard or reply planner", ["reason"])
+metrics.gauge("bot_tracked_users", "Users held in memory by the activity tracker", lambda: len(user_activity))
+metrics.gauge("bot_open_chat_breakers", "Chats skipped by broadcasts until their next probe, by bot",
+              lambda: {(hosted.name,): hosted.engine.open_breakers() for hosted in hosted_bots}, ["bot"])
+metrics.gauge("bot_polling", "1 while this instance polls the bot's updates, 0 while it waits for the instance lease",
+              lambda: {(hosted.name,): int(hosted.application.updater.running)
+                       for hosted in hosted_bots if hosted.application.updater}, ["bot"])
+metrics.gauge("bot_event_loop_lag_seconds", "Last measured event-loop scheduling lag", lambda: liveness.lag)
+
+# Outbound dispatchers, one per bot since Telegram's limits are per token:
+# user replies first, then welcomes, then broadcasts
+OUTBOUND_CLASSES = (
+    PriorityClass(INTERACTIVE),
+    PriorityClass(WELCOME, concurrency=OUTBOUND_WELCOME_CONCURRENCY, max_queue=500,
+                  max_wait=OUTBOUND_WELCOME_MAX_WAIT),
+    PriorityClass(BROADCAST, concurrency=OUTBOUND_BROADCAST_CONCURRENCY,
+                  max_queue=OUTBOUND_BROADCAST_MAX_QUEUE, max_wait=OUTBOUND_BROADCAST_MAX_WAIT),
+)
+outbound_wait = metrics.histogram("bot_outbound_wait_seconds", "Time Bot API calls waited for their turn",
+                                  ["bot", "priority"])
+outbound_shed = metrics.counter("bot_outbound_shed_total", "Low-priority Bot API calls dropped under backlog",
+                                ["bot", "priority"])
+metrics.gauge("bot_outbound_queue_depth", "Bot API calls waiting for their turn, by bot and priority",
+              lambda: {(hosted.name, cls.name): hosted.outbound.depth(cls.name)
+                       for hosted in hosted_bots for cls in hosted.outbound.classes}, ["bot", "priority"])
+metrics.gauge("bot_outbound_in_flight", "Bot API calls in progress, by bot and priority",
+              lambda: {(hosted.name, cls.name): hosted.outbound.active(cls.name)
+                       for hosted in hosted_bots for cls in hosted.outbound.classes}, ["bot", "priority"])
+
+# One connection pool for every hosted bot's sends; each bot polls getUpdates on its own connection
+send_request = InstrumentedRequest(TunedHTTPXRequest(SEND_POOL), api_seconds, api_throttled)
+
+def update_type(update: Update) -> str:
+    """Name of the update's payload field, e.g. 'message' or 'callback_query'."""
+    for name in Update.ALL_TYPES:
+        if getattr(update, name, None) is not None:
+            return name
+    return "unknown"
+
+# Main menu keyboard of the bot handling the update
+def build_main_menu(context: ContextTypes.DEFAULT_TYPE) -> InlineKeyboardMarkup:
+    return hosted_bot(context).content.main_menu
 
 # Helper functions for group management and user tracking
 
@@ -122,68 +370,93 @@ def is_admin(user_id: int) -> bool:
 
 def track_user_activity(user_id: int, username: str = None, activity_type: str = "message"):
     """Track user activity for monitoring."""
-    current_time = datetime.now()
-    if user_id not in user_activity:
-        user_activity[user_id] = {
-            'username': username,
-            'first_seen': current_time,
-            'last_activity': current_time,
-            'message_count': 0,
-            'activity_types': []
-        }
-    
-    user_activity[user_id]['last_activity'] = current_time
-    user_activity[user_id]['username'] = username or user_activity[user_id].get('username')
-    
-    if activity_type == "message":
-        user_activity[user_id]['message_count'] += 1
-    
-    if activity_type not in user_activity[user_id]['activity_types']:
-        user_activity[user_id]['activity_types'].append(activity_type)
+    record = user_activity.track(user_id, username, activity_type)
+    store.record_user(
+        user_id,
+        record.username,
+        record.first_seen,
+        record.last_activity,
+        1 if activity_type == "message" else 0,
+        record.activity_mask,
+    )
 
-async def welcome_new_member(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    """Send welcome message to new group members."""
-    new_member = update.chat_member.new_chat_member.user
-    chat_title = update.effective_chat.title or "this group"
-    chat_id = update.effective_chat.id
+async def load_shared_state(replace: bool = False) -> None:
+    """Restore auto posts, group settings and chat breakers; `replace` drops what the store no longer has."""
+    saved_posts = await store.load_auto_posts()
+    if saved_posts is not None:
+        auto_posts[:] = saved_posts
+    for hosted in hosted_bots:
+        hosted.groups.load(await store.load_group_settings(hosted.name), replace=replace)
+        hosted.engine.restore_breakers(await store.load_breakers(hosted.name), replace=replace)
+        logging.info(f"💾 Restored {len(hosted.groups)} groups and {hosted.engine.open_breakers()} "
+                     f"open chat breakers for bot {hosted.name}")
+    logging.info(f"💾 Restored {len(auto_posts)} auto posts")
+
+async def load_persistent_state() -> None:
+    """Open the store, restore small tables and warm user activity in the background."""
+    await store.start()
+    await load_shared_state()
     
-    logging.info(f"New member joined - Chat ID: {chat_id}, User: {new_member.first_name} ({new_member.id})")
+    async def warm_user_activity():
+        loaded = 0
+        since = time.time() - user_activity.ttl
+        async for rows in store.iter_users(since=since):
+            user_activity.merge((user_id, username, int(first_seen), int(last_activity), message_count, activity_mask)
+                                for user_id, username, first_seen, last_activity, message_count, activity_mask
+                                in rows)
+            loaded += len(rows)
+        logging.info(f"💾 Loaded {loaded} tracked users from the store")
     
-    welcome_message = (
-        f"🎉 Welcome to {chat_title}, {new_member.first_name}!\n\n"
+    background_tasks.append(asyncio.create_task(warm_user_activity()))
+
+def render_welcome(chat_title: str, members: List[User], others: int) -> str:
+    """Welcome text for one or more new members of a group."""
+    names = ", ".join(escape_markdown(member.first_name) for member in members)
+    if others:
+        names += f" and {others} more"
+    return (
+        f"🎉 Welcome to {chat_title}, {names}!\n\n"
         f"🚀 **TrustCoin Community** welcomes you!\n\n"
         f"💎 Ready to start mining? Type /start to explore all features!\n"
         f"📱 Download our app: https://www.trust-coin.site\n\n"
         f"🎁 **New users get 1,000 points bonus!**"
     )
+
+async def welcome_new_member(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Queue a welcome for a new group member; joins are greeted together per chat."""
+    new_member = update.chat_member.new_chat_member.user
+    chat_title = update.effective_chat.title or "this group"
+    chat_id = update.effective_chat.id
     
-    try:
-        await context.bot.send_message(
-            chat_id=update.effective_chat.id,
-            text=welcome_message,
-            parse_mode="Markdown"
-        )
-        logging.info(f"Welcome message sent to {new_member.first_name} in {chat_title}")
-    except Exception as e:
-        logging.error(f"Error sending welcome message: {e}")
+    logging.info("New member joined - Chat ID: %s, User: %s (%s)", chat_id, new_member.first_name, new_member.id,
+                 extra={"category": "chat_member", "chat_id": chat_id, "user_id": new_member.id})
+    hosted_bot(context).welcomes.add(context.bot, chat_id, chat_title, new_member)
+
+async def handle_my_chat_member_update(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Track groups the bot is added to or removed from."""
+    hosted_bot(context).groups.handle_my_chat_member(update.my_chat_member)
 
 async def handle_chat_member_update(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle chat member updates (joins, leaves, etc.)."""
-    logging.info(f"🔔 Chat member update received in chat {update.effective_chat.id}")
+    logging.info("🔔 Chat member update received in chat %s", update.effective_chat.id,
+                 extra={"category": "chat_member", "chat_id": update.effective_chat.id})
     
     if not update.chat_member:
         logging.warning("No chat member data in update")
         return
+    hosted = hosted_bot(context)
+    hosted.groups.handle_chat_member(update.chat_member)
     
     result = extract_status_change(update.chat_member)
     if result is None:
-        logging.info("No status change detected")
+        logging.info("No status change detected", extra={"category": "chat_member"})
         return
 
     was_member, is_member = result
     user = update.chat_member.new_chat_member.user
     
-    logging.info(f"👤 User {user.first_name} ({user.id}) - Was member: {was_member}, Is member: {is_member}")
+    logging.info("👤 User %s (%s) - Was member: %s, Is member: %s", user.first_name, user.id, was_member, is_member,
+                 extra={"category": "chat_member", "user_id": user.id})
 
     if not was_member and is_member:
         # New member joined
@@ -191,6 +464,7 @@ async def handle_chat_member_update(update: Update, context: ContextTypes.DEFAUL
         await welcome_new_member(update, context)
     elif was_member and not is_member:
         # Member left
+        hosted.welcomes.discard(update.effective_chat.id, user.id)
         if user.id in user_activity:
             track_user_activity(user.id, user.username, "left_group")
         logging.info(f"👋 Member left: {user.first_name}")
@@ -218,58 +492,35 @@ def extract_status_change(chat_member_update: ChatMemberUpdated) -> Optional[tup
 
     return was_member, is_member
 
-async def auto_post_to_groups():
-    """Send auto posts to configured groups."""
-    global last_auto_post_time, bot_app
+async def auto_post_to_groups(hosted: HostedBot, chat_ids: Optional[List[int]] = None):
+    """Send auto posts to the given groups of one bot (default: all its groups)."""
+    global last_auto_post_time
     
-    if not auto_posts or not bot_app:
-        logging.warning("No auto posts or bot app available")
+    if not auto_posts:
+        logging.warning("No auto posts available")
         return
     
     # Select a random post from the list
     post_content = random.choice(auto_posts)
     
     # Get all groups where the bot is active
-    group_chat_ids = os.getenv('GROUP_CHAT_IDS', '').split(',')
+    group_chat_ids = hosted.groups.targets if chat_ids is None else chat_ids
     
-    if not group_chat_ids or not group_chat_ids[0].strip():
-        logging.warning("No group chat IDs configured in GROUP_CHAT_IDS")
+    if not group_chat_ids:
+        logging.warning(f"No active groups to auto-post to for bot {hosted.name}")
         return
     
-    posts_sent = 0
-    for chat_id in group_chat_ids:
-        if chat_id.strip():
-            try:
-                # Clean the chat_id - remove any extra dashes
-                clean_chat_id = chat_id.strip()
-                if clean_chat_id.startswith('--'):
-                    clean_chat_id = clean_chat_id[1:]  # Remove one extra dash
-                
-                chat_id_int = int(clean_chat_id)
-                await bot_app.bot.send_message(
-                    chat_id=chat_id_int,
-                    text=post_content,
-                    parse_mode="Markdown"
-                )
-                posts_sent += 1
-                logging.info(f"📢 Auto-posted to group {clean_chat_id}")
-                await asyncio.sleep(1)  # Small delay between posts
-            except ValueError as e:
-                logging.error(f"❌ Invalid chat ID format {chat_id}: {e}")
-            except Exception as e:
-                logging.error(f"❌ Error auto-posting to group {chat_id}: {e}")
+    stats = await hosted.engine.broadcast(
+        hosted.bot, group_chat_ids, post_content, label=f"Auto-post ({hosted.name})"
+    )
+    broadcast_seconds.observe(stats.duration, "auto_post")
+    broadcast_retries.inc("auto_post", amount=stats.retried)
     
     last_auto_post_time = datetime.now()
-    logging.info(f"✅ Auto-posting completed - sent to {posts_sent} groups")
+    logging.info(f"✅ Auto-posting completed - sent to {stats.sent} groups")
 
-async def send_start_reminder():
-    """Send /start reminder to groups."""
-    global bot_app
-    
-    if not bot_app:
-        logging.warning("No bot app available for start reminder")
-        return
-    
+async def send_start_reminder(hosted: HostedBot, chat_ids: Optional[List[int]] = None):
+    """Send /start reminder to the given groups of one bot (default: all its groups)."""
     start_messages = [
         "🚀 **Discover the TrustCoin World!**\n\n💎 Get comprehensive project information and features\n👆 Type /start\n\n📱 Begin your mining journey now!",
         "⛏️ **Want to learn more about TrustCoin?**\n\n🎯 All information and links available\n👆 Use /start\n\n💰 Start earning points today!",
@@ -277,36 +528,86 @@ async def send_start_reminder():
     ]
     
     # Get all groups where the bot is active
-    group_chat_ids = os.getenv('GROUP_CHAT_IDS', '').split(',')
+    group_chat_ids = hosted.groups.targets if chat_ids is None else chat_ids
     
-    if not group_chat_ids or not group_chat_ids[0].strip():
-        logging.warning("No group chat IDs configured for start reminder")
+    if not group_chat_ids:
+        logging.warning(f"No active groups for start reminder for bot {hosted.name}")
         return
     
-    reminders_sent = 0
-    for chat_id in group_chat_ids:
-        if chat_id.strip():
-            try:
-                # Clean the chat_id - remove any extra dashes
-                clean_chat_id = chat_id.strip()
-                if clean_chat_id.startswith('--'):
-                    clean_chat_id = clean_chat_id[1:]  # Remove one extra dash
-                
-                chat_id_int = int(clean_chat_id)
-                await bot_app.bot.send_message(
-                    chat_id=chat_id_int,
-                    text=random.choice(start_messages),
-                    parse_mode="Markdown"
-                )
-                reminders_sent += 1
-                logging.info(f"📢 Start reminder sent to group {clean_chat_id}")
-                await asyncio.sleep(1)  # Small delay between posts
-            except ValueError as e:
-                logging.error(f"❌ Invalid chat ID format for reminder {chat_id}: {e}")
-            except Exception as e:
-                logging.error(f"❌ Error sending start reminder to group {chat_id}: {e}")
+    stats = await hosted.engine.broadcast(
+        hosted.bot,
+        group_chat_ids,
+        lambda chat_id: random.choice(start_messages),
+        label=f"Start reminder ({hosted.name})",
+    )
+    broadcast_seconds.observe(stats.duration, "start_reminder")
+    broadcast_retries.inc("start_reminder", amount=stats.retried)
     
-    logging.info(f"✅ Start reminders completed - sent to {reminders_sent} groups")
+    logging.info(f"✅ Start reminders completed - sent to {stats.sent} groups")
+
+# Scheduled broadcasts: kind -> (send function, default interval)
+BROADCAST_JOBS = {
+    "auto_post": (auto_post_to_groups, AUTO_POST_INTERVAL),
+    "start_reminder": (send_start_reminder, START_REMINDER_INTERVAL),
+}
+
+def schedule_broadcasts() -> None:
+    """(Re)build every bot's broadcast jobs from its groups and per-group intervals.
+    
+    Jobs are named "<bot>/<kind>". Groups with a custom interval setting
+    ("<kind>_interval") get their own "<bot>/<kind>:<chat_id>" job; all
+    others of the bot share the "<bot>/<kind>" job.
+    """
+    wanted = set()
+    for hosted in hosted_bots:
+        chat_ids = hosted.groups.targets
+        for kind, (send, default_interval) in BROADCAST_JOBS.items():
+            custom = {}
+            for chat_id in chat_ids:
+                interval = hosted.groups.setting(chat_id, f"{kind}_interval")
+                if interval:
+                    custom[chat_id] = interval
+            shared = [chat_id for chat_id in chat_ids if chat_id not in custom]
+            
+            # Fenced: a round only starts while our leader term is current. A round already
+            # running when leadership is lost is cancelled by step_down, up to one heartbeat later.
+            name = f"{hosted.name}/{kind}"
+            jobs = [Job(name, leader_election.fenced(functools.partial(send, hosted, shared)), default_interval)]
+            jobs += [Job(f"{name}:{chat_id}", leader_election.fenced(functools.partial(send, hosted, [chat_id])),
+                         interval)
+                     for chat_id, interval in custom.items()]
+            for job in jobs:
+                job.jitter = SCHEDULE_JITTER
+                job.misfire = SCHEDULE_MISFIRE
+                scheduler.add(job)
+                wanted.add(job.name)
+    
+    for name in list(scheduler.jobs):
+        if name not in wanted:
+            scheduler.remove(name)
+
+# Canned group replies by kind
+GROUP_REPLIES = {
+    "greeting": ReplyCandidate("greeting", [
+        "🚀 Welcome to TrustCoin community! Ready to start mining? Type /start for full info!",
+        "💎 Hello! Join thousands of miners earning TBN tokens daily! /start to begin",
+        "🎁 Hi there! Get your 1,000 points welcome bonus - download our app now!",
+        "⛏️ Greetings, future miner! Start your 24-hour mining session today!"
+    ]),
+    "mining": ReplyCandidate("mining", [
+        "⛏️ **Mining Info:** Earn up to 1,000 points every 24 hours! 💰 1,000 points = 1 TBN token. Download the app and start mining now! 📱"
+    ]),
+    "download": ReplyCandidate("download", [
+        "📱 **Download TrustCoin App:**\n🤖 Android: https://play.google.com/store/apps/details?id=com.jawad06_dev.trustcoinmobile.v3\n🌐 Website: https://www.trust-coin.site"
+    ]),
+    "mention": ReplyCandidate("mention", [
+        "🚀 Hello! I'm here to help with TrustCoin! Type /start to see all features!",
+        "💎 Need help with mining? Download our app and start earning points!",
+        "🎯 Want to learn about missions and rewards? Use /start to explore!",
+        "👥 Looking to join our community? Check out our social links with /start!",
+        "📱 Ready to start mining? Get the app at https://www.trust-coin.site"
+    ], "Markdown"),
+}
 
 async def handle_group_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle messages in group chats for user interaction and monitoring."""
@@ -319,77 +620,76 @@ async def handle_group_message(update: Update, context: ContextTypes.DEFAULT_TYP
     message_text = update.message.text or ""
     chat_id = update.effective_chat.id
     
-    logging.info(f"📨 Group message received - Chat ID: {chat_id}, User: {user_id}, Message: {message_text[:50]}...")
+    logging.info("📨 Group message received - Chat ID: %s, User: %s, Message: %.50s...", chat_id, user_id, message_text,
+                 extra={"category": "group_message", "chat_id": chat_id, "user_id": user_id})
     
     # Track user activity
     track_user_activity(user_id, username, "message")
     
-    # Smart responses to greetings and keywords
-    if any(word in message_text.lower() for word in ["hello", "hi", "مرحبا", "السلام عليكم", "hallo", "привет", "здравствуйте", "bonjour", "नमस्ते", "merhaba", "selam"]):
-        responses = [
-            "🚀 Welcome to TrustCoin community! Ready to start mining? Type /start for full info!",
-            "💎 Hello! Join thousands of miners earning TBN tokens daily! /start to begin",
-            "🎁 Hi there! Get your 1,000 points welcome bonus - download our app now!",
-            "⛏️ Greetings, future miner! Start your 24-hour mining session today!"
-        ]
-        try:
-            await update.message.reply_text(random.choice(responses))
-            logging.info(f"✅ Replied to greeting in group {chat_id}")
-        except Exception as e:
-            logging.error(f"❌ Error replying to greeting: {e}")
+    # Flooding users get no replies; admins are told once per cooldown.
+    # Counted per bot, so a group shared by two bots does not count a message twice.
+    flood_key = (hosted_bot(context).name, user_id)
+    if not is_admin(user_id):
+        rate = flood_guard.record_message(flood_key)
+        if flood_guard.should_flag(flood_key, rate):
+            context.application.create_task(report_flood(context.bot, update, rate), update=update)
+        if flood_guard.is_flooding(flood_key, rate):
+            replies_suppressed.inc("flood")
+            return
     
-    # Respond to mining-related keywords
-    elif any(word in message_text.lower() for word in ["mining", "mine", "تعدين", "نقاط", "points", "earn", "كسب"]):
-        try:
-            await update.message.reply_text("⛏️ **Mining Info:** Earn up to 1,000 points every 24 hours! 💰 1,000 points = 1 TBN token. Download the app and start mining now! 📱")
-            logging.info(f"✅ Replied to mining query in group {chat_id}")
-        except Exception as e:
-            logging.error(f"❌ Error replying to mining query: {e}")
+    # Match every keyword set in one pass
+    intents = keyword_matcher.match(message_text)
     
-    # Respond to app/download keywords  
-    elif any(word in message_text.lower() for word in ["app", "download", "تحميل", "تطبيق", "link", "رابط"]):
-        try:
-            await update.message.reply_text("📱 **Download TrustCoin App:**\n🤖 Android: https://play.google.com/store/apps/details?id=com.jawad06_dev.trustcoinmobile.v3\n🌐 Website: https://www.trust-coin.site")
-            logging.info(f"✅ Replied to download query in group {chat_id}")
-        except Exception as e:
-            logging.error(f"❌ Error replying to download query: {e}")
-    
-    # Respond to certain keywords or mentions
+    # Everything this message could be answered with, most specific first
+    candidates = [GROUP_REPLIES[kind] for kind in ("greeting", "mining", "download") if kind in intents]
     bot_username = context.bot.username
     if bot_username and f"@{bot_username}" in message_text.lower():
-        response_messages = [
-            "🚀 Hello! I'm here to help with TrustCoin! Type /start to see all features!",
-            "💎 Need help with mining? Download our app and start earning points!",
-            "🎯 Want to learn about missions and rewards? Use /start to explore!",
-            "👥 Looking to join our community? Check out our social links with /start!",
-            "📱 Ready to start mining? Get the app at https://www.trust-coin.site"
-        ]
-        
+        candidates.append(GROUP_REPLIES["mention"])
+    for keyword, response in KEYWORD_RESPONSES.items():
+        if f"keyword:{keyword}" in intents and random.random() < 0.3:  # 30% chance to respond
+            candidates.append(ReplyCandidate(f"keyword:{keyword}", [response], "Markdown"))
+            break
+    
+    # At most one reply per message, subject to per-chat cooldowns
+    reply = reply_planner.plan(chat_id, candidates)
+    if reply is None:
+        return
+    if not is_admin(user_id) and not flood_guard.allow_reply(flood_key):
+        replies_suppressed.inc("user_limit")
+        return
+    reply_planner.record(chat_id, reply)
+    try:
+        await update.message.reply_text(reply.text, parse_mode=reply.parse_mode)
+        logging.info("✅ Replied to %s in group %s", reply.kind, chat_id, extra={"category": "reply", "chat_id": chat_id})
+    except Exception as e:
+        logging.error(f"❌ Error replying to {reply.kind}: {e}")
+
+async def report_flood(bot: Bot, update: Update, rate: float) -> None:
+    """Tell the admins about a flooding user and, if configured, mute them for a while."""
+    user = update.effective_user
+    chat = update.effective_chat
+    floods_flagged.inc()
+    logging.warning("🌊 User %s (%s) is flooding chat %s - about %.0f messages in %.0fs",
+                    user.id, user.username, chat.id, rate, FLOOD_WINDOW,
+                    extra={"chat_id": chat.id, "user_id": user.id})
+    action = "Replies to them are paused."
+    if FLOOD_RESTRICT_SECONDS > 0:
         try:
-            await update.message.reply_text(
-                random.choice(response_messages),
-                parse_mode="Markdown"
+            await bot.restrict_chat_member(
+                chat.id, user.id, ChatPermissions(can_send_messages=False),
+                until_date=int(time.time()) + FLOOD_RESTRICT_SECONDS,
             )
+            action = f"Muted for {FLOOD_RESTRICT_SECONDS}s."
         except Exception as e:
-            logging.error(f"Error responding to mention: {e}")
-    
-    # Respond to common keywords
-    keywords_responses = {
-        "mining": "⛏️ Start your 24-hour mining session in the TrustCoin app! Earn up to 1,000 points daily!",
-        "points": "💰 Earn points through mining, missions, and referrals! 1,000 points = 1 TBN token!",
-        "app": "📱 Download the TrustCoin app: https://www.trust-coin.site",
-        "referral": "🔗 Invite friends and earn 1,000 points per successful referral!",
-        "token": "💎 TBN tokens will be available after mainnet launch on Binance Smart Chain!",
-        "help": "❓ Type /start to see all available information and features!"
-    }
-    
-    for keyword, response in keywords_responses.items():
-        if keyword in message_text.lower() and random.random() < 0.3:  # 30% chance to respond
-            try:
-                await update.message.reply_text(response, parse_mode="Markdown")
-                break
-            except Exception as e:
-                logger.error(f"Error responding to keyword {keyword}: {e}")
+            logging.error(f"❌ Error restricting flooding user {user.id}: {e}")
+            action = f"Muting failed: {e}"
+    text = (f"🌊 Flood detected in {chat.title or chat.id}: {user.full_name} "
+            f"(@{user.username or '-'}, {user.id}) sent about {rate:.0f} messages in {FLOOD_WINDOW:.0f}s. {action}")
+    for admin_id in admin_users:
+        try:
+            await bot.send_message(chat_id=admin_id, text=text)
+        except Exception as e:
+            logging.error(f"❌ Error notifying admin {admin_id} about flood: {e}")
 
 # Admin commands
 
@@ -400,22 +700,146 @@ async def admin_stats(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
         return
     
     total_users = len(user_activity)
-    active_users_24h = sum(1 for user in user_activity.values() 
-                          if datetime.now() - user['last_activity'] <= timedelta(hours=24))
-    total_messages = sum(user.get('message_count', 0) for user in user_activity.values())
+    active_users_1h = user_activity.active_users("1h")
+    active_users_24h = user_activity.active_users("24h")
+    active_users_7d = user_activity.active_users("7d")
+    total_messages = user_activity.total_messages
     
     stats_text = (
         f"📊 **Bot Statistics**\n\n"
         f"👥 **Total Users Tracked:** {total_users}\n"
-        f"🟢 **Active Users (24h):** {active_users_24h}\n"
+        f"🟢 **Active Users (1h / 24h / 7d):** {active_users_1h} / {active_users_24h} / {active_users_7d}\n"
         f"💬 **Total Messages:** {total_messages}\n"
         f"📝 **Auto Posts Available:** {len(auto_posts)}\n"
-        f"⏰ **Auto Post Interval:** {AUTO_POST_INTERVAL} seconds\n"
-        f"🔧 **Admin Users:** {len(admin_users)}"
+        f"⏰ **Auto Post Interval:** {AUTO_POST_INTERVAL} seconds (/jobs for all schedules)\n"
+        f"🔧 **Admin Users:** {len(admin_users)}\n"
+        f"🤖 **Hosted Bots:** {', '.join(hosted.name for hosted in hosted_bots)}\n"
+        f"🖱️ **Menu Edits Skipped:** {button_stats['edits_skipped']} "
+        f"(of {button_stats['edits'] + button_stats['edits_skipped']} clicks)"
     )
     
     await update.message.reply_text(stats_text, parse_mode="Markdown")
 
+async def admin_jobs(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """List scheduled jobs (admin only)."""
+    if not is_admin(update.effective_user.id):
+        await update.message.reply_text("❌ You don't have permission to use this command.")
+        return
+    
+    if not leader_election.is_leader:
+        await update.message.reply_text("⏸️ This instance is on standby - scheduled jobs run on the leader.")
+        return
+    
+    if not scheduler.jobs:
+        await update.message.reply_text("🗓️ No scheduled jobs.")
+        return
+    
+    now = time.time()
+    jobs_text = "🗓️ Scheduled jobs:\n\n"
+    for name, job in sorted(scheduler.jobs.items()):
+        state = "⏸️ paused" if job.paused else f"▶️ next in {max(job.fire_at - now, 0):.0f}s"
+        last = f"{now - job.last_run:.0f}s ago" if job.last_run else "never"
+        jobs_text += f"{name} - every {job.interval:g}s, {state}, last run {last}, {job.run_count} runs\n"
+        if job.last_error:
+            jobs_text += f"   ❌ {job.last_error[:100]}\n"
+    
+    await update.message.reply_text(jobs_text)
+
+async def admin_pause_job(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Pause a scheduled job by name (admin only)."""
+    if not is_admin(update.effective_user.id):
+        await update.message.reply_text("❌ You don't have permission to use this command.")
+        return
+    
+    if not context.args:
+        await update.message.reply_text("📝 Usage: /pausejob <name>\n\nUse /jobs to see all jobs.")
+        return
+    
+    if not leader_election.is_leader:
+        await update.message.reply_text("⏸️ This instance is on standby - scheduled jobs run on the leader.")
+    elif scheduler.pause(context.args[0]):
+        await update.message.reply_text(f"⏸️ Job {context.args[0]} paused.")
+    else:
+        await update.message.reply_text("❌ Unknown job. Use /jobs to see all jobs.")
+
+async def admin_resume_job(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Resume a paused job by name (admin only)."""
+    if not is_admin(update.effective_user.id):
+        await update.message.reply_text("❌ You don't have permission to use this command.")
+        return
+    
+    if not context.args:
+        await update.message.reply_text("📝 Usage: /resumejob <name>\n\nUse /jobs to see all jobs.")
+        return
+    
+    if not leader_election.is_leader:
+        await update.message.reply_text("⏸️ This instance is on standby - scheduled jobs run on the leader.")
+    elif scheduler.resume(context.args[0]):
+        await update.message.reply_text(f"▶️ Job {context.args[0]} resumed.")
+    else:
+        await update.message.reply_text("❌ Unknown job. Use /jobs to see all jobs.")
+
+async def admin_set_interval(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Set a group's own broadcast interval (admin only)."""
+    if not is_admin(update.effective_user.id):
+        await update.message.reply_text("❌ You don't have permission to use this command.")
+        return
+    
+    args = context.args or []
+    if len(args) != 3 or args[0] not in BROADCAST_JOBS or not args[1].lstrip('-').isdigit() \
+            or not (args[2].isdigit() or args[2] == "default"):
+        await update.message.reply_text(
+            "📝 Usage: /setinterval <auto_post|start_reminder> <chat_id> <seconds|default>"
+        )
+        return
+    
+    # Applies to the groups of the bot the command was sent to
+    groups = hosted_bot(context).groups
+    kind, chat_id = args[0], int(args[1])
+    groups.set_setting(chat_id, f"{kind}_interval", None if args[2] == "default" else max(int(args[2]), 10))
+    if leader_election.is_leader:
+        schedule_broadcasts()
+    
+    interval = groups.setting(chat_id, f"{kind}_interval", BROADCAST_JOBS[kind][1])
+    await update.message.reply_text(f"✅ {kind} interval for {chat_id} is now {interval}s.")
+
+async def admin_breakers(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """List this bot's chats with failing sends or recorded migrations (admin only)."""
+    if not is_admin(update.effective_user.id):
+        await update.message.reply_text("❌ You don't have permission to use this command.")
+        return
+    
+    now = time.time()
+    lines = []
+    for chat_id, breaker in sorted(hosted_bot(context).engine.breakers.items()):
+        if breaker.migrated_to is not None:
+            lines.append(f"➡️ {chat_id} migrated to {breaker.migrated_to}")
+        elif breaker.is_open:
+            lines.append(f"🔴 {chat_id} - {breaker.failures} failures, next probe in "
+                         f"{max(breaker.opened_until - now, 0):.0f}s\n   {breaker.last_error}")
+        elif breaker.failures:
+            lines.append(f"🟡 {chat_id} - {breaker.failures} failures\n   {breaker.last_error}")
+    
+    if not lines:
+        await update.message.reply_text("🟢 All broadcast chats are healthy.")
+        return
+    await update.message.reply_text("🔌 Chat breakers:\n\n" + "\n".join(lines) + "\n\nUse /resetbreaker <chat_id> to retry a chat now.")
+
+async def admin_reset_breaker(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Close a chat's circuit breaker so the next round sends to it (admin only)."""
+    if not is_admin(update.effective_user.id):
+        await update.message.reply_text("❌ You don't have permission to use this command.")
+        return
+    
+    if not context.args or not context.args[0].lstrip('-').isdigit():
+        await update.message.reply_text("📝 Usage: /resetbreaker <chat_id>\n\nUse /breakers to see failing chats.")
+        return
+    
+    if hosted_bot(context).engine.reset_breaker(int(context.args[0])):
+        await update.message.reply_text(f"🟢 Breaker for {context.args[0]} closed.")
+    else:
+        await update.message.reply_text("❌ No failing chat with that ID. Use /breakers to see failing chats.")
+
 async def admin_add_post(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Add a new auto post (admin only)."""
     if not is_admin(update.effective_user.id):
@@ -431,6 +855,7 @@ async def admin_add_post(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     
     new_post = " ".join(context.args)
     auto_posts.append(new_post)
+    store.save_auto_posts(auto_posts)
     
     await update.message.reply_text(
         f"✅ **Auto post added successfully!**\n\n"
@@ -471,6 +896,7 @@ async def admin_remove_post(update: Update, context: ContextTypes.DEFAULT_TYPE)
     
     if 0 <= index < len(auto_posts):
         removed_post = auto_posts.pop(index)
+        store.save_auto_posts(auto_posts)
         await update.message.reply_text(
             f"✅ **Post removed successfully!**\n\n"
             f"📝 **Removed:** {removed_post[:100]}{'...' if len(removed_post) > 100 else ''}"
@@ -483,7 +909,7 @@ async def admin_remove_post(update: Update, context: ContextTypes.DEFAULT_TYPE)
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle the /start command by showing the main menu."""
     try:
-        logging.info("Processing /start command - building welcome message")
+        logging.info("Processing /start command - building welcome message", extra={"category": "command"})
         welcome_text = (
             "🚀 **Welcome to TrustCoin (TBN)!** 🚀\n\n"
             "💎 **Revolutionary Mobile Mining on BSC**\n\n"
@@ -493,13 +919,13 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
             "📱 **Download:** https://www.trust-coin.site"
         )
         
-        logging.info("Sending welcome message with menu")
+        logging.info("Sending welcome message with menu", extra={"category": "command"})
         await update.message.reply_text(
             welcome_text, 
-            reply_markup=build_main_menu(), 
+            reply_markup=build_main_menu(context), 
             parse_mode="Markdown"
         )
-        logging.info("Welcome message sent successfully")
+        logging.info("Welcome message sent successfully", extra={"category": "command"})
     except Exception as e:
         logging.error(f"Error in start function: {e}")
         # Send simple message if there's an error
@@ -512,648 +938,460 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
 async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle all callback queries from inline keyboards."""
     query = update.callback_query
-    await query.answer()
-    data = query.data
-
-    if data == "overview":
-        text = (
-            "📋 **Overview & Getting Started**\n\n"
-            "🌟 TrustCoin (TBN) is a revolutionary blockchain-based rewards ecosystem on Binance Smart Chain <mcreference link=\"https://www.trust-coin.site/\" index=\"0\">0</mcreference>.\n\n"
-            "🚀 **How to Get Started:**\n"
-            "1️⃣ **Download the TrustCoin app** for iOS or Android and create your account\n"
-            "🎁 Receive a **1,000-point welcome bonus** instantly!\n\n"
-            "2️⃣ **Start 24-hour mining sessions** that continue even when the app is closed\n"
-            "💾 Progress saves automatically every hour\n\n"
-            "3️⃣ **Complete missions & spin the Lucky Wheel** for extra points\n"
-            "🎯 Multiple ways to earn rewards daily\n\n"
-            "4️⃣ **Convert your points to real TBN tokens** via automated smart contract\n"
-            "💰 **1,000 points = 1 TBN token**\n\n"
-            "📱 The mobile app is cross-platform (React Native) with chat and team features\n"
-            "🔒 TrustCoin emphasizes transparency, community-driven development, and long-term value"
-        )
-        # Check if message has photo, if so send new message instead of editing
-        if query.message.photo:
-            await query.message.reply_text(text=text, reply_markup=build_main_menu(), parse_mode="Markdown")
-        else:
-            await query.edit_message_text(text=text, reply_markup=build_main_menu(), parse_mode="Markdown")
-
-    elif data == "points":
-        text = (
-            "⛏️ **Mining & Points System**\n\n"
-            "🕐 **24-Hour Mining Sessions:**\n"
-            "• Earn up to **1,000 points per cycle**\n"
-            "• Progress saves every hour automatically\n"
-            "• Sessions resume after app restart\n\n"
-            "📊 **Reward Formula:**\n"
-            "`(session duration ÷ 86,400) × 1,000 points`\n\n"
-            "📺 **Advertisement Rewards:**\n"
-            "• Watch ads to unlock bonus strikes\n"
-            "• Get multipliers for extra rewards\n\n"
-            "💎 **Point-to-TBN Conversion:**\n"
-            "• **Rate:** 1 TBN per 1,000 points\n"
-            "• **Minimum:** 1,000 points redemption\n"
-            "• **Daily Limit:** 100,000 points maximum\n"
-            "• **Example:** 10,000 points = 10 TBN tokens\n\n"
-            "🔗 **Smart Contract Features:**\n"
-            "• Automated conversion on BSC\n"
-            "• Gas fees initially covered by project\n"
-            "• **Burn Rates:** 1% transfers, 0.5% conversions, 2% premium features"
-        )
-        # Check if message has photo, if so send new message instead of editing
-        if query.message.photo:
-            await query.message.reply_text(text=text, reply_markup=build_main_menu(), parse_mode="Markdown")
-        else:
-            await query.edit_message_text(text=text, reply_markup=build_main_menu(), parse_mode="Markdown")
-
-    elif data == "missions":
-        text = (
-            "🎯 **Missions & Rewards System**\n\n"
-            "🏆 **Trophy Missions (1-500 points):**\n"
-            "• First mining session completion\n"
-            "• Consecutive collection days\n"
-            "• Referring new users\n"
-            "• Daily login streaks\n\n"
-            "💎 **Gem Missions (1,000-5,000 points):**\n"
-            "• 30-day mining streaks\n"
-            "• Top efficiency achievements\n"
-            "• Completing all trophy missions\n\n"
-            "🎁 **Chest Missions (2,000-10,000 points):**\n"
-            "• 90-day consecutive streaks\n"
-            "• Building a team of 20+ referrals\n"
-            "• Collecting 100,000+ total points\n\n"
-            "🪙 **Coin Missions (100-1,000 points):**\n"
-            "• Daily tasks like sharing the app\n"
-            "• Updating your profile\n"
-            "• Joining community events\n\n"
-            "🎰 **Lucky Wheel System:**\n"
-            "• Spin for **1-1,500 points**\n"
-            "• **3 strikes per cycle**\n"
-            "• **6-hour cooldown** between cycles\n"
-            "• **Probabilities:** 50% (1-100), 30% (101-200), 15% (201-300), 5% (301-500)\n"
-            "• Watch ads for additional spins and multipliers!"
-        )
-        # Check if message has photo, if so send new message instead of editing
-        if query.message.photo:
-            await query.message.reply_text(text=text, reply_markup=build_main_menu(), parse_mode="Markdown")
-        else:
-            await query.edit_message_text(text=text, reply_markup=build_main_menu(), parse_mode="Markdown")
-
-    elif data == "referral":
-        text = (
-            "👥 **Referral Program & Community**\n\n"
-            "🔗 **Two-Tier Referral System:**\n"
-            "• **Public codes** for everyone\n"
-            "• **Exclusive codes** for top referrers\n\n"
-            "🎁 **New User Benefits:**\n"
-            "• **1,000-point welcome bonus** upon registration\n"
-            "• **500 extra points** when using invitation code\n"
-            "• Instant access to all features\n\n"
-            "💰 **Referrer Rewards:**\n"
-            "• **1,000 points per successful referral**\n"
-            "• Share of referee's mining rewards\n"
-            "• Recognition badges and bonuses\n"
-            "• Leaderboard rankings\n\n"
-            "👨‍👩‍👧‍👦 **Community Features:**\n"
-            "• Team up with other miners\n"
-            "• Chat in group conversations\n"
-            "• Share mining strategies\n"
-            "• Compete on global leaderboards\n"
-            "• Participate in community events"
-        )
-        # Check if message has photo, if so send new message instead of editing
-        if query.message.photo:
-            await query.message.reply_text(text=text, reply_markup=build_main_menu(), parse_mode="Markdown")
-        else:
-            await query.edit_message_text(text=text, reply_markup=build_main_menu(), parse_mode="Markdown")
-
-    elif data == "roadmap":
-        text = (
-            "📈 **Tokenomics & Roadmap**\n\n"
-            "💰 **Supply Distribution (20B TBN Total):**\n"
-            "• 🏆 **12B** - Mining Rewards Pool (60%)\n"
-            "• 💧 **3B** - Liquidity Reserve (15%)\n"
-            "• 🛠️ **3B** - Development Fund (15%)\n"
-            "• 👥 **2B** - Team Allocation (10%)\n\n"
-            "🔥 **Deflationary Mechanics:**\n"
-            "• **1%** burn on all token transfers\n"
-            "• **0.5%** burn on point conversions\n"
-            "• **2%** burn on premium features\n"
-            "• **Variable burns** for milestone achievements\n\n"
-            "🏛️ **Governance & Staking:**\n"
-            "• Stake TBN tokens for additional rewards\n"
-            "• Token-weighted voting system\n"
-            "• Variable APY based on staking duration\n"
-            "• Premium app features unlock\n\n"
-            "🗺️ **Development Roadmap:**\n"
-            "**2025:** Foundation & Enhancement\n"
-            "✅ Mining, missions, lucky wheel systems\n"
-            "✅ Referral and advertisement integration\n\n"
-            "**2025-2026:** Testing & Launch\n"
-            "🔄 Security audits and optimization\n"
-            "🚀 Mainnet launch on BSC\n"
-            "🆔 KYC/AI verification systems\n\n"
-            "**2026-2027:** Expansion & Innovation\n"
-            "📈 Major exchange listings\n"
-            "🏦 DeFi protocol integration\n"
-            "🌐 Trust blockchain development\n"
-            "🏛️ DAO governance implementation\n"
-            "🎨 NFT marketplace launch\n"
-            "🌍 Metaverse partnerships\n"
-            "🌉 Cross-chain bridge development\n"
-            "💳 Global payment system integration"
-        )
-        # Check if message has photo, if so send new message instead of editing
-        if query.message.photo:
-            await query.message.reply_text(text=text, reply_markup=build_main_menu(), parse_mode="Markdown")
-        else:
-            await query.edit_message_text(text=text, reply_markup=build_main_menu(), parse_mode="Markdown")
-
-    elif data == "download":
-        # Download app section with direct links
-        download_keyboard = InlineKeyboardMarkup([
-            [InlineKeyboardButton("📱 Download for iOS", url="https://apps.apple.com/app/trustcoin")],
-            [InlineKeyboardButton("🤖 Download for Android", url="https://play.google.com/store/apps/details?id=com.jawad06_dev.trustcoinmobile.v3")],
-            [InlineKeyboardButton("🌐 Visit Official Website", url="https://www.trust-coin.site")],
-            [InlineKeyboardButton("⬅️ Back to Main Menu", callback_data="back")],
-        ])
-        text = (
-            "📱 **Download TrustCoin App**\n\n"
-            "🚀 **Get started with TrustCoin today!**\n\n"
-            "📲 **Available on both platforms:**\n"
-            "• iOS App Store\n"
-            "• Google Play Store\n\n"
-            "🎁 **What you get:**\n"
-            "• **1,000 points welcome bonus**\n"
-            "• **24/7 mining capability**\n"
-            "• **Cross-platform compatibility**\n"
-            "• **Real-time chat & team features**\n"
-            "• **Secure blockchain integration**\n\n"
-            "💡 **System Requirements:**\n"
-            "• iOS 12.0+ or Android 6.0+\n"
-            "• Internet connection\n"
-            "• 50MB storage space\n\n"
-            "🔗 Click the buttons below to download:"
-        )
-        await query.edit_message_text(
-            text, reply_markup=download_keyboard, parse_mode="Markdown"
-        )
-
-    elif data == "security":
-        text = (
-            "🔒 **Security & Anti-Cheat System**\n\n"
-            "🛡️ **Multi-Layer Security:**\n"
-            "• **Device fingerprinting** to prevent multi-account abuse\n"
-            "• **Real-time session validation** with time-based authentication\n"
-            "• **AI-powered pattern analysis** to detect automation and cheating\n"
-            "• **Geographic consistency checks** for authentic user behavior\n\n"
-            "⚖️ **Fair Play Enforcement:**\n"
-            "• **One account per person** policy\n"
-            "• **Real device requirement** - no emulators\n"
-            "• **No automation tools** allowed\n"
-            "• **Permanent bans** for violations\n\n"
-            "🔐 **Blockchain Security:**\n"
-            "• **Smart contract audits** by leading security firms\n"
-            "• **Deflationary mechanics** for real value\n"
-            "• **Anti-whale protection** mechanisms\n"
-            "• **Transparent on-chain operations**\n\n"
-            "🚨 **Fraud Prevention:**\n"
-            "• **Advanced encryption** for all data\n"
-            "• **Behavioral analysis** algorithms\n"
-            "• **Community reporting** system\n"
-            "• **24/7 monitoring** infrastructure\n\n"
-            "✅ **Your safety is our priority!**"
-        )
-        # Check if message has photo, if so send new message instead of editing
-        if query.message.photo:
-            await query.message.reply_text(text=text, reply_markup=build_main_menu(), parse_mode="Markdown")
-        else:
-            await query.edit_message_text(text=text, reply_markup=build_main_menu(), parse_mode="Markdown")
-
-    elif data == "faq":
-        text = (
-            "❓ **Frequently Asked Questions**\n\n"
-            "**Q1: How do I start mining?**\n"
-            "A: Download the app, register, and tap the mining button. Sessions run for 24 hours automatically.\n\n"
-            "**Q2: When can I withdraw my TBN tokens?**\n"
-            "A: Token conversion will be available after mainnet launch on BSC (2025-2026).\n\n"
-            "**Q3: Is TrustCoin free to use?**\n"
-            "A: Yes! The app is completely free. You only need internet connection.\n\n"
-            "**Q4: How many accounts can I have?**\n"
-            "A: Only ONE account per person. Multiple accounts will result in permanent ban.\n\n"
-            "**Q5: What's the minimum withdrawal?**\n"
-            "A: Minimum conversion is 1,000 points = 1 TBN token.\n\n"
-            "**Q6: Can I use emulators or bots?**\n"
-            "A: No! Only real devices are allowed. Automation tools are strictly prohibited.\n\n"
-            "**Q7: How do referrals work?**\n"
-            "A: Share your referral code. You get 1,000 points per successful referral.\n\n"
-            "**Q8: Is my data safe?**\n"
-            "A: Yes! We use advanced encryption and security measures to protect your data.\n\n"
-            "**Q9: When will TBN be listed on exchanges?**\n"
-            "A: Major exchange listings are planned for 2026-2027 after mainnet launch.\n\n"
-            "**Q10: How can I contact support?**\n"
-            "A: Join our Telegram group or visit our website for support."
-        )
-        # Check if message has photo, if so send new message instead of editing
-        if query.message.photo:
-            await query.message.reply_text(text=text, reply_markup=build_main_menu(), parse_mode="Markdown")
-        else:
-            await query.edit_message_text(text=text, reply_markup=build_main_menu(), parse_mode="Markdown")
-
-    elif data == "social":
-        # Social links as buttons
-        social_keyboard = InlineKeyboardMarkup([
-            [InlineKeyboardButton("🌐 Website", url="https://www.trust-coin.site")],
-            [InlineKeyboardButton("📘 Facebook ➡️", url="https://www.facebook.com/people/TrustCoin/61579302546502/")],
-            [InlineKeyboardButton("✈️ Telegram Group ➡️", url="https://t.me/+7A9zYR8BCU03ODA0")],
-            [InlineKeyboardButton("🐦 X/Twitter ➡️", url="https://x.com/TBNTrustCoin")],
-            [InlineKeyboardButton("Back to Main Menu", callback_data="back")],
-        ])
-        await query.edit_message_text(
-            "Choose a link to open:", reply_markup=social_keyboard
-        )
-
-    elif data == "language_groups":
-        # Language groups as direct buttons with flags - Only English now
-        language_keyboard = InlineKeyboardMarkup([
-            [InlineKeyboardButton("🇺🇸 English Group", url="https://t.me/tructcoin_bot")],
-            [InlineKeyboardButton("⬅️ Back to Main Menu", callback_data="back")],
-        ])
-        await query.edit_message_text(
-            "Join our TrustCoin community:",
-            reply_markup=language_keyboard
-        )
+    hosted = hosted_bot(context)
+    content_table = hosted.content
+    section = content_table.get(query.data)
+    message = query.message
+    answer = query.answer(cache_time=CALLBACK_CACHE_TIME)
+    button_stats['answers'] += 1
 
-    # Language group handlers removed - now using direct URL buttons
-
-    elif data == "back":
-        # Check if message has photo, if so send new message instead of editing
-        if query.message.photo:
-            await query.message.reply_text(
-                "Main menu:", reply_markup=build_main_menu()
-            )
-        else:
-            await query.edit_message_text(
-                "Main menu:", reply_markup=build_main_menu()
-            )
-
-    else:
-        # Check if message has photo, if so send new message instead of editing
-        if query.message.photo:
-            await query.message.reply_text(
-                "Invalid option. Returning to main menu.", reply_markup=build_main_menu()
-            )
-        else:
-            await query.edit_message_text(
-                "Invalid option. Returning to main menu.", reply_markup=build_main_menu()
-            )
+    # Check if message has photo, if so send new message instead of editing
+    if section.reply_if_photo and message.photo:
+        button_stats['replies'] += 1
+        await asyncio.gather(answer, message.reply_text(
+            text=section.text, reply_markup=section.reply_markup, parse_mode=section.parse_mode
+        ))
+        return
 
-# Flask app for webhook
-flask_app = Flask(__name__)
+    # Skip edits that would leave the message unchanged
+    message_key = (hosted.name, message.chat_id, message.message_id)
+    rendered = (section.key, content_table.version)
+    if rendered_sections.get(message_key) == rendered:
+        button_stats['edits_skipped'] += 1
+        await answer
+        return
 
-@flask_app.route('/webhook', methods=['POST'])
-def webhook():
-    """Handle incoming webhook updates."""
+    button_stats['edits'] += 1
     try:
-        update = Update.de_json(request.get_json(force=True), bot_app)
-        asyncio.run(bot_app.process_update(update))
-        return 'OK'
-    except Exception as e:
-        logging.error(f"Error processing webhook: {e}")
-        return 'Error', 500
-
-@flask_app.route('/health')
-def health():
-    """Health check endpoint."""
-    return 'OK'
-
-@flask_app.route('/')
-def home():
-    """Home endpoint."""
-    return 'TrustCoin Bot is running!'
-
-def run_flask():
-    """Run Flask app in a separate thread."""
-    port = int(os.getenv('PORT', 8443))
-    
-    # Suppress Flask development server warning
-    import logging
-    log = logging.getLogger('werkzeug')
-    log.setLevel(logging.ERROR)
-    
-    # Always run Flask server for render.com compatibility
-    flask_app.run(host='0.0.0.0', port=port, debug=False)
+        await asyncio.gather(answer, query.edit_message_text(
+            text=section.text, reply_markup=section.reply_markup, parse_mode=section.parse_mode
+        ))
+    except BadRequest as e:
+        if "not modified" not in str(e).lower():
+            raise
+        button_stats['not_modified'] += 1
+    rendered_sections.put(message_key, rendered)
 
 async def force_clear_webhook():
-    """Force clear webhook and wait for conflicts to resolve."""
+    """Force clear every bot's webhook and wait for conflicts to resolve."""
     try:
-        # Create a temporary bot instance just for clearing webhook
-        temp_bot = Bot(token=BOT_TOKEN_ENG)
+        # Temporary bot instances just for clearing webhooks, on the shared send pool
+        temp_bots = [Bot(token=config.token, base_url=BOT_API_BASE_URL,
+                         request=send_request, get_updates_request=send_request)
+                     for config in BOT_CONFIGS]
         
-        logging.info("🔄 Force clearing webhook and pending updates...")
-        await temp_bot.delete_webhook(drop_pending_updates=True)
+        logging.info("🔄 Force clearing webhooks and pending updates...")
+        for temp_bot in temp_bots:
+            await temp_bot.delete_webhook(drop_pending_updates=True)
         
         # Wait for any existing instances to timeout
         logging.info("⏳ Waiting 60 seconds for existing instances to timeout...")
         await asyncio.sleep(60)
         
         # Try to get updates to clear any remaining
-        try:
-            await temp_bot.get_updates(timeout=1, limit=100)
-        except:
-            pass
+        for temp_bot in temp_bots:
+            try:
+                await temp_bot.get_updates(timeout=1, limit=100)
+            except:
+                pass
             
         logging.info("✅ Webhook cleared and conflicts should be resolved")
         
     except Exception as e:
         logging.error(f"Error force clearing webhook: {e}")
+    finally:
+        # The pool's connections belong to this event loop; the bots reopen them on theirs
+        await send_request.shutdown()
 
-def main() -> None:
-    """Initialize the bot."""
-    global bot_app
+async def wait_for_polling_slot(bot: Bot, max_backoff: float = 30.0) -> None:
+    """Probe getUpdates and back off only while another poller is still active."""
+    delay = 1.0
+    while True:
+        try:
+            await bot.get_updates(timeout=0, limit=1)
+            return
+        except Conflict:
+            logging.warning(f"⚠️ getUpdates conflict - another instance is still polling, retrying in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_backoff)
+
+async def fast_start(hosted: HostedBot) -> None:
+    """Take the bot's instance lease and make sure polling is free, without fixed sleeps."""
+    token = await hosted.lease.acquire()
+    hosted.lease_task = asyncio.create_task(hold_instance_lease(hosted))
+    logging.info(f"🔒 Instance lease for bot {hosted.name} acquired (token {token})")
     
-    # Force clear webhook first to resolve conflicts
-    logging.info("🚀 Starting TrustCoin Bot - clearing conflicts first...")
+    await hosted.bot.delete_webhook(drop_pending_updates=True)
+    await wait_for_polling_slot(hosted.bot)
+    logging.info(f"✅ Polling slot for bot {hosted.name} is free")
+
+async def hold_instance_lease(hosted: HostedBot) -> None:
+    """Renew the bot's instance lease; if another instance takes it over, stop polling until it is ours again."""
+    while True:
+        await hosted.lease.keep_alive()
+        logging.error(f"🚨 Bot {hosted.name} lost its instance lease - stopping polling until it is free again")
+        liveness.stop_polling(hosted.name)
+        if hosted.application.updater.running:
+            await hosted.application.updater.stop()
+        token = await hosted.lease.acquire()
+        logging.info(f"🔒 Instance lease for bot {hosted.name} taken back (token {token})")
+        await wait_for_polling_slot(hosted.bot)
+        await start_polling(hosted)
+        logging.info(f"✅ Bot {hosted.name} is polling again")
+
+# Count updates and record startup metrics on the first update
+async def track_update_received(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    updates_received.inc(hosted_bot(context).name, update_type(update))
+    liveness.mark_update()
+    if 'first_update_seconds' not in startup_metrics:
+        startup_metrics['first_update_seconds'] = time.monotonic() - PROCESS_STARTED
+        logging.info(f"⏱️ Time to first update: {startup_metrics['first_update_seconds']:.1f}s")
+
+# Track /start command usage
+async def track_start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     try:
-        asyncio.run(force_clear_webhook())
+        logging.info("Received /start command from user %s", update.effective_user.id if update.effective_user else 'Unknown',
+                     extra={"category": "command"})
+        if update.effective_user:
+            track_user_activity(update.effective_user.id, update.effective_user.username, "start_command")
+        await start(update, context)
+        logging.info("Successfully processed /start command", extra={"category": "command"})
     except Exception as e:
-        logging.error(f"Error in force clear: {e}")
-        # Continue anyway
+        logging.error(f"Error in /start command: {e}")
+        raise
+
+# Debug trace of every message, registered FIRST (sample with LOG_SAMPLING="message_trace=0.01")
+async def debug_all_messages(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    if update.message:
+        chat_id = update.effective_chat.id
+        user_id = update.effective_user.id if update.effective_user else "Unknown"
+        text = update.message.text
+        logging.info(
+            "🔍 DEBUG - Message: Chat ID: %s, Type: %s, User: %s, Text: %.50s, MsgType: %s",
+            chat_id, update.effective_chat.type, user_id, text or 'No text', "text" if text else "other",
+            extra={"category": "message_trace", "chat_id": chat_id, "user_id": user_id},
+        )
+
+def webhook_path(hosted: HostedBot) -> str:
+    """WEBHOOK_PATH for a single bot; WEBHOOK_PATH/<name> when several bots share the server."""
+    if len(BOT_CONFIGS) == 1:
+        return WEBHOOK_PATH
+    return f"{WEBHOOK_PATH.rstrip('/')}/{hosted.name}"
+
+async def start_services() -> None:
+    """Start what all hosted bots share: the store, the web server and liveness checks."""
+    global web_server
+    logging.info("🚀 Bots initialized - starting shared services")
     
     try:
-        # Create health check file for Docker
-        with open('/tmp/bot_healthy', 'w') as f:
-            f.write('starting')
-            
-        bot_app = ApplicationBuilder().token(BOT_TOKEN_ENG).build()
-        
-        # Track /start command usage
-        async def track_start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        await load_persistent_state()
+    except Exception as e:
+        logging.error(f"❌ Error loading persistent state: {e}")
+    
+    # Web server runs on the bots' own event loop, with one webhook per bot
+    web_server = WebServer(
+        {webhook_path(hosted): hosted.application for hosted in hosted_bots} if WEBHOOK_URL else None,
+        port=PORT,
+        secret_token=WEBHOOK_SECRET,
+        metrics=metrics,
+        liveness=liveness,
+    )
+    try:
+        await web_server.start()
+    except Exception as e:
+        logging.error(f"❌ Error starting web server: {e}")
+    
+    # Measure event-loop lag and watch for a blocked loop
+    background_tasks.append(asyncio.create_task(liveness.run()))
+
+async def start_bot(hosted: HostedBot) -> None:
+    """Start receiving one bot's updates, by webhook or by polling."""
+    application = hosted.application
+    if WEBHOOK_URL:
+        await application.bot.set_webhook(
+            url=WEBHOOK_URL.rstrip('/') + webhook_path(hosted),
+            secret_token=WEBHOOK_SECRET,
+            allowed_updates=ALLOWED_UPDATES,
+            drop_pending_updates=True,
+        )
+    else:
+        if FAST_START:
+            await fast_start(hosted)
+        else:
+            # Force clear webhook and pending updates
             try:
-                logging.info(f"Received /start command from user {update.effective_user.id if update.effective_user else 'Unknown'}")
-                if update.effective_user:
-                    track_user_activity(update.effective_user.id, update.effective_user.username, "start_command")
-                await start(update, context)
-                logging.info("Successfully processed /start command")
+                await application.bot.delete_webhook(drop_pending_updates=True)
+                logging.info(f"✅ Webhook of bot {hosted.name} cleared forcefully")
+                await asyncio.sleep(2)
             except Exception as e:
-                logging.error(f"Error in /start command: {e}")
-                raise
-        
-        # Add command handlers
-        bot_app.add_handler(CommandHandler("start", track_start_command))
-        bot_app.add_handler(CommandHandler("stats", admin_stats))
-        bot_app.add_handler(CommandHandler("addpost", admin_add_post))
-        bot_app.add_handler(CommandHandler("listposts", admin_list_posts))
-        bot_app.add_handler(CommandHandler("removepost", admin_remove_post))
+                logging.error(f"Error clearing webhook: {e}")
         
-        # Add callback query handler
-        bot_app.add_handler(CallbackQueryHandler(button_handler))
+        await start_polling(hosted)
+    await application.start()
+    
+    # Pick up edits to the bot's menu content without a restart
+    background_tasks.append(asyncio.create_task(hosted.content.watch(CONTENT_RELOAD_INTERVAL)))
+    logging.info(f"🤖 Bot {hosted.name} (@{application.bot.username}) is receiving updates")
+
+async def start_polling(hosted: HostedBot) -> None:
+    """Start fetching one bot's updates with getUpdates."""
+    application = hosted.application
+    # Highly optimized polling settings to prevent conflicts; fetch errors go to error_handler
+    await application.updater.start_polling(
+        drop_pending_updates=True,
+        timeout=5,  # Very short timeout
+        poll_interval=3.0,  # Longer interval between requests
+        read_timeout=10,
+        write_timeout=10,
+        connect_timeout=10,
+        bootstrap_retries=3,  # Retry on startup
+        allowed_updates=ALLOWED_UPDATES,  # Only essential updates
+        error_callback=lambda error: application.create_task(application.process_error(None, error)),
+    )
+    liveness.start_polling(hosted.name)
+
+async def stop_bot(hosted: HostedBot) -> None:
+    """Stop one bot's updates, drop its pending welcomes and release its instance lease."""
+    application = hosted.application
+    # Stop holding the lease first, so it cannot restart polling behind our back
+    lease_task, hosted.lease_task = hosted.lease_task, None
+    if lease_task:
+        lease_task.cancel()
+        await asyncio.gather(lease_task, return_exceptions=True)
+    liveness.stop_polling(hosted.name)
+    if application.updater and application.updater.running:
+        await application.updater.stop()
+    if application.running:
+        await application.stop()
+    await hosted.welcomes.close()
+    if lease_task:
+        try:
+            await asyncio.to_thread(hosted.lease.release)
+        except Exception as e:
+            logging.error(f"Error releasing instance lease of bot {hosted.name}: {e}")
+
+async def stop_services() -> None:
+    """Stop the scheduler and the web server and flush buffered state."""
+    for task in background_tasks:
+        task.cancel()
+    await leader_election.stop()
+    if web_server:
+        await web_server.stop()
+    await store.close()
+    logging.info("💾 Store flushed and closed")
+
+# Add aggressive error handler with restart mechanism
+conflict_count = 0
+max_conflicts = 5
+
+async def error_handler(update, context):
+    """Handle errors during bot operation."""
+    global conflict_count
+    
+    if "Conflict" in str(context.error):
+        conflict_count += 1
+        logging.warning(f"⚠️ Bot conflict detected ({conflict_count}/{max_conflicts}) - will retry automatically")
         
-        # Add chat member handler for welcome messages
-        bot_app.add_handler(ChatMemberHandler(handle_chat_member_update, ChatMemberHandler.CHAT_MEMBER))
+        if conflict_count >= max_conflicts:
+            logging.error("🚨 Too many conflicts! Attempting aggressive restart...")
+            try:
+                # Stop current application
+                await context.application.stop()
+                await asyncio.sleep(30)  # Wait 30 seconds
+                
+                # Clear webhook again
+                await context.application.bot.delete_webhook(drop_pending_updates=True)
+                await asyncio.sleep(10)
+                
+                # Restart application
+                await context.application.start()
+                conflict_count = 0  # Reset counter
+                logging.info("✅ Bot restarted successfully after conflicts")
+            except Exception as e:
+                logging.error(f"❌ Failed to restart bot: {e}")
+    else:
+        logging.error(f"❌ Bot error: {context.error}")
+
+def create_hosted_bot(config: BotConfig, request=None) -> HostedBot:
+    """Create one bot's application and state and register all handlers.
+    
+    `request` replaces the HTTP backend for sends, e.g. with a stub for
+    benchmarks; by default every bot sends through the shared `send_request`.
+    Updates from different chats are handled concurrently, each chat's in order.
+    Bot API calls are timed through InstrumentedRequest either way, and
+    all calls except getUpdates go through the bot's own priority dispatcher.
+    """
+    outbound = PriorityDispatcher(rate=OUTBOUND_RATE, classes=OUTBOUND_CLASSES, wait_seconds=outbound_wait,
+                                  shed=outbound_shed, labels=(config.name,))
+    application = (
+        ApplicationBuilder()
+        .token(config.token)
+        .application_class(ChatOrderedApplication, kwargs={"max_running": UPDATE_CONCURRENCY})
+        .concurrent_updates(UPDATE_MAX_PENDING)
+        .base_url(BOT_API_BASE_URL)
+        .request(InstrumentedRequest(request, api_seconds, api_throttled) if request else send_request)
+        .get_updates_request(InstrumentedRequest(
+            TunedHTTPXRequest(SEND_POOL.long_poll()), api_seconds, api_throttled,
+            on_response=functools.partial(record_api_response, config.name),
+        ))
+        .rate_limiter(outbound)
+        .update_queue(asyncio.Queue(maxsize=UPDATE_QUEUE_SIZE))
+        .build()
+    )
+    hosted = HostedBot(
+        config=config,
+        application=application,
+        # Menu sections and the main menu keyboard, hot-reloaded from the bot's content file
+        content=ContentTable(config.content_path),
+        # Broadcast groups: configured groups plus groups the bot joins, with per-group settings
+        groups=GroupRegistry(
+            parse_chat_ids(config.group_chat_ids),
+            on_change=functools.partial(store.save_group_settings, config.name),
+        ),
+        # Fan-out engine for auto-posts and start reminders
+        engine=BroadcastEngine(
+            global_rate=BROADCAST_GLOBAL_RATE,
+            chat_rate=BROADCAST_CHAT_RATE,
+            concurrency=BROADCAST_CONCURRENCY,
+            failure_threshold=BREAKER_FAILURES,
+            breaker_backoff=BREAKER_BACKOFF,
+            breaker_max_backoff=BREAKER_MAX_BACKOFF,
+            on_breaker_change=lambda chat_id, breaker: store.save_breaker(config.name, chat_id, breaker.to_dict()),
+            send_kwargs={"rate_limit_args": {"priority": BROADCAST}},
+        ),
+        # Joins are greeted per chat in adaptive windows instead of one message each
+        welcomes=WelcomeAggregator(
+            render_welcome,
+            min_window=WELCOME_MIN_WINDOW,
+            max_window=WELCOME_MAX_WINDOW,
+            max_names=WELCOME_MAX_NAMES,
+            delete_previous=WELCOME_DELETE_PREVIOUS,
+            send_kwargs={"rate_limit_args": {"priority": WELCOME}},
+        ),
+        outbound=outbound,
+        # Only one instance may poll this bot's getUpdates at a time
+        lease=Lease(LEASE_DB_PATH, f"poller:{config.name}", ttl=INSTANCE_LEASE_TTL),
+    )
+    hosted.groups.on_membership_change(reschedule_on_membership_change)
+    application.bot_data[BOT_DATA_KEY] = hosted
+    
+    # Record startup metrics before any other handler runs
+    application.add_handler(TypeHandler(Update, track_update_received), group=-1)
+    
+    # Add command handlers
+    application.add_handler(CommandHandler("start", track_start_command))
+    application.add_handler(CommandHandler("stats", admin_stats))
+    application.add_handler(CommandHandler("addpost", admin_add_post))
+    application.add_handler(CommandHandler("listposts", admin_list_posts))
+    application.add_handler(CommandHandler("removepost", admin_remove_post))
+    application.add_handler(CommandHandler("jobs", admin_jobs))
+    application.add_handler(CommandHandler("pausejob", admin_pause_job))
+    application.add_handler(CommandHandler("resumejob", admin_resume_job))
+    application.add_handler(CommandHandler("setinterval", admin_set_interval))
+    application.add_handler(CommandHandler("breakers", admin_breakers))
+    application.add_handler(CommandHandler("resetbreaker", admin_reset_breaker))
+    
+    # Add callback query handler
+    application.add_handler(CallbackQueryHandler(button_handler))
+    
+    # Add chat member handler for welcome messages
+    application.add_handler(ChatMemberHandler(handle_chat_member_update, ChatMemberHandler.CHAT_MEMBER))
+    application.add_handler(ChatMemberHandler(handle_my_chat_member_update, ChatMemberHandler.MY_CHAT_MEMBER))
+    
+    # Add handler for all messages to debug FIRST
+    application.add_handler(MessageHandler(filters.ALL, debug_all_messages), group=0)
+    
+    # Add message handler for group interactions
+    application.add_handler(MessageHandler(
+        filters.TEXT & (filters.ChatType.GROUP | filters.ChatType.SUPERGROUP), 
+        handle_group_message
+    ), group=1)
+    
+    instrument_handlers(application, handler_seconds)
+    application.add_error_handler(error_handler)
+    return hosted
+
+def build_application(request=None):
+    """Create the first configured bot's application, e.g. for benchmarks."""
+    return create_hosted_bot(BOT_CONFIGS[0], request).application
+
+async def run_bots() -> None:
+    """Run every hosted bot on this event loop until SIGINT or SIGTERM."""
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+    
+    initialized = []
+    try:
+        for hosted in hosted_bots:
+            await hosted.application.initialize()
+            initialized.append(hosted)
+        await start_services()
         
-        # Add handler for all messages to debug FIRST
-        async def debug_all_messages(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-            if update.message:
-                chat_type = update.effective_chat.type
-                chat_id = update.effective_chat.id
-                user_id = update.effective_user.id if update.effective_user else "Unknown"
-                text = update.message.text[:50] if update.message.text else 'No text'
-                message_type = "text" if update.message.text else "other"
-                logging.info(f"🔍 DEBUG - Message: Chat ID: {chat_id}, Type: {chat_type}, User: {user_id}, Text: {text}, MsgType: {message_type}")
+        # Auto-posts and reminders of all bots run from one persistent scheduler, on the leader only.
+        # Campaign before start_bot, which on a standby waits for the instance lease of the polling
+        # instance; leader failover must follow LEADER_LEASE_TTL, not that wait.
+        leader_election.start()
         
-        bot_app.add_handler(MessageHandler(filters.ALL, debug_all_messages), group=0)
+        for hosted in hosted_bots:
+            await start_bot(hosted)
         
-        # Add message handler for group interactions
-        bot_app.add_handler(MessageHandler(
-            filters.TEXT & (filters.ChatType.GROUP | filters.ChatType.SUPERGROUP), 
-            handle_group_message
-        ), group=1)
+        startup_metrics['ready_seconds'] = time.monotonic() - PROCESS_STARTED
+        logging.info(f"⏱️ Ready to receive updates after {startup_metrics['ready_seconds']:.1f}s")
         
-        # Force polling mode - ignore webhook URL
-        webhook_url = None  # Force polling mode
+        with open('/tmp/bot_healthy', 'w') as f:
+            f.write('running')
         
-        # Flask server is handled by app.py on Render
-        # Don't start Flask server here to avoid port conflicts
-        logging.info("Bot starting without Flask server (handled by app.py)")
+        logging.info(f"🤖 TrustCoin Bot FULL VERSION is now active with {len(hosted_bots)} bots!")
+        logging.info("✅ Welcome messages enabled")
+        logging.info("✅ User monitoring enabled")
+        logging.info("✅ Group interaction enabled")
         
-        # Enable auto-posting
-        logging.info("✅ Auto-posting enabled - will post every 2 minutes")
+        await stop_event.wait()
+        logging.info("Bots stopped gracefully")
+    finally:
+        for hosted in initialized:
+            await stop_bot(hosted)
+        await stop_services()
+        for hosted in initialized:
+            await hosted.application.shutdown()
+
+def main() -> None:
+    """Initialize and run all hosted bots on one event loop."""
+    if not WEBHOOK_URL and not FAST_START:
+        # Force clear webhooks first to resolve conflicts
+        logging.info("🚀 Starting TrustCoin Bot - clearing conflicts first...")
+        try:
+            asyncio.run(force_clear_webhook())
+        except Exception as e:
+            logging.error(f"Error in force clear: {e}")
+            # Continue anyway
+    
+    try:
+        # Create health check file for Docker
+        with open('/tmp/bot_healthy', 'w') as f:
+            f.write('starting')
         
-        # Auto-posting will be started after bot starts running
+        hosted_bots[:] = [create_hosted_bot(config) for config in BOT_CONFIGS]
+        names = ", ".join(hosted.name for hosted in hosted_bots)
+        logging.info(f"🔌 Bot API send pool: {SEND_POOL.describe()}")
         
-        if webhook_url:
-            # Production mode with webhook
-            logging.info("Starting English bot in webhook mode...")
-            
-            # Set webhook
-            asyncio.run(bot_app.bot.set_webhook(url=webhook_url))
-            
-            with open('/tmp/bot_healthy', 'w') as f:
-                f.write('running')
-            
-            logging.info("🤖 TrustCoin Bot is now active with enhanced group features!")
-            logging.info("✅ Welcome messages enabled")
-            logging.info("✅ User monitoring enabled")
-            logging.info("✅ Group interaction enabled")
-            
-            # Keep the main thread alive
-            import time
-            try:
-                while True:
-                    time.sleep(1)
-            except KeyboardInterrupt:
-                logging.info("Bot stopped gracefully")
+        if WEBHOOK_URL:
+            # Production mode with webhooks
+            logging.info(f"Starting bots {names} in webhook mode...")
         else:
             # Development mode with polling
-            logging.info("Starting English bot in polling mode...")
-            
-            # Auto-posting disabled for testing
-            # def start_scheduler():
-            #     loop = asyncio.new_event_loop()
-            #     asyncio.set_event_loop(loop)
-            #     loop.create_task(auto_post_scheduler())
-            #     loop.run_forever()
-            # 
-            # scheduler_thread = threading.Thread(target=start_scheduler, daemon=True)
-            # scheduler_thread.start()
-            
-            # Update health status
-            try:
-                with open('/tmp/bot_healthy', 'w') as f:
-                    f.write('running')
-            except:
-                pass
-            
-            logging.info("🤖 TrustCoin Bot FULL VERSION is now active with enhanced group features!")
-            logging.info("✅ Welcome messages enabled")
-            logging.info("✅ Auto-posting enabled every 2 minutes")
-            logging.info("✅ User monitoring enabled")
-            logging.info("✅ Group interaction enabled")
-            logging.info("✅ All advanced features available")
-            
-            # Start Flask server in background thread
-            from flask import Flask
-            import threading
-            
-            flask_app = Flask(__name__)
-            
-            @flask_app.route('/')
-            def home():
-                return "TrustCoin Bot FULL VERSION is running! ✅"
-            
-            @flask_app.route('/health')
-            def health():
-                return {"status": "healthy", "bot": "running", "version": "full"}
-            
-            @flask_app.route('/webhook', methods=['POST'])
-            def webhook():
-                return "Webhook not configured for polling mode", 404
-            
-            # Start Flask in background thread
-            def start_flask():
-                port = int(os.environ.get('PORT', 8000))
-                logging.info(f"Starting Flask server on port {port}")
-                flask_app.run(host='0.0.0.0', port=port, debug=False, threaded=True)
-            
-            flask_thread = threading.Thread(target=start_flask, daemon=True)
-            flask_thread.start()
-            
-            # Give Flask time to start
-            import time
-            time.sleep(3)
-            
-            # Add post_init callback to start auto-posting
-            async def post_init(application):
-                """Called after the bot starts."""
-                logging.info("🚀 Bot started successfully - initializing auto-posting")
-                
-                # Force clear webhook and pending updates
-                try:
-                    await application.bot.delete_webhook(drop_pending_updates=True)
-                    logging.info("✅ Webhook cleared forcefully")
-                    await asyncio.sleep(2)
-                except Exception as e:
-                    logging.error(f"Error clearing webhook: {e}")
-                
-                # Start auto-posting task with health monitoring
-                async def start_auto_posting():
-                    await asyncio.sleep(60)  # Wait 1 minute before first post
-                    post_counter = 0
-                    last_successful_post = datetime.now()
-                    
-                    while True:
-                        try:
-                            post_counter += 1
-                            current_time = datetime.now()
-                            
-                            # Health check: if no successful post in 10 minutes, restart
-                            if (current_time - last_successful_post).total_seconds() > 600:
-                                logging.warning("🚨 Auto-posting health check failed - restarting...")
-                                post_counter = 0
-                                last_successful_post = current_time
-                            
-                            # Every minute: Send /start reminder
-                            if post_counter % 1 == 0:
-                                try:
-                                    await send_start_reminder()
-                                    last_successful_post = current_time
-                                    logging.info(f"✅ Health check: Start reminder sent at {current_time}")
-                                except Exception as e:
-                                    logging.error(f"❌ Start reminder failed: {e}")
-                            
-                            # Every 2 minutes: Send varied content post
-                            if post_counter % 2 == 0:
-                                try:
-                                    await auto_post_to_groups()
-                                    last_successful_post = current_time
-                                    logging.info(f"✅ Health check: Auto-post sent at {current_time}")
-                                except Exception as e:
-                                    logging.error(f"❌ Auto-post failed: {e}")
-                            
-                            await asyncio.sleep(60)  # Wait 1 minute between checks
-                        except Exception as e:
-                            logging.error(f"Error in auto-posting loop: {e}")
-                            await asyncio.sleep(60)  # Wait 1 minute on error
-                
-                # Create the auto-posting task
-                asyncio.create_task(start_auto_posting())
-                logging.info("✅ Auto-posting task started")
-            
-            # Set the post_init callback
-            bot_app.post_init = post_init
-            
-            # Wait longer before starting to avoid conflicts
-            logging.info("Waiting 10 seconds to avoid conflicts...")
-            import time
-            time.sleep(10)
-            
-            # Run bot polling in main thread (no event loop issues)
-            logging.info("Starting bot polling in main thread...")
-            
-            # Add aggressive error handler with restart mechanism
-            conflict_count = 0
-            max_conflicts = 5
-            
-            async def error_handler(update, context):
-                """Handle errors during bot operation."""
-                nonlocal conflict_count
-                
-                if "Conflict" in str(context.error):
-                    conflict_count += 1
-                    logging.warning(f"⚠️ Bot conflict detected ({conflict_count}/{max_conflicts}) - will retry automatically")
-                    
-                    if conflict_count >= max_conflicts:
-                        logging.error("🚨 Too many conflicts! Attempting aggressive restart...")
-                        try:
-                            # Stop current application
-                            await context.application.stop()
-                            await asyncio.sleep(30)  # Wait 30 seconds
-                            
-                            # Clear webhook again
-                            await context.application.bot.delete_webhook(drop_pending_updates=True)
-                            await asyncio.sleep(10)
-                            
-                            # Restart application
-                            await context.application.start()
-                            conflict_count = 0  # Reset counter
-                            logging.info("✅ Bot restarted successfully after conflicts")
-                        except Exception as e:
-                            logging.error(f"❌ Failed to restart bot: {e}")
-                else:
-                    logging.error(f"❌ Bot error: {context.error}")
-            
-            bot_app.add_error_handler(error_handler)
-            
-            # Start with highly optimized polling settings to prevent conflicts
-            try:
-                bot_app.run_polling(
-                    drop_pending_updates=True, 
-                    timeout=5,  # Very short timeout
-                    poll_interval=3.0,  # Longer interval between requests
-                    read_timeout=10,
-                    write_timeout=10,
-                    connect_timeout=10,
-                    bootstrap_retries=3,  # Retry on startup
-                    allowed_updates=["message", "callback_query", "chat_member"]  # Only essential updates
-                )
-            except RuntimeError as e:
-                if "no current event loop" in str(e).lower():
-                    logging.info("Creating new event loop for bot...")
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    bot_app.run_polling(
-                        drop_pending_updates=True, 
-                        timeout=10,
-                        poll_interval=2.0,
-                        read_timeout=6,
-                        write_timeout=6,
-                        connect_timeout=6
-                    )
-                else:
-                    raise
-            
+            logging.info(f"Starting bots {names} in polling mode...")
+            if not FAST_START:
+                # Wait longer before starting to avoid conflicts
+                logging.info("Waiting 10 seconds to avoid conflicts...")
+                time.sleep(10)
+        
+        asyncio.run(run_bots())
+    
     except InvalidToken:
-        logging.error("❌ Invalid bot token. Please check your BOT_TOKEN_ENG.")
+        logging.error("❌ Invalid bot token. Please check BOT_TOKENS / BOT_TOKEN_ENG.")
         # Remove health file on error
         try:
             os.remove('/tmp/bot_healthy')
@@ -1161,7 +1399,7 @@ def main() -> None:
             pass
         raise
     except Exception as e:
-        logging.error(f"❌ Error starting English bot: {e}")
+        logging.error(f"❌ Error starting bots: {e}")
         # Remove health file on error
         try:
             os.remove('/tmp/bot_healthy')
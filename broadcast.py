@@ -0,0 +1,294 @@
+"""
+Concurrent, rate-limited fan-out of a single message to many chats.
+
+Telegram allows roughly 30 messages per second per bot and about 20 messages
+per minute into the same group. The engine keeps a global token bucket and
+one token bucket per chat, sends with a bounded number of workers and, on
+RetryAfter, pauses only the chat that was throttled.
+
+Each chat also has a circuit breaker. After `failure_threshold` failed
+sends in a row (or at once when the bot was removed from the chat) the
+chat is skipped until its backoff expires; then one probe is let through,
+and every failed probe doubles the backoff. ChatMigrated is followed
+automatically and remembered, so later rounds go straight to the new chat.
+RetryAfter, including sends shed by the bot's own outbound dispatcher,
+never counts towards a breaker, even when the retries run out.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+from telegram.error import BadRequest, ChatMigrated, Forbidden, RetryAfter
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass
+class ChatBreaker:
+    """Failure state of one chat. `backoff` is 0 while the breaker is closed."""
+    failures: int = 0
+    backoff: float = 0.0
+    opened_until: float = 0.0  # Wall-clock time of the next probe
+    last_error: Optional[str] = None
+    migrated_to: Optional[int] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.backoff > 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def is_permanent_failure(error: Exception) -> bool:
+    """Errors that will not go away by retrying: kicked, blocked or deleted chats."""
+    return isinstance(error, Forbidden) or (
+        isinstance(error, BadRequest) and "chat not found" in str(error).lower()
+    )
+
+
+@dataclass
+class BroadcastStats:
+    """Outcome of one broadcast round."""
+    label: str
+    targets: int = 0
+    sent: int = 0
+    failed: int = 0
+    retried: int = 0
+    skipped: int = 0
+    duration: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        return self.sent / self.duration if self.duration > 0 else 0.0
+
+    def percentile(self, pct: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def summary(self) -> str:
+        return (
+            f"{self.label}: sent {self.sent}/{self.targets} "
+            f"(failed {self.failed}, retried {self.retried}, skipped {self.skipped}) in {self.duration:.2f}s - "
+            f"{self.throughput:.1f} msg/s, p50 {self.percentile(50) * 1000:.0f}ms, "
+            f"p99 {self.percentile(99) * 1000:.0f}ms"
+        )
+
+
+class BroadcastEngine:
+    """Shared fan-out engine used by auto-posts and /start reminders."""
+
+    def __init__(
+        self,
+        global_rate: float = 25.0,
+        chat_rate: float = 20 / 60,
+        chat_burst: float = 3,
+        concurrency: int = 16,
+        max_retries: int = 3,
+        failure_threshold: int = 3,
+        breaker_backoff: float = 60.0,
+        breaker_max_backoff: float = 86400.0,
+        on_breaker_change: Optional[Callable[[int, ChatBreaker], None]] = None,
+        send_kwargs: Optional[dict] = None,
+    ):
+        self.global_bucket = TokenBucket(global_rate)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self._chat_buckets: Dict[int, TokenBucket] = {}
+        self._paused_until: Dict[int, float] = {}
+        self.last_stats: Optional[BroadcastStats] = None
+        self.failure_threshold = failure_threshold
+        self.breaker_backoff = breaker_backoff
+        self.breaker_max_backoff = breaker_max_backoff
+        self.on_breaker_change = on_breaker_change
+        self.breakers: Dict[int, ChatBreaker] = {}
+        self.send_kwargs = send_kwargs or {}  # Extra send_message arguments, e.g. rate_limit_args
+
+    # Circuit breakers
+
+    def restore_breakers(self, states: Dict[int, dict], replace: bool = False) -> None:
+        """Load persisted breaker states keyed by chat ID, dropping all others with `replace`."""
+        if replace:
+            self.breakers.clear()
+        for chat_id, state in states.items():
+            self.breakers[chat_id] = ChatBreaker(**state)
+
+    def resolve_chat(self, chat_id: int) -> int:
+        """Follow recorded supergroup migrations to the chat's current ID."""
+        for _ in range(5):
+            breaker = self.breakers.get(chat_id)
+            if breaker is None or breaker.migrated_to is None:
+                break
+            chat_id = breaker.migrated_to
+        return chat_id
+
+    def open_breakers(self) -> int:
+        return sum(1 for breaker in self.breakers.values() if breaker.is_open)
+
+    def reset_breaker(self, chat_id: int) -> bool:
+        """Close a chat's breaker by hand; returns False if it was not open."""
+        breaker = self.breakers.get(chat_id)
+        if breaker is None or not (breaker.is_open or breaker.failures):
+            return False
+        breaker.failures, breaker.backoff, breaker.opened_until = 0, 0.0, 0.0
+        self._breaker_changed(chat_id, breaker)
+        return True
+
+    def _breaker_changed(self, chat_id: int, breaker: ChatBreaker) -> None:
+        if self.on_breaker_change:
+            try:
+                self.on_breaker_change(chat_id, breaker)
+            except Exception as e:
+                logger.error(f"❌ Error saving breaker of chat {chat_id}: {e}")
+
+    def _allow(self, chat_id: int) -> bool:
+        breaker = self.breakers.get(chat_id)
+        return breaker is None or not breaker.is_open or time.time() >= breaker.opened_until
+
+    def _record_success(self, chat_id: int) -> None:
+        breaker = self.breakers.get(chat_id)
+        if breaker is not None and (breaker.failures or breaker.is_open):
+            if breaker.is_open:
+                logger.info(f"🔌 Chat {chat_id} is reachable again - breaker closed")
+            breaker.failures, breaker.backoff, breaker.opened_until = 0, 0.0, 0.0
+            self._breaker_changed(chat_id, breaker)
+
+    def _record_failure(self, chat_id: int, error: Exception) -> None:
+        breaker = self.breakers.setdefault(chat_id, ChatBreaker())
+        breaker.failures += 1
+        breaker.last_error = str(error)[:200]
+        if breaker.is_open:
+            # Failed probe
+            breaker.backoff = min(breaker.backoff * 2, self.breaker_max_backoff)
+        elif is_permanent_failure(error) or breaker.failures >= self.failure_threshold:
+            breaker.backoff = self.breaker_backoff
+        else:
+            self._breaker_changed(chat_id, breaker)
+            return
+        breaker.opened_until = time.time() + breaker.backoff
+        logger.warning(f"🔌 Breaker open for chat {chat_id} after {breaker.failures} failures - "
+                       f"next probe in {breaker.backoff:.0f}s")
+        self._breaker_changed(chat_id, breaker)
+
+    def _record_migration(self, old_chat_id: int, new_chat_id: int) -> None:
+        breaker = self.breakers.setdefault(old_chat_id, ChatBreaker())
+        breaker.migrated_to = new_chat_id
+        logger.info(f"➡️ Chat {old_chat_id} migrated to {new_chat_id} - following it")
+        self._breaker_changed(old_chat_id, breaker)
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._chat_buckets[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+        return bucket
+
+    async def _send_one(self, bot, chat_id: int, text: str, parse_mode: Optional[str],
+                        stats: BroadcastStats) -> None:
+        last_error: Optional[Exception] = None
+        for attempt in range(self.max_retries + 1):
+            paused_until = self._paused_until.get(chat_id, 0.0)
+            delay = paused_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self._chat_bucket(chat_id).acquire()
+            await self.global_bucket.acquire()
+            started = time.monotonic()
+            try:
+                await bot.send_message(chat_id=chat_id, text=text, parse_mode=parse_mode, **self.send_kwargs)
+            except RetryAfter as e:
+                last_error = e
+                self._paused_until[chat_id] = time.monotonic() + float(e.retry_after)
+                stats.retried += 1
+                logger.warning(f"⏳ Chat {chat_id} throttled, pausing it for {e.retry_after}s")
+                continue
+            except ChatMigrated as e:
+                last_error = e
+                self._record_migration(chat_id, e.new_chat_id)
+                chat_id = e.new_chat_id
+                stats.retried += 1
+                continue
+            except Exception as e:
+                stats.failed += 1
+                logger.error(f"❌ Error sending {stats.label} to group {chat_id}: {e}")
+                self._record_failure(chat_id, e)
+                return
+            self._record_success(chat_id)
+            stats.latencies.append(time.monotonic() - started)
+            stats.sent += 1
+            logger.info(f"📢 {stats.label} sent to group {chat_id}")
+            return
+        stats.failed += 1
+        logger.error(f"❌ Giving up on {stats.label} for group {chat_id} after {self.max_retries} retries")
+        # Flood waits and locally shed sends (OutboundShed is a RetryAfter) say nothing about the
+        # chat itself, so only a chat that keeps migrating counts towards its breaker
+        if not isinstance(last_error, RetryAfter):
+            self._record_failure(chat_id, last_error)
+
+    async def broadcast(
+        self,
+        bot,
+        chat_ids: Iterable[int],
+        text: Union[str, Callable[[int], str]],
+        parse_mode: Optional[str] = "Markdown",
+        label: str = "broadcast",
+    ) -> BroadcastStats:
+        """Send `text` (or `text(chat_id)`) to every chat and return round statistics."""
+        targets = list(dict.fromkeys(self.resolve_chat(chat_id) for chat_id in chat_ids))
+        stats = BroadcastStats(label=label, targets=len(targets))
+        queue: asyncio.Queue = asyncio.Queue()
+        for chat_id in targets:
+            queue.put_nowait(chat_id)
+
+        async def worker() -> None:
+            while True:
+                try:
+                    chat_id = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                if not self._allow(chat_id):
+                    stats.skipped += 1
+                    continue
+                message = text(chat_id) if callable(text) else text
+                await self._send_one(bot, chat_id, message, parse_mode, stats)
+
+        started = time.monotonic()
+        workers = min(self.concurrency, len(targets))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        stats.duration = time.monotonic() - started
+        self.last_stats = stats
+        logger.info(f"📊 {stats.summary()}")
+        return stats
@@ -0,0 +1,77 @@
+"""
+Small bounded caches used by the handlers.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Mapping that keeps at most `max_size` entries, dropping the least recently used."""
+
+    def __init__(self, max_size: int = 10_000):
+        self.max_size = max_size
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            return default
+        return self._data[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+
+class TTLCache:
+    """Mapping whose entries expire `ttl` seconds after they were last put.
+
+    Entries are kept in expiry order, so expired ones are dropped from the
+    front on access; at most `max_size` entries are kept.
+    """
+
+    def __init__(self, ttl: float, max_size: int = 10_000, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.clock = clock
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        self._expire(self.clock())
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def _expire(self, now: float) -> None:
+        while self._data:
+            key, (expires, _) = next(iter(self._data.items()))
+            if expires > now:
+                return
+            del self._data[key]
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        if entry[0] <= self.clock():
+            del self._data[key]
+            return default
+        return entry[1]
+
+    def put(self, key: Hashable, value: Any = True) -> None:
+        now = self.clock()
+        self._expire(now)
+        self._data[key] = (now + self.ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.max_size:
+            self._data.popitem(last=False)
@@ -1,22 +1,38 @@
 #!/usr/bin/env python3
 """
-Script to completely clear bot conflicts and reset webhook
+Script to completely clear bot conflicts and reset webhooks of all bots in BOT_TOKENS (or BOT_TOKEN_ENG)
 """
 import asyncio
 import os
 from telegram import Bot
 from dotenv import load_dotenv
 
+from hosting import parse_bot_configs
+from http_pool import PoolSettings, TunedHTTPXRequest
+
 load_dotenv()
 
-async def clear_bot_completely():
-    """Clear all bot conflicts and reset webhook"""
-    bot_token = os.getenv('BOT_TOKEN_ENG')
-    if not bot_token:
-        print("❌ BOT_TOKEN_ENG not found")
+async def clear_all_bots():
+    """Clear every configured bot, one after another"""
+    configs = parse_bot_configs(os.getenv('BOT_TOKENS', ''), os.getenv('BOT_TOKEN_ENG'),
+                                os.getenv('CONTENT_PATH', 'content.json'))
+    if not configs:
+        print("❌ Neither BOT_TOKENS nor BOT_TOKEN_ENG found")
         return
     
-    bot = Bot(token=bot_token)
+    # One connection pool for all bots, configured like the bot's send pool
+    request = TunedHTTPXRequest(PoolSettings.from_env())
+    try:
+        for config in configs:
+            print(f"🤖 Clearing bot {config.name}...")
+            await clear_bot_completely(config.token, request)
+    finally:
+        await request.shutdown()
+
+async def clear_bot_completely(bot_token: str, request: TunedHTTPXRequest = None):
+    """Clear all bot conflicts and reset webhook"""
+    bot = Bot(token=bot_token, base_url=os.getenv('BOT_API_BASE_URL', 'https://api.telegram.org/bot'),
+              request=request, get_updates_request=request)
     
     try:
         print("🔄 Getting bot info...")
@@ -47,4 +63,4 @@ async def clear_bot_completely():
         print(f"❌ Error: {e}")
 
 if __name__ == "__main__":
-    asyncio.run(clear_bot_completely())
+    asyncio.run(clear_all_bots())
@@ -0,0 +1,95 @@
+"""
+Menu content for the inline keyboard, loaded from a JSON file.
+
+Every section's text is joined and every keyboard is built once per load,
+so answering a button click is a dict lookup. The main menu markup is shared
+by all sections that show it. `ContentTable.watch` reloads the file when it
+changes, keeping the previous table if the new file is invalid.
+"""
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+logger = logging.getLogger(__name__)
+
+INVALID_SECTION = "invalid"
+
+
+@dataclass(frozen=True)
+class MenuSection:
+    """Pre-rendered text and keyboard of one menu section."""
+    key: str
+    text: str
+    parse_mode: Optional[str]
+    reply_markup: InlineKeyboardMarkup
+    reply_if_photo: bool
+
+
+def build_keyboard(rows: List[List[dict]]) -> InlineKeyboardMarkup:
+    """Build a keyboard from rows of {"text", "callback_data" | "url"} dicts."""
+    return InlineKeyboardMarkup([[InlineKeyboardButton(**button) for button in row] for row in rows])
+
+
+class ContentTable:
+    """Menu sections keyed by callback data, with hot reload."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.version = 0
+        self.main_menu: InlineKeyboardMarkup = InlineKeyboardMarkup([])
+        self.sections: Dict[str, MenuSection] = {}
+        self._mtime: Optional[float] = None
+        self.load()
+
+    def _parse(self):
+        mtime = os.stat(self.path).st_mtime
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+
+        main_menu = build_keyboard(data["main_menu"])
+        sections = {}
+        for key, section in data["sections"].items():
+            keyboard = section.get("keyboard", "main_menu")
+            text = section["text"]
+            sections[key] = MenuSection(
+                key=key,
+                text="\n".join(text) if isinstance(text, list) else text,
+                parse_mode=section.get("parse_mode"),
+                reply_markup=main_menu if keyboard == "main_menu" else build_keyboard(keyboard),
+                reply_if_photo=section.get("reply_if_photo", True),
+            )
+        if INVALID_SECTION not in sections:
+            raise ValueError(f"Content file must define an '{INVALID_SECTION}' section")
+        return main_menu, sections, mtime
+
+    def _apply(self, parsed) -> None:
+        main_menu, sections, mtime = parsed
+        self.main_menu, self.sections = main_menu, sections
+        self._mtime = mtime
+        self.version += 1
+        logger.info(f"📚 Loaded {len(sections)} menu sections from {self.path} (version {self.version})")
+
+    def load(self) -> None:
+        """Read the content file and swap in the new table."""
+        self._apply(self._parse())
+
+    def get(self, key: str) -> MenuSection:
+        """Return the section for a callback, or the 'invalid' section."""
+        return self.sections.get(key) or self.sections[INVALID_SECTION]
+
+    async def watch(self, interval: float = 5.0) -> None:
+        """Reload the table whenever the file's modification time changes."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                mtime = (await asyncio.to_thread(os.stat, self.path)).st_mtime
+                if mtime != self._mtime:
+                    # Parse off the loop, swap on it
+                    self._apply(await asyncio.to_thread(self._parse))
+            except Exception as e:
+                logger.error(f"❌ Error reloading content from {self.path}: {e}")
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Telegram Bot API, for offline load testing.
+
+FakeBotAPI implements the methods bot.py uses (getMe, getUpdates,
+sendMessage, editMessageText, answerCallbackQuery, deleteWebhook and a few
+more) with configurable latency, 429 responses and error injection.
+TrafficDriver feeds it synthetic group messages, button clicks and member
+joins at a target rate, which the bot then receives through getUpdates.
+With `tokens` the traffic is spread over several bots, each polling its own
+feed; without, any token receives the shared feed.
+StubRequest answers the same methods in-process, without HTTP, for
+benchmarks that drive `Application.process_update` directly.
+
+Run the stand-in and driver, then point the bot at it:
+
+    python fake_bot_api.py --rate 200 --latency 0.05 --rate-429 0.01
+    BOT_API_BASE_URL=http://127.0.0.1:8081/bot BOT_TOKEN_ENG=123456:FAKE python bot.py
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Set
+
+from aiohttp import web
+from telegram.request import BaseRequest, RequestData
+
+logger = logging.getLogger(__name__)
+
+BOT_USER = {
+    "id": 999000,
+    "is_bot": True,
+    "first_name": "TrustCoin Test Bot",
+    "username": "trustcoin_test_bot",
+    "can_join_groups": True,
+    "can_read_all_group_messages": True,
+    "supports_inline_queries": False,
+}
+
+# Parameters that must stay strings even if they look like JSON
+STRING_PARAMETERS = {"text", "caption", "parse_mode", "callback_query_id", "url"}
+
+# Methods subject to latency, 429 and error injection
+SEND_METHODS = {
+    "sendMessage", "editMessageText", "answerCallbackQuery", "deleteMessage", "restrictChatMember",
+}
+
+
+class FakeBotAPI:
+    """In-process fake of the Bot API HTTP interface."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_429: float = 0.0,
+        retry_after: int = 1,
+        error_rate: float = 0.0,
+        connect_latency: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.connect_latency = connect_latency  # Added to a connection's first call, like TCP + TLS setup
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.calls: Counter = Counter()
+        self.throttled: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.connections: Set[tuple] = set()  # Client addresses seen, i.e. connections opened
+        self.delivered_updates = 0
+        self.confirmed_updates = 0
+        self._updates: Dict[Optional[str], List[dict]] = {None: []}  # token -> feed; None = any token
+        self._update_events: Dict[Optional[str], asyncio.Event] = {}
+        self._next_update_id = 1
+        self._next_message_id = 1
+        self.sent_messages: Dict[int, List[int]] = {}
+
+        self.app = web.Application()
+        self.app.router.add_route("*", "/bot{token}/{method}", self.dispatch)
+
+    # Update feed
+
+    def push_update(self, update: dict, token: Optional[str] = None) -> None:
+        """Queue an update for the next getUpdates call of `token` (or of any bot)."""
+        update["update_id"] = self._next_update_id
+        self._next_update_id += 1
+        self._updates.setdefault(token, []).append(update)
+        self._update_event(token).set()
+
+    def _update_event(self, feed: Optional[str]) -> asyncio.Event:
+        event = self._update_events.get(feed)
+        if event is None:
+            event = self._update_events[feed] = asyncio.Event()
+        return event
+
+    def _feed(self, token: str) -> Optional[str]:
+        """The feed a bot polls: its own if updates were pushed for it, else the shared one."""
+        return token if token in self._updates else None
+
+    @property
+    def pending_updates(self) -> int:
+        return sum(len(updates) for updates in self._updates.values())
+
+    # HTTP plumbing
+
+    @staticmethod
+    async def _parameters(request: web.Request) -> dict:
+        if request.content_type == "application/json":
+            return await request.json()
+        params = {}
+        for key, value in (await request.post()).items():
+            if key in STRING_PARAMETERS or not isinstance(value, str):
+                params[key] = value
+                continue
+            try:
+                params[key] = json.loads(value)
+            except ValueError:
+                params[key] = value
+        return params
+
+    @staticmethod
+    def _ok(result) -> web.Response:
+        return web.json_response({"ok": True, "result": result})
+
+    @staticmethod
+    def _error(status: int, description: str, parameters: Optional[dict] = None) -> web.Response:
+        body = {"ok": False, "error_code": status, "description": description}
+        if parameters:
+            body["parameters"] = parameters
+        return web.json_response(body, status=status)
+
+    async def dispatch(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        token = request.match_info["token"]
+        self.calls[method] += 1
+        params = await self._parameters(request)
+
+        peer = request.transport.get_extra_info("peername") if request.transport else None
+        if peer not in self.connections:
+            self.connections.add(peer)
+            if self.connect_latency:
+                await asyncio.sleep(self.connect_latency)
+
+        if method in SEND_METHODS:
+            delay = self.latency + (self.random.uniform(-self.jitter, self.jitter) if self.jitter else 0)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self.rate_429 and self.random.random() < self.rate_429:
+                self.throttled[method] += 1
+                return self._error(429, f"Too Many Requests: retry after {self.retry_after}",
+                                   {"retry_after": self.retry_after})
+            if self.error_rate and self.random.random() < self.error_rate:
+                self.errors[method] += 1
+                return self._error(400, "Bad Request: injected error")
+
+        handler = getattr(self, f"api_{method}", None)
+        if handler is None:
+            return self._error(404, f"Not Found: method {method} is not implemented by the stand-in")
+        return await handler(params, token)
+
+    def _message(self, chat_id: int, text: str, reply_markup=None, message_id: Optional[int] = None) -> dict:
+        if message_id is None:
+            message_id = self._next_message_id
+            self._next_message_id += 1
+        message = {
+            "message_id": message_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "supergroup" if chat_id < 0 else "private"},
+            "from": BOT_USER,
+            "text": text,
+        }
+        if reply_markup:
+            message["reply_markup"] = reply_markup
+        return message
+
+    # Bot API methods
+
+    async def api_getMe(self, params: dict, token: str) -> web.Response:
+        return self._ok(BOT_USER)
+
+    async def api_deleteWebhook(self, params: dict, token: str) -> web.Response:
+        if params.get("drop_pending_updates"):
+            self._updates[self._feed(token)].clear()
+        return self._ok(True)
+
+    async def api_setWebhook(self, params: dict, token: str) -> web.Response:
+        return self._ok(True)
+
+    async def api_getWebhookInfo(self, params: dict, token: str) -> web.Response:
+        return self._ok({"url": "", "has_custom_certificate": False, "pending_update_count": len(self._updates[self._feed(token)])})
+
+    async def api_getUpdates(self, params: dict, token: str) -> web.Response:
+        feed = self._feed(token)
+        offset = params.get("offset") or 0
+        if offset:
+            pending = self._updates[feed]
+            self._updates[feed] = [update for update in pending if update["update_id"] >= offset]
+            self.confirmed_updates += len(pending) - len(self._updates[feed])
+        timeout = float(params.get("timeout") or 0)
+        if not self._updates[feed] and timeout > 0:
+            event = self._update_event(feed)
+            event.clear()
+            try:
+                await asyncio.wait_for(event.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        updates = self._updates[feed][:int(params.get("limit") or 100)]
+        self.delivered_updates += len(updates)
+        return self._ok(updates)
+
+    async def api_sendMessage(self, params: dict, token: str) -> web.Response:
+        chat_id = int(params["chat_id"])
+        message = self._message(chat_id, params.get("text", ""), params.get("reply_markup"))
+        if params.get("reply_markup"):
+            menu_ids = self.sent_messages.setdefault(chat_id, [])
+            menu_ids.append(message["message_id"])
+            del menu_ids[:-50]
+        return self._ok(message)
+
+    async def api_editMessageText(self, params: dict, token: str) -> web.Response:
+        message = self._message(int(params["chat_id"]), params.get("text", ""), params.get("reply_markup"),
+                                message_id=int(params["message_id"]))
+        message["edit_date"] = int(time.time())
+        return self._ok(message)
+
+    async def api_answerCallbackQuery(self, params: dict, token: str) -> web.Response:
+        return self._ok(True)
+
+    async def api_deleteMessage(self, params: dict, token: str) -> web.Response:
+        return self._ok(True)
+
+    async def api_restrictChatMember(self, params: dict, token: str) -> web.Response:
+        return self._ok(True)
+
+
+class StubRequest(BaseRequest):
+    """In-process request backend answering Bot API calls with canned results."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls: Counter = Counter()
+        self._next_message_id = 1
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def do_request(self, url: str, method: str, request_data: Optional[RequestData] = None,
+                         read_timeout=None, write_timeout=None, connect_timeout=None,
+                         pool_timeout=None):
+        api_method = url.rsplit("/", 1)[-1]
+        self.calls[api_method] += 1
+        params = request_data.parameters if request_data else {}
+        if api_method in SEND_METHODS and self.latency:
+            await asyncio.sleep(self.latency)
+
+        if api_method == "getMe":
+            result = BOT_USER
+        elif api_method in ("sendMessage", "editMessageText"):
+            message_id = params.get("message_id")
+            if message_id is None:
+                message_id = self._next_message_id
+                self._next_message_id += 1
+            result = {
+                "message_id": message_id,
+                "date": int(time.time()),
+                "chat": {"id": int(params["chat_id"]), "type": "supergroup"},
+                "from": BOT_USER,
+                "text": params.get("text", ""),
+            }
+        elif api_method == "getUpdates":
+            result = []
+        else:
+            result = True
+        return 200, json.dumps({"ok": True, "result": result}).encode()
+
+
+class TrafficDriver:
+    """Generates synthetic updates for FakeBotAPI at a target rate."""
+
+    MESSAGES = [
+        "hello everyone", "hi", "how does mining work?", "where can I download the app?",
+        "привет", "مرحبا", "what about the token?", "good morning", "any news today?",
+        "I need help with referral", "nice project", "when listing?",
+    ]
+    BUTTONS = ["overview", "points", "missions", "referral", "roadmap", "download",
+               "security", "faq", "social", "language_groups", "back"]
+
+    def __init__(self, api: FakeBotAPI, rate: float, chats: int = 20, users: int = 5000,
+                 clicks: float = 0.15, joins: float = 0.05, seed: Optional[int] = None,
+                 tokens: Optional[List[str]] = None):
+        self.api = api
+        self.rate = rate
+        self.tokens = tokens or [None]  # Bots the traffic is spread over
+        self.chat_ids = [-1001000000000 - index for index in range(chats)]
+        self.users = users
+        self.clicks = clicks
+        self.joins = joins
+        self.random = random.Random(seed)
+        self.generated: Counter = Counter()
+
+    def _user(self) -> dict:
+        user_id = 1000 + self.random.randrange(self.users)
+        return {"id": user_id, "is_bot": False, "first_name": f"User{user_id}", "username": f"user{user_id}"}
+
+    def _chat(self, chat_id: int) -> dict:
+        return {"id": chat_id, "type": "supergroup", "title": f"TrustCoin Test {abs(chat_id) % 1000}"}
+
+    def make_update(self) -> dict:
+        chat_id = self.random.choice(self.chat_ids)
+        roll = self.random.random()
+        now = int(time.time())
+        if roll < self.joins:
+            self.generated["chat_member"] += 1
+            user = self._user()
+            return {"chat_member": {
+                "chat": self._chat(chat_id),
+                "from": user,
+                "date": now,
+                "old_chat_member": {"status": "left", "user": user},
+                "new_chat_member": {"status": "member", "user": user},
+            }}
+        if roll < self.joins + self.clicks:
+            self.generated["callback_query"] += 1
+            menu_ids = self.api.sent_messages.get(chat_id) or [1]
+            return {"callback_query": {
+                "id": str(self.random.getrandbits(48)),
+                "from": self._user(),
+                "chat_instance": str(chat_id),
+                "data": self.random.choice(self.BUTTONS),
+                "message": {
+                    "message_id": self.random.choice(menu_ids),
+                    "date": now,
+                    "chat": self._chat(chat_id),
+                    "from": BOT_USER,
+                    "text": "Main menu:",
+                },
+            }}
+        self.generated["message"] += 1
+        return {"message": {
+            "message_id": self.random.getrandbits(31),
+            "date": now,
+            "chat": self._chat(chat_id),
+            "from": self._user(),
+            "text": self.random.choice(self.MESSAGES),
+        }}
+
+    async def run(self, duration: Optional[float] = None) -> None:
+        """Push updates at `rate` per second, for `duration` seconds or forever."""
+        started = time.monotonic()
+        sent = 0
+        while duration is None or time.monotonic() - started < duration:
+            due = int((time.monotonic() - started) * self.rate)
+            while sent < due:
+                self.api.push_update(self.make_update(), self.tokens[sent % len(self.tokens)])
+                sent += 1
+            await asyncio.sleep(0.01)
+
+
+async def report(api: FakeBotAPI, driver: Optional[TrafficDriver], interval: float) -> None:
+    last_confirmed = 0
+    while True:
+        await asyncio.sleep(interval)
+        confirmed = api.confirmed_updates
+        rate = (confirmed - last_confirmed) / interval
+        last_confirmed = confirmed
+        print(f"📈 processed {rate:,.0f} updates/s | pending {api.pending_updates} | "
+              f"generated {dict(driver.generated) if driver else {}} | calls {dict(api.calls)} | "
+              f"429s {sum(api.throttled.values())} | errors {sum(api.errors.values())}", flush=True)
+
+
+async def serve(args) -> None:
+    api = FakeBotAPI(latency=args.latency, jitter=args.jitter, rate_429=args.rate_429,
+                     retry_after=args.retry_after, error_rate=args.error_rate,
+                     connect_latency=args.connect_latency, seed=args.seed)
+    runner = web.AppRunner(api.app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, args.host, args.port).start()
+    print(f"🧪 Fake Bot API on http://{args.host}:{args.port}/bot - set BOT_API_BASE_URL to this", flush=True)
+
+    driver = None
+    tasks = []
+    if args.rate > 0:
+        driver = TrafficDriver(api, args.rate, chats=args.chats, users=args.users,
+                               clicks=args.clicks, joins=args.joins, seed=args.seed,
+                               tokens=args.tokens.split(",") if args.tokens else None)
+        tasks.append(asyncio.create_task(driver.run(args.duration)))
+    tasks.append(asyncio.create_task(report(api, driver, args.report_interval)))
+    try:
+        if args.duration:
+            await asyncio.sleep(args.duration)
+        else:
+            await asyncio.Event().wait()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await runner.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every send-type call")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0, help="probability of a 429 response")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of an injected 400")
+    parser.add_argument("--connect-latency", type=float, default=0.0,
+                        help="seconds added to the first call on each new connection")
+    parser.add_argument("--rate", type=float, default=0.0, help="synthetic updates per second (0 = no driver)")
+    parser.add_argument("--duration", type=float, default=None)
+    parser.add_argument("--chats", type=int, default=20)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--clicks", type=float, default=0.15, help="share of updates that are button clicks")
+    parser.add_argument("--joins", type=float, default=0.05, help="share of updates that are member joins")
+    parser.add_argument("--tokens", help="comma-separated bot tokens to spread the traffic over")
+    parser.add_argument("--report-interval", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=None)
+    asyncio.run(serve(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Flood detection with constant-memory sliding-window counters.
+
+SlidingWindowSketch is a count-min sketch split into two tumbling
+sub-windows. An estimate weights the previous sub-window by how much of it
+still overlaps the sliding window, the usual sliding-window-counter
+approximation. Memory is `2 * depth * width` 32-bit counters no matter how
+many keys are tracked. Counts can be overestimated when keys collide but
+never underestimated; conservative updates keep that error small.
+
+FloodGuard uses two sketches, messages per user and bot replies per user,
+to decide whether a user is flooding and whether they may trigger another
+reply. Users are any hashable key; with several hosted bots the key is
+(bot, user_id) so a group shared by two bots does not count a message twice.
+Per-chat reply cooldowns live in replies.ReplyPlanner.
+"""
+import time
+from array import array
+from typing import Callable, Hashable, List, Optional
+
+from cache import LRUCache
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+# Per-row seeds for the multiplicative hash
+_SEEDS = (0x243F6A8885A308D3, 0x13198A2E03707344, 0xA4093822299F31D0, 0x082EFA98EC4E6C89,
+          0x452821E638D01377, 0xBE5466CF34E90C6C, 0xC0AC29B7C97C50DD, 0x3F84D5B5B5470917)
+
+
+class SlidingWindowSketch:
+    """Approximate per-key event counts over the last `window` seconds."""
+
+    def __init__(self, window: float, width: int = 1 << 17, depth: int = 4,
+                 clock: Callable[[], float] = time.monotonic):
+        if width & (width - 1):
+            raise ValueError("width must be a power of two")
+        if not 1 <= depth <= len(_SEEDS):
+            raise ValueError(f"depth must be between 1 and {len(_SEEDS)}")
+        self.window = window
+        self.width = width
+        self.depth = depth
+        self.clock = clock
+        self._shift = 64 - width.bit_length() + 1
+        self._rows = [(row * width, seed) for row, seed in enumerate(_SEEDS[:depth])]
+        self._current = array("I", bytes(4 * width * depth))
+        self._previous = array("I", bytes(4 * width * depth))
+        self._started = clock()
+
+    @property
+    def memory_bytes(self) -> int:
+        return 2 * self._current.itemsize * len(self._current)
+
+    def _indexes(self, key: Hashable) -> List[int]:
+        h = hash(key) & _MASK64
+        shift = self._shift
+        return [offset + ((((h ^ seed) * _GOLDEN) & _MASK64) >> shift) for offset, seed in self._rows]
+
+    def _rotate(self, now: float) -> float:
+        """Advance the sub-windows; returns the weight of the previous one."""
+        elapsed = now - self._started
+        if elapsed >= self.window:
+            if elapsed >= 2 * self.window:
+                self._previous = array("I", bytes(4 * self.width * self.depth))
+            else:
+                self._previous = self._current
+            self._current = array("I", bytes(4 * self.width * self.depth))
+            self._started = now - elapsed % self.window
+            elapsed = now - self._started
+        return 1.0 - elapsed / self.window
+
+    def add(self, key: Hashable, amount: int = 1) -> float:
+        """Count `amount` events for `key` and return its new estimate."""
+        weight = self._rotate(self.clock())
+        indexes = self._indexes(key)
+        current = self._current
+        # Conservative update: raise only the counters that are below the new minimum
+        target = min(current[i] for i in indexes) + amount
+        for i in indexes:
+            if current[i] < target:
+                current[i] = target
+        return target + weight * min(self._previous[i] for i in indexes)
+
+    def estimate(self, key: Hashable) -> float:
+        weight = self._rotate(self.clock())
+        indexes = self._indexes(key)
+        return min(self._current[i] for i in indexes) + weight * min(self._previous[i] for i in indexes)
+
+
+class FloodGuard:
+    """Per-user rate tracking for group messages and bot replies."""
+
+    def __init__(
+        self,
+        window: float = 60.0,
+        message_limit: int = 20,
+        user_reply_limit: int = 2,
+        flag_cooldown: float = 600.0,
+        width: int = 1 << 17,
+        depth: int = 4,
+        max_flagged: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.message_limit = message_limit  # Messages per window before a user counts as flooding
+        self.user_reply_limit = user_reply_limit  # Replies one user may trigger per window
+        self.flag_cooldown = flag_cooldown
+        self.clock = clock
+        self.messages = SlidingWindowSketch(window, width, depth, clock)
+        self.user_replies = SlidingWindowSketch(window, width, depth, clock)
+        self._flagged = LRUCache(max_flagged)  # user -> time of the last flag
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.messages.memory_bytes + self.user_replies.memory_bytes
+
+    def record_message(self, user: Hashable) -> float:
+        """Count a group message and return the user's estimated messages per window."""
+        return self.messages.add(user)
+
+    def is_flooding(self, user: Hashable, rate: Optional[float] = None) -> bool:
+        if rate is None:
+            rate = self.messages.estimate(user)
+        return rate > self.message_limit
+
+    def should_flag(self, user: Hashable, rate: float) -> bool:
+        """True when a user crosses the limit and was not flagged within the cooldown."""
+        if not self.is_flooding(user, rate):
+            return False
+        now = self.clock()
+        last = self._flagged.get(user)
+        if last is not None and now - last < self.flag_cooldown:
+            return False
+        self._flagged.put(user, now)
+        return True
+
+    def allow_reply(self, user: Hashable) -> bool:
+        """Decide whether this user may trigger another bot reply; counts it if so."""
+        if self.is_flooding(user) or self.user_replies.estimate(user) >= self.user_reply_limit:
+            return False
+        self.user_replies.add(user)
+        return True
@@ -0,0 +1,134 @@
+"""
+Registry of the groups the bot broadcasts to.
+
+GROUP_CHAT_IDS is parsed once at startup. From then on the registry follows
+the bot's own membership (`my_chat_member` updates) and the groups it sees
+member updates from. Each group's entry is its settings dict: title, active
+flag, where it came from ("config" or "joined"), plus any per-group
+overrides such as broadcast intervals. Entries are persisted through
+`on_change`. `targets` is a precomputed list of active chat IDs, rebuilt
+only when membership changes.
+"""
+import logging
+from typing import Callable, Dict, Iterable, List, Optional
+
+from telegram import Chat, ChatMemberUpdated
+from telegram.constants import ChatMemberStatus
+
+logger = logging.getLogger(__name__)
+
+GROUP_TYPES = (Chat.GROUP, Chat.SUPERGROUP)
+PRESENT_STATUSES = (ChatMemberStatus.MEMBER, ChatMemberStatus.ADMINISTRATOR,
+                    ChatMemberStatus.OWNER, ChatMemberStatus.RESTRICTED)
+
+
+def parse_chat_ids(raw: str) -> List[int]:
+    """Parse a comma-separated list of chat IDs, tolerating stray dashes and blanks."""
+    chat_ids = []
+    for chat_id in raw.split(','):
+        clean_chat_id = chat_id.strip()
+        if not clean_chat_id:
+            continue
+        # Clean the chat_id - remove any extra dashes
+        if clean_chat_id.startswith('--'):
+            clean_chat_id = clean_chat_id[1:]
+        try:
+            chat_ids.append(int(clean_chat_id))
+        except ValueError as e:
+            logger.error(f"❌ Invalid chat ID format {chat_id}: {e}")
+    return chat_ids
+
+
+class GroupRegistry:
+    """Groups keyed by chat ID, with their settings and the list of broadcast targets."""
+
+    def __init__(self, configured: Iterable[int] = (),
+                 on_change: Optional[Callable[[int, dict], None]] = None):
+        self.configured = list(dict.fromkeys(configured))
+        self.on_change = on_change
+        self.groups: Dict[int, dict] = {}
+        self.targets: List[int] = []
+        self._membership_listeners: List[Callable[[], None]] = []
+        self.load({})
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+    def __contains__(self, chat_id: int) -> bool:
+        return chat_id in self.groups
+
+    def get(self, chat_id: int) -> dict:
+        return self.groups.get(chat_id, {})
+
+    def on_membership_change(self, listener: Callable[[], None]) -> None:
+        """Call `listener` whenever the list of targets changes."""
+        self._membership_listeners.append(listener)
+
+    def load(self, saved: Dict[int, dict], replace: bool = False) -> None:
+        """Merge (or with `replace`, swap in) persisted entries; configured groups without an entry start active."""
+        if replace:
+            self.groups.clear()
+        self.groups.update({chat_id: dict(settings) for chat_id, settings in saved.items()})
+        for chat_id in self.configured:
+            settings = self.groups.setdefault(chat_id, {})
+            settings.setdefault("active", True)
+            settings.setdefault("source", "config")
+        self._rebuild_targets()
+
+    def _rebuild_targets(self) -> None:
+        targets = [chat_id for chat_id, settings in self.groups.items() if settings.get("active")]
+        if targets != self.targets:
+            self.targets = targets
+            for listener in self._membership_listeners:
+                try:
+                    listener()
+                except Exception as e:
+                    logger.error(f"❌ Error in group membership listener: {e}")
+
+    def _save(self, chat_id: int) -> None:
+        if self.on_change:
+            self.on_change(chat_id, self.groups[chat_id])
+
+    # Settings
+
+    def setting(self, chat_id: int, key: str, default=None):
+        return self.groups.get(chat_id, {}).get(key, default)
+
+    def set_setting(self, chat_id: int, key: str, value) -> None:
+        """Set (or with None, clear) one per-group setting."""
+        settings = self.groups.setdefault(chat_id, {})
+        if value is None:
+            settings.pop(key, None)
+        else:
+            settings[key] = value
+        self._save(chat_id)
+
+    # Membership
+
+    def set_active(self, chat_id: int, active: bool, title: Optional[str] = None) -> bool:
+        """Mark a group as joined or left; returns True if anything changed."""
+        settings = self.groups.setdefault(chat_id, {"source": "joined"})
+        changed = settings.get("active") != active or (title is not None and settings.get("title") != title)
+        if not changed:
+            return False
+        settings["active"] = active
+        if title is not None:
+            settings["title"] = title
+        self._save(chat_id)
+        self._rebuild_targets()
+        logger.info(f"👥 Group {chat_id} ({settings.get('title', 'unknown')}) is now "
+                    f"{'active' if active else 'inactive'} - {len(self.targets)} broadcast targets")
+        return True
+
+    def handle_my_chat_member(self, update: ChatMemberUpdated) -> None:
+        """Follow the bot being added to or removed from a group."""
+        if update.chat.type not in GROUP_TYPES:
+            return
+        self.set_active(update.chat.id, update.new_chat_member.status in PRESENT_STATUSES, update.chat.title)
+
+    def handle_chat_member(self, update: ChatMemberUpdated) -> None:
+        """Member updates are only delivered for groups the bot is in."""
+        if update.chat.type not in GROUP_TYPES:
+            return
+        if not self.setting(update.chat.id, "active"):
+            self.set_active(update.chat.id, True, update.chat.title)
@@ -0,0 +1,93 @@
+"""
+Several language bots hosted in one process.
+
+Each hosted bot is one language edition of the TrustCoin bot: its own
+token, menu content, groups, broadcast breakers and welcome windows. They
+are listed in BOT_TOKENS as "<name>=<token>" pairs, e.g.
+"en=123:AAA,ar=456:BBB"; without it the BOT_TOKEN_ENG bot is hosted alone
+as "en". A bot's menu comes from CONTENT_PATH_<NAME> (e.g.
+CONTENT_PATH_AR) and falls back to CONTENT_PATH; its configured broadcast
+groups come from GROUP_CHAT_IDS_<NAME>, and the "en" bot also keeps the
+groups listed in GROUP_CHAT_IDS.
+
+Each bot also has its own outbound dispatcher, because Telegram's rate
+limits apply per token. Everything else - the HTTP pool for sends, the
+scheduler, the store, metrics and the web server - exists once per process
+and is shared by all bots. Handlers find their bot's state with
+`hosted_bot(context)`.
+"""
+import asyncio
+import os
+from dataclasses import dataclass, field
+from typing import List, Mapping, Optional
+
+from telegram.ext import Application
+
+from broadcast import BroadcastEngine
+from content import ContentTable
+from groups import GroupRegistry
+from lease import Lease
+from outbound import PriorityDispatcher
+from welcome import WelcomeAggregator
+
+DEFAULT_BOT = "en"
+BOT_DATA_KEY = "hosted_bot"
+
+
+@dataclass(frozen=True)
+class BotConfig:
+    """Name, token, content file and configured groups of one hosted bot."""
+    name: str
+    token: str
+    content_path: str
+    group_chat_ids: str = ""  # Comma-separated, as in GROUP_CHAT_IDS
+
+
+def parse_bot_configs(raw: str, default_token: Optional[str], default_content_path: str,
+                      environ: Mapping[str, str] = os.environ) -> List[BotConfig]:
+    """Parse "<name>=<token>,..." into bot configs; empty means the default token as "en"."""
+    entries = [entry.strip() for entry in raw.split(",") if entry.strip()]
+    if not entries and default_token:
+        entries = [f"{DEFAULT_BOT}={default_token}"]
+
+    configs = []
+    for entry in entries:
+        name, separator, token = entry.partition("=")
+        name, token = name.strip().lower(), token.strip()
+        if not separator or not name.isalnum() or not token:
+            raise ValueError(f"Invalid BOT_TOKENS entry {entry.split(':')[0]!r} - expected <name>=<token>")
+        if any(config.name == name for config in configs):
+            raise ValueError(f"Bot name {name!r} is listed twice in BOT_TOKENS")
+        content_path = environ.get(f"CONTENT_PATH_{name.upper()}", default_content_path)
+        groups = environ.get(f"GROUP_CHAT_IDS_{name.upper()}", "")
+        if name == DEFAULT_BOT:
+            groups = ",".join(filter(None, (environ.get("GROUP_CHAT_IDS", ""), groups)))
+        configs.append(BotConfig(name, token, content_path, groups))
+    return configs
+
+
+@dataclass
+class HostedBot:
+    """One bot's application and the state that is not shared with other bots."""
+    config: BotConfig
+    application: Application
+    content: ContentTable
+    groups: GroupRegistry
+    engine: BroadcastEngine
+    welcomes: WelcomeAggregator
+    outbound: PriorityDispatcher
+    lease: Optional[Lease] = None
+    lease_task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    @property
+    def name(self) -> str:
+        return self.config.name
+
+    @property
+    def bot(self):
+        return self.application.bot
+
+
+def hosted_bot(context) -> HostedBot:
+    """The hosted bot that received the update being handled."""
+    return context.bot_data[BOT_DATA_KEY]
@@ -0,0 +1,94 @@
+"""
+Tuned HTTP connection pools for Bot API calls.
+
+HTTPXRequest only exposes the pool size; it keeps every connection alive
+for httpx's default five idle seconds and waits one second for a free
+connection before raising TimedOut. PoolSettings adds the keep-alive
+limits and the pool timeout, and TunedHTTPXRequest applies them.
+
+The bot uses two kinds of pools:
+- one send pool shared by every hosted bot, for replies, welcomes and
+  broadcasts (how many run at once is decided by each bot's outbound
+  dispatcher, not by the pool);
+- one single-connection pool per bot for the getUpdates long poll, so
+  polling never waits behind a send.
+
+Send pool settings come from the environment:
+
+    API_POOL_SIZE         connections in the send pool (default 16 per hosted bot)
+    API_KEEPALIVE         idle connections kept open (default: API_POOL_SIZE)
+    API_KEEPALIVE_EXPIRY  seconds an idle connection stays open (default 60)
+    API_HTTP_VERSION      "1.1" or "2"; HTTP/2 multiplexes all sends over one
+                          connection and needs `python-telegram-bot[http2]`
+    API_POOL_TIMEOUT      seconds a call waits for a free connection (default 10)
+
+bench_pool.py measures broadcast rounds and reply latency against the local
+stand-in for a range of settings.
+"""
+import os
+from dataclasses import dataclass, replace
+from typing import Mapping, Optional
+
+import httpx
+from telegram.request import HTTPXRequest
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """Size, keep-alive, protocol and timeouts of one connection pool."""
+    pool_size: int = 16
+    keepalive: Optional[int] = None  # Idle connections kept open; None = pool_size
+    keepalive_expiry: Optional[float] = 60.0  # Seconds; None = until the server closes them
+    http_version: str = "1.1"
+    pool_timeout: Optional[float] = 10.0
+    connect_timeout: Optional[float] = 5.0
+    read_timeout: Optional[float] = 5.0
+    write_timeout: Optional[float] = 5.0
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = os.environ, **defaults) -> "PoolSettings":
+        """Send pool settings from API_* variables; unset ones come from `defaults` or the class."""
+        defaults = cls(**defaults)
+        keepalive = environ.get("API_KEEPALIVE")
+        return cls(
+            pool_size=int(environ.get("API_POOL_SIZE", defaults.pool_size)),
+            keepalive=int(keepalive) if keepalive else defaults.keepalive,
+            keepalive_expiry=float(environ.get("API_KEEPALIVE_EXPIRY", defaults.keepalive_expiry)),
+            http_version=environ.get("API_HTTP_VERSION", defaults.http_version),
+            pool_timeout=float(environ.get("API_POOL_TIMEOUT", defaults.pool_timeout)),
+        )
+
+    def long_poll(self) -> "PoolSettings":
+        """Settings for a getUpdates pool: one kept-alive HTTP/1.1 connection."""
+        return replace(self, pool_size=1, keepalive=1, keepalive_expiry=None, http_version="1.1")
+
+    def describe(self) -> str:
+        keepalive = self.pool_size if self.keepalive is None else self.keepalive
+        return (f"pool {self.pool_size}, keep-alive {keepalive} for {self.keepalive_expiry}s, "
+                f"HTTP/{self.http_version}")
+
+
+class TunedHTTPXRequest(HTTPXRequest):
+    """HTTPXRequest with explicit keep-alive limits and timeouts."""
+
+    def __init__(self, settings: PoolSettings = PoolSettings(), proxy_url: Optional[str] = None):
+        self.settings = settings  # Read by _build_client, which the parent calls
+        super().__init__(
+            connection_pool_size=settings.pool_size,
+            proxy_url=proxy_url,
+            read_timeout=settings.read_timeout,
+            write_timeout=settings.write_timeout,
+            connect_timeout=settings.connect_timeout,
+            pool_timeout=settings.pool_timeout,
+            http_version=settings.http_version,
+        )
+
+    def _build_client(self) -> httpx.AsyncClient:
+        # Also called by initialize() after a shutdown, so the limits survive a restart
+        settings = self.settings
+        self._client_kwargs["limits"] = httpx.Limits(
+            max_connections=settings.pool_size,
+            max_keepalive_connections=settings.pool_size if settings.keepalive is None else settings.keepalive,
+            keepalive_expiry=settings.keepalive_expiry,
+        )
+        return super()._build_client()
@@ -0,0 +1,74 @@
+"""
+Multilingual keyword matching for group messages.
+
+`KeywordMatcher` compiles every keyword of every intent into one
+Aho-Corasick automaton, so a message is scanned once no matter how many
+keywords or languages there are. Keywords and text are NFC-normalized and
+casefolded; for the Latin, Arabic, Cyrillic, Devanagari and Turkish keyword
+sets the bot uses this matches exactly what `word in text.lower()` did.
+"""
+import unicodedata
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Set
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text the same way keywords are normalized."""
+    return unicodedata.normalize("NFC", text).casefold()
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton mapping substrings to intent labels."""
+
+    def __init__(self, intents: Dict[str, Iterable[str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        outputs: List[Set[str]] = [set()]
+
+        for intent, words in intents.items():
+            for word in words:
+                word = normalize_text(word)
+                if not word:
+                    continue
+                state = 0
+                for char in word:
+                    next_state = self._goto[state].get(char)
+                    if next_state is None:
+                        next_state = len(self._goto)
+                        self._goto[state][char] = next_state
+                        self._goto.append({})
+                        self._fail.append(0)
+                        outputs.append(set())
+                    state = next_state
+                outputs[state].add(intent)
+
+        # Breadth-first pass to set failure links and merge their outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                outputs[next_state] |= outputs[self._fail[next_state]]
+
+        self._out: List[FrozenSet[str]] = [frozenset(output) for output in outputs]
+
+    @property
+    def states(self) -> int:
+        return len(self._goto)
+
+    def match(self, text: str) -> Set[str]:
+        """Return every intent with at least one keyword occurring in `text`."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[str] = set()
+        state = 0
+        for char in normalize_text(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found |= out[state]
+        return found
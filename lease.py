@@ -0,0 +1,232 @@
+"""
+Lease-based locks shared between bot instances through SQLite.
+
+A lease is a named row holding the current holder, an expiry time and a
+fencing token that increases every time the lease changes hands. A holder
+must renew before the lease expires; anyone may take over an expired lease.
+
+`LeaderElection` builds on a lease: every instance heartbeats against it,
+the holder is the leader, and work done on the leader's behalf can be
+fenced by checking that its token is still the current one.
+"""
+import asyncio
+import logging
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from typing import Awaitable, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    holder TEXT NOT NULL,
+    token INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+
+def default_holder_id() -> str:
+    """Identify this process: host, pid and a random suffix."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class Lease:
+    """A named, expiring lock with fencing tokens."""
+
+    def __init__(self, path: str, name: str, ttl: float = 15.0, holder: Optional[str] = None):
+        self.path = path
+        self.name = name
+        self.ttl = ttl
+        self.holder = holder or default_holder_id()
+        self.token: Optional[int] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(SCHEMA)
+        return conn
+
+    def try_acquire(self) -> Optional[int]:
+        """Take or renew the lease; return the fencing token, or None if someone else holds it."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT holder, token, expires_at FROM leases WHERE name = ?", (self.name,)
+            ).fetchone()
+            now = time.time()
+            if row and row[0] != self.holder and row[2] > now:
+                conn.execute("ROLLBACK")
+                self.token = None
+                return None
+            if row and row[0] == self.holder:
+                token = row[1]
+            else:
+                token = (row[1] if row else 0) + 1
+            conn.execute(
+                "INSERT OR REPLACE INTO leases (name, holder, token, expires_at) VALUES (?, ?, ?, ?)",
+                (self.name, self.holder, token, now + self.ttl),
+            )
+            conn.execute("COMMIT")
+            self.token = token
+            return token
+        finally:
+            conn.close()
+
+    def release(self) -> None:
+        """Give the lease up early if we still hold it."""
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE leases SET expires_at = 0 WHERE name = ? AND holder = ?", (self.name, self.holder)
+            )
+        finally:
+            conn.close()
+        self.token = None
+
+    def validate(self, token: int) -> bool:
+        """True if we still hold the lease under `token` and it has not expired."""
+        current = self.current()
+        return bool(current and current[0] == self.holder and current[1] == token and current[2] > 0)
+
+    def current(self) -> Optional[Tuple[str, int, float]]:
+        """Return (holder, token, seconds until expiry) of the lease, if any."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT holder, token, expires_at FROM leases WHERE name = ?", (self.name,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if not row:
+            return None
+        return row[0], row[1], row[2] - time.time()
+
+    async def acquire(self, max_backoff: float = 10.0) -> int:
+        """Wait until the lease is ours, backing off while another holder is alive."""
+        delay = 0.5
+        while True:
+            token = await asyncio.to_thread(self.try_acquire)
+            if token is not None:
+                return token
+            current = await asyncio.to_thread(self.current)
+            if current:
+                logger.info(f"🔒 Lease '{self.name}' held by {current[0]} for {max(current[2], 0):.1f}s more - waiting")
+            await asyncio.sleep(min(delay, max(current[2], 0.1) if current else delay))
+            delay = min(delay * 2, max_backoff)
+
+    async def keep_alive(self) -> None:
+        """Renew the lease every third of its TTL; return once another instance has taken it over."""
+        while True:
+            await asyncio.sleep(self.ttl / 3)
+            try:
+                if await asyncio.to_thread(self.try_acquire) is None:
+                    logger.error(f"🚨 Lease '{self.name}' was taken over by another instance")
+                    return
+            except Exception as e:
+                logger.error(f"❌ Error renewing lease '{self.name}': {e}")
+
+
+class LeaderElection:
+    """Heartbeat a lease and call back when leadership is gained or lost.
+
+    Every `heartbeat` seconds (a third of the TTL by default) the lease is
+    taken or renewed. A standby therefore takes over at most TTL + heartbeat
+    seconds after a leader dies, and within one heartbeat after a leader
+    releases the lease on shutdown. A leader that cannot renew steps down
+    before its lease could have expired.
+    """
+
+    def __init__(
+        self,
+        lease: Lease,
+        on_elected: Callable[[int], Awaitable[None]],
+        on_demoted: Callable[[], Awaitable[None]],
+        heartbeat: Optional[float] = None,
+    ):
+        self.lease = lease
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.heartbeat = heartbeat or lease.ttl / 3
+        self.token: Optional[int] = None
+        self._renewed_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self.token is not None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop campaigning and hand the lease over if we hold it."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self) -> None:
+        try:
+            while True:
+                try:
+                    token = await asyncio.to_thread(self.lease.try_acquire)
+                    self._renewed_at = time.monotonic()
+                except Exception as e:
+                    logger.error(f"❌ Error renewing leader lease '{self.lease.name}': {e}")
+                    # Keep leading only while the last renewal is surely still valid
+                    stale = time.monotonic() - self._renewed_at > self.lease.ttl - self.heartbeat
+                    token = None if stale else self.token
+
+                if token != self.token:
+                    if self.token is not None:
+                        await self._demote()
+                    if token is not None:
+                        self.token = token
+                        logger.info(f"👑 Became leader for '{self.lease.name}' (token {token})")
+                        await self.on_elected(token)
+                await asyncio.sleep(self.heartbeat)
+        finally:
+            if self.token is not None:
+                await self._demote()
+                try:
+                    await asyncio.to_thread(self.lease.release)
+                except Exception as e:
+                    logger.error(f"Error releasing leader lease '{self.lease.name}': {e}")
+
+    async def _demote(self) -> None:
+        logger.warning(f"🪑 Lost leadership for '{self.lease.name}' (token {self.token})")
+        self.token = None
+        try:
+            await self.on_demoted()
+        except Exception as e:
+            logger.error(f"❌ Error stepping down as leader: {e}")
+
+    async def still_leader(self) -> bool:
+        """Check against the shared lease (not just local state) that our term is current."""
+        token = self.token
+        return token is not None and await asyncio.to_thread(self.lease.validate, token)
+
+    def fenced(self, callback: Callable[[], Awaitable]) -> Callable[[], Awaitable]:
+        """Wrap a coroutine function so it only starts while our term is still current.
+
+        The term is checked once, when the call starts. Work that is still
+        running when leadership is lost is not fenced: it keeps going until
+        `on_demoted` stops it, which can be up to one heartbeat after another
+        instance took the lease over.
+        """
+        async def run_fenced():
+            if not await self.still_leader():
+                logger.warning(f"🚧 Skipping work fenced off by '{self.lease.name}' (token {self.token})")
+                return None
+            return await callback()
+        return run_fenced
+
@@ -0,0 +1,138 @@
+"""
+Liveness tracking for the bot's event loop and update pipeline.
+
+`LivenessMonitor.run` is a background task that measures how late the
+event loop wakes it up (scheduling lag). A watchdog thread watches the
+same heartbeat from outside the loop: when the loop has not ticked for
+`stall_threshold` seconds, something is blocking it, and the watchdog logs
+the loop thread's current stack so the culprit shows up in the logs.
+
+The monitor also records when the last update was processed and, per
+bot, when getUpdates last succeeded. Only bots this instance is polling
+count: a bot waiting for its instance lease on a standby has no getUpdates
+to be late with. `status()` turns all of it into healthy / degraded /
+unhealthy for the /health endpoint.
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HEALTHY = "healthy"
+DEGRADED = "degraded"
+UNHEALTHY = "unhealthy"
+
+
+class LivenessMonitor:
+    """Event-loop lag probe, stall watchdog and freshness timestamps."""
+
+    def __init__(
+        self,
+        interval: float = 0.5,
+        lag_degraded: float = 0.25,
+        lag_unhealthy: float = 2.0,
+        stall_threshold: float = 5.0,
+        poll_degraded: Optional[float] = 60.0,
+        poll_unhealthy: Optional[float] = 180.0,
+        update_degraded: Optional[float] = None,
+    ):
+        self.interval = interval
+        self.lag_degraded = lag_degraded
+        self.lag_unhealthy = lag_unhealthy
+        self.stall_threshold = stall_threshold
+        # None disables a check, e.g. getUpdates freshness in webhook mode
+        self.poll_degraded = poll_degraded
+        self.poll_unhealthy = poll_unhealthy
+        self.update_degraded = update_degraded
+
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self.last_tick: Optional[float] = None
+        self.last_update: Optional[float] = None
+        self.last_get_updates: Dict[str, float] = {}  # Polled bots only; since polling started at first
+        self.stalls = 0
+        self._loop_thread_id: Optional[int] = None
+        self._stop = threading.Event()
+
+    def mark_update(self) -> None:
+        self.last_update = time.monotonic()
+
+    def start_polling(self, bot: str) -> None:
+        """Judge `bot`'s getUpdates freshness from now on."""
+        self.last_get_updates[bot] = time.monotonic()
+
+    def stop_polling(self, bot: str) -> None:
+        self.last_get_updates.pop(bot, None)
+
+    def mark_get_updates(self, bot: str) -> None:
+        # A late response after polling stopped must not bring the bot back
+        if bot in self.last_get_updates:
+            self.last_get_updates[bot] = time.monotonic()
+
+    async def run(self) -> None:
+        """Measure scheduling lag until cancelled; starts the watchdog thread."""
+        self._loop_thread_id = threading.get_ident()
+        self.last_tick = time.monotonic()
+        self._stop.clear()
+        watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        watchdog.start()
+        try:
+            while True:
+                before = time.monotonic()
+                await asyncio.sleep(self.interval)
+                self.last_tick = time.monotonic()
+                self.lag = max(0.0, self.last_tick - before - self.interval)
+                self.max_lag = max(self.max_lag, self.lag)
+                if self.lag > self.lag_degraded:
+                    logger.warning(f"🐢 Event loop lagged {self.lag * 1000:.0f}ms")
+        finally:
+            self._stop.set()
+
+    def _watch(self) -> None:
+        """Log the loop thread's stack once per stall."""
+        reported = False
+        while not self._stop.wait(self.interval):
+            blocked = time.monotonic() - self.last_tick
+            if blocked < self.stall_threshold:
+                reported = False
+                continue
+            if reported:
+                continue
+            reported = True
+            self.stalls += 1
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else "<no frame>"
+            logger.error(f"🚨 Event loop blocked for {blocked:.1f}s, current stack:\n{stack}")
+
+    def status(self) -> Tuple[str, dict]:
+        """Return the overall state and the values it was derived from."""
+        now = time.monotonic()
+        # A blocked loop cannot update `lag` itself, so count the time since the last tick
+        lag = max(self.lag, now - self.last_tick - self.interval) if self.last_tick else 0.0
+        poll_age = now - min(self.last_get_updates.values()) if self.last_get_updates else None
+        update_age = now - self.last_update if self.last_update else None
+
+        state = HEALTHY
+        if lag > self.lag_degraded:
+            state = DEGRADED
+        if self.poll_degraded is not None and poll_age is not None and poll_age > self.poll_degraded:
+            state = DEGRADED
+        if self.update_degraded is not None and update_age is not None and update_age > self.update_degraded:
+            state = DEGRADED
+        if lag > self.lag_unhealthy or (
+                self.poll_unhealthy is not None and poll_age is not None and poll_age > self.poll_unhealthy):
+            state = UNHEALTHY
+
+        return state, {
+            "loop_lag_ms": round(lag * 1000, 1),
+            "max_loop_lag_ms": round(self.max_lag * 1000, 1),
+            "loop_stalls": self.stalls,
+            "seconds_since_update": round(update_age, 1) if update_age is not None else None,
+            "seconds_since_get_updates": round(poll_age, 1) if poll_age is not None else None,
+            "polling_bots": sorted(self.last_get_updates),
+        }
@@ -0,0 +1,200 @@
+"""
+In-process metrics rendered in the Prometheus text exposition format.
+
+Everything runs on the bot's event loop, so the metric types are plain
+counters without locks: incrementing a counter is a dict update and a
+histogram observation is a bisect over fixed buckets. Values that already
+live elsewhere (like the number of tracked users) are exposed through
+gauges that read them at scrape time instead of being kept in sync.
+"""
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from telegram.request import BaseRequest, RequestData
+
+# Seconds; covers fast in-memory handlers up to slow Bot API round trips
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_labels(names: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Counter:
+    """Monotonic counter, optionally split by label values."""
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0)
+
+    def render(self) -> Iterable[str]:
+        for label_values, value in sorted(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labels, label_values)} {value}"
+
+
+class Gauge:
+    """Value read from a callback at scrape time.
+
+    With labels, the callback returns a dict of label-value tuples to values.
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, callback: Callable[[], Union[float, Dict]],
+                 labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.callback = callback
+        self.labels = tuple(labels)
+
+    def render(self) -> Iterable[str]:
+        if not self.labels:
+            yield f"{self.name} {self.callback()}"
+            return
+        for label_values, value in sorted(self.callback().items()):
+            yield f"{self.name}{_format_labels(self.labels, label_values)} {value}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram of observed values, optionally split by labels."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def count(self, *label_values: str) -> int:
+        series = self._series.get(label_values)
+        return int(sum(series[:-1])) if series else 0
+
+    def render(self) -> Iterable[str]:
+        for label_values, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series):
+                cumulative += count
+                labels = _format_labels(self.labels, label_values, f'le="{bound}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, label_values)} {series[-1]}"
+            yield f"{self.name}_count{_format_labels(self.labels, label_values)} {cumulative}"
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together for the /metrics endpoint."""
+
+    def __init__(self):
+        self._metrics: List = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, callback: Callable[[], Union[float, Dict]],
+              labels: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help_text, callback, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labels, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def timed(histogram: Histogram, *label_values: str):
+    """Decorate a coroutine function so each call's duration is observed in `histogram`."""
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started, *label_values)
+        return wrapper
+    return decorator
+
+
+class InstrumentedRequest(BaseRequest):
+    """Request backend that times every Bot API call made through another backend.
+
+    Calls are labelled by API method. Responses with status 429 (which the
+    bot surfaces as RetryAfter) are counted separately in `throttled`.
+    `on_response(method, status)` is called after every call that returned.
+    """
+
+    def __init__(self, request: BaseRequest, calls: Histogram, throttled: Counter,
+                 on_response: Optional[Callable[[str, int], None]] = None):
+        self.request = request
+        self.calls = calls
+        self.throttled = throttled
+        self.on_response = on_response
+
+    async def initialize(self) -> None:
+        await self.request.initialize()
+
+    async def shutdown(self) -> None:
+        await self.request.shutdown()
+
+    async def do_request(self, url: str, method: str, request_data: Optional[RequestData] = None,
+                         read_timeout=BaseRequest.DEFAULT_NONE, write_timeout=BaseRequest.DEFAULT_NONE,
+                         connect_timeout=BaseRequest.DEFAULT_NONE, pool_timeout=BaseRequest.DEFAULT_NONE):
+        api_method = url.rsplit("/", 1)[-1]
+        started = time.perf_counter()
+        status = 0
+        try:
+            status, payload = await self.request.do_request(
+                url, method, request_data,
+                read_timeout=read_timeout, write_timeout=write_timeout,
+                connect_timeout=connect_timeout, pool_timeout=pool_timeout,
+            )
+            return status, payload
+        finally:
+            self.calls.observe(time.perf_counter() - started, api_method)
+            if status == 429:
+                self.throttled.inc(api_method)
+            if status and self.on_response:
+                self.on_response(api_method, status)
+
+
+def instrument_handlers(application, histogram: Histogram) -> None:
+    """Time every registered handler's callback, labelled by the callback's name."""
+    for handlers in application.handlers.values():
+        for handler in handlers:
+            handler.callback = timed(histogram, handler.callback.__name__)(handler.callback)
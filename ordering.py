@@ -0,0 +1,112 @@
+"""
+Concurrent update processing that keeps each chat's updates in order.
+
+With `concurrent_updates` the application starts one task per update, in
+the order the updates were fetched. ChatOrderedApplication chains those
+tasks by chat: an update waits until the previous update from the same
+chat has been handled, so a slow reply in one group no longer holds up
+other chats, but one chat never sees its updates out of order.
+
+Two limits apply:
+- `concurrent_updates` (passed to the builder) bounds the updates admitted
+  into processing, including those waiting behind their chat. PTB starts
+  an update's task as soon as it takes the update off the queue and only
+  applies its own `concurrent_updates` semaphore inside that task, so on
+  its own it bounds nothing. ChatOrderedApplication therefore wraps the
+  update queue's `get`: an update is only taken once an admission slot is
+  free, and the slot is returned when its processing has finished. While
+  every slot is taken the bounded update queue fills up, polling slows
+  down and the webhook answers 503.
+- `max_running` bounds the handlers actually running. An update only takes
+  a running slot once it is at the head of its chat, so one busy chat
+  cannot occupy every slot while its own updates wait for each other.
+"""
+import asyncio
+from typing import Dict, Hashable, Optional, Set
+
+from telegram import Update
+from telegram.ext import Application
+# The object Application.stop() puts on the update queue; it is never processed (PTB 20.3)
+from telegram.ext._application import _STOP_SIGNAL
+
+
+def ordering_key(update: object) -> Optional[Hashable]:
+    """The chat whose updates must stay in order; None for updates without one."""
+    if not isinstance(update, Update):
+        return None
+    if update.effective_chat is not None:
+        return update.effective_chat.id
+    if update.effective_user is not None:
+        # Inline queries and inline-message buttons: keep each user's in order
+        return update.effective_user.id
+    return None
+
+
+class ChatOrderedApplication(Application):
+    """Application that handles different chats in parallel and each chat in order."""
+
+    def __init__(self, max_running: int = 32, **kwargs):
+        super().__init__(**kwargs)
+        self.max_running = max_running
+        self._running_slots = asyncio.BoundedSemaphore(max_running)
+        self._chat_tails: Dict[Hashable, asyncio.Future] = {}
+        # Admission before the update leaves the queue; see the module docstring
+        self._admission_slots = asyncio.BoundedSemaphore(self.concurrent_updates)
+        self._admitted: Set[int] = set()  # id() of updates holding an admission slot
+        self._queue_get = self.update_queue.get
+        self.update_queue.get = self._admit
+
+    @property
+    def admitted_updates(self) -> int:
+        """Updates taken off the queue whose processing has not finished."""
+        return len(self._admitted)
+
+    async def _admit(self) -> object:
+        """Take the next update off the queue once an admission slot is free."""
+        await self._admission_slots.acquire()
+        try:
+            update = await self._queue_get()
+        except BaseException:
+            self._admission_slots.release()
+            raise
+        if update is _STOP_SIGNAL:
+            self._admission_slots.release()
+        else:
+            self._admitted.add(id(update))
+        return update
+
+    def _release(self, update: object) -> None:
+        # Updates passed to process_update directly (not via the queue) hold no slot
+        if id(update) in self._admitted:
+            self._admitted.discard(id(update))
+            self._admission_slots.release()
+
+    @property
+    def waiting_chats(self) -> int:
+        """Chats with at least one update being handled or waiting."""
+        return len(self._chat_tails)
+
+    async def process_update(self, update: object) -> None:
+        key = ordering_key(update)
+        if key is None:
+            try:
+                async with self._running_slots:
+                    await super().process_update(update)
+            finally:
+                self._release(update)
+            return
+
+        # Registered before the first await, so the chain follows fetch order
+        previous = self._chat_tails.get(key)
+        done = asyncio.get_running_loop().create_future()
+        self._chat_tails[key] = done
+        try:
+            if previous is not None:
+                await asyncio.shield(previous)
+            async with self._running_slots:
+                await super().process_update(update)
+        finally:
+            done.set_result(None)
+            if self._chat_tails.get(key) is done:
+                del self._chat_tails[key]
+            self._release(update)
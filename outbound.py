@@ -0,0 +1,198 @@
+"""
+Priority dispatcher for all outgoing Bot API calls.
+
+Plugged in as the application's rate limiter, so every call made through
+the bot (except getUpdates) passes through `process_request`. Calls are
+grouped into priority classes:
+- INTERACTIVE: replies to users (the default for untagged calls)
+- WELCOME: greetings for new members
+- BROADCAST: auto-posts and reminders
+
+The class is chosen with `rate_limit_args={"priority": ...}`.
+
+Telegram limits each bot token separately, so a process hosting several
+bots gives each its own dispatcher; `labels` (e.g. the bot name) are put
+before the priority in the metrics they share.
+
+A shared token bucket caps the total call rate. Whenever a token is free,
+the highest-priority class with a waiting call and spare concurrency goes
+next, so a /start reply never waits behind a broadcast round. Low-priority
+classes can shed load: a call that finds its class's queue full, or that
+has waited longer than the class allows, fails with OutboundShed. That is
+a RetryAfter, so the broadcast engine pauses the chat and retries. If its
+retries run out the send is reported as failed in the round's stats, but
+it never counts towards the chat's circuit breaker.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Coroutine, Deque, Dict, List, Optional, Tuple, Union
+
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+from metrics import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+WELCOME = "welcome"
+BROADCAST = "broadcast"
+
+
+@dataclass
+class PriorityClass:
+    """Limits of one priority class; None means unlimited."""
+    name: str
+    concurrency: Optional[int] = None
+    max_queue: Optional[int] = None
+    max_wait: Optional[float] = None
+
+
+DEFAULT_CLASSES = (
+    PriorityClass(INTERACTIVE),
+    PriorityClass(WELCOME, concurrency=8, max_queue=500, max_wait=30.0),
+    PriorityClass(BROADCAST, concurrency=8, max_queue=200, max_wait=10.0),
+)
+
+
+class OutboundShed(RetryAfter):
+    """A low-priority call was dropped locally because its class is backlogged."""
+
+    def __init__(self, priority: str, retry_after: int = 1):
+        super().__init__(retry_after)
+        self.priority = priority
+        self.message = f"Outbound {priority} traffic shed under backlog. Retry in {retry_after} seconds"
+
+
+class PriorityDispatcher(BaseRateLimiter[Dict[str, Any]]):
+    """Rate limiter that serves priority classes in order, with per-class limits."""
+
+    def __init__(
+        self,
+        rate: float = 30.0,
+        burst: Optional[float] = None,
+        classes: Tuple[PriorityClass, ...] = DEFAULT_CLASSES,
+        wait_seconds: Optional[Histogram] = None,
+        shed: Optional[Counter] = None,
+        labels: Tuple[str, ...] = (),
+    ):
+        self.rate = rate
+        self.burst = burst if burst is not None else rate
+        self.classes = list(classes)
+        self.wait_seconds = wait_seconds
+        self.shed = shed
+        self.labels = tuple(labels)
+        self._limits: Dict[str, PriorityClass] = {cls.name: cls for cls in self.classes}
+        self._waiting: Dict[str, Deque[Tuple[float, asyncio.Future]]] = {cls.name: deque() for cls in self.classes}
+        self._active: Dict[str, int] = {cls.name: 0 for cls in self.classes}
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._pump_handle: Optional[asyncio.TimerHandle] = None
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        if self._pump_handle:
+            self._pump_handle.cancel()
+        for queue in self._waiting.values():
+            while queue:
+                _, future = queue.popleft()
+                future.cancel()
+
+    def depth(self, priority: str) -> int:
+        """Calls of a class waiting for their turn."""
+        return len(self._waiting[priority])
+
+    def active(self, priority: str) -> int:
+        """Calls of a class currently in flight."""
+        return self._active[priority]
+
+    def _take_token(self, now: float) -> float:
+        """Take a token and return 0, or return the seconds until one is available."""
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def _shed(self, priority: str, future: Optional[asyncio.Future] = None) -> OutboundShed:
+        if self.shed:
+            self.shed.inc(*self.labels, priority)
+        error = OutboundShed(priority)
+        if future is not None and not future.done():
+            future.set_exception(error)
+        return error
+
+    def _pump(self) -> None:
+        """Admit waiting calls in priority order while tokens and concurrency allow."""
+        self._pump_handle = None
+        now = time.monotonic()
+        while True:
+            chosen = None
+            for cls in self.classes:
+                queue = self._waiting[cls.name]
+                # Drop cancelled callers (not shed: nobody is waiting any more) and calls that waited too long
+                while queue and (queue[0][1].done() or (
+                        cls.max_wait is not None and now - queue[0][0] > cls.max_wait)):
+                    _, future = queue.popleft()
+                    if not future.done():
+                        self._shed(cls.name, future)
+                if queue and (cls.concurrency is None or self._active[cls.name] < cls.concurrency):
+                    chosen = cls
+                    break
+            if chosen is None:
+                return
+            delay = self._take_token(now)
+            if delay:
+                loop = asyncio.get_running_loop()
+                self._pump_handle = loop.call_later(delay, self._pump)
+                return
+            enqueued, future = self._waiting[chosen.name].popleft()
+            self._active[chosen.name] += 1
+            if self.wait_seconds:
+                self.wait_seconds.observe(now - enqueued, *self.labels, chosen.name)
+            future.set_result(None)
+
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, Union[bool, Dict[str, Any], List[Dict[str, Any]]]]],
+        args: Any,
+        kwargs: Dict[str, Any],
+        endpoint: str,
+        data: Dict[str, Any],
+        rate_limit_args: Optional[Dict[str, Any]],
+    ) -> Union[bool, Dict[str, Any], List[Dict[str, Any]]]:
+        priority = (rate_limit_args or {}).get("priority", INTERACTIVE)
+        if priority not in self._limits:
+            priority = INTERACTIVE
+        limits = self._limits[priority]
+        queue = self._waiting[priority]
+        if limits.max_queue is not None and len(queue) >= limits.max_queue:
+            raise self._shed(priority)
+
+        future = asyncio.get_running_loop().create_future()
+        queue.append((time.monotonic(), future))
+        if self._pump_handle is None:
+            self._pump()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                # Admitted just before the caller went away
+                self._release(priority)
+            raise
+
+        try:
+            return await callback(*args, **kwargs)
+        finally:
+            self._release(priority)
+
+    def _release(self, priority: str) -> None:
+        self._active[priority] -= 1
+        if self._pump_handle is None:
+            self._pump()
@@ -0,0 +1,74 @@
+"""
+Reply planning for group messages.
+
+A message can match several reply kinds at once (a greeting, a mention, a
+keyword). The handler lists them as candidates in priority order and the
+planner picks at most one:
+- a kind answered in the same chat within `cooldown` is skipped;
+- a text already sent in the chat within `dedup_ttl` is not sent again.
+  Among several texts for a kind, one that was not sent recently is chosen.
+
+Both are TTL caches keyed by chat, so memory is bounded by `max_entries`.
+Every candidate that is not used is reported through `on_suppressed(reason)`.
+"""
+import random
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional, Sequence
+
+from cache import TTLCache
+
+
+@dataclass(frozen=True)
+class ReplyCandidate:
+    """One possible reply: its kind and the texts to choose from."""
+    kind: str
+    texts: Sequence[str]
+    parse_mode: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class Reply:
+    kind: str
+    text: str
+    parse_mode: Optional[str] = None
+
+
+class ReplyPlanner:
+    """Picks at most one reply per message, honouring per-chat cooldowns."""
+
+    def __init__(
+        self,
+        cooldown: float = 60.0,
+        dedup_ttl: float = 600.0,
+        max_entries: int = 100_000,
+        on_suppressed: Optional[Callable[[str], None]] = None,
+    ):
+        self.on_suppressed = on_suppressed
+        self._cooldowns = TTLCache(cooldown, max_entries)  # (chat_id, kind)
+        self._recent = TTLCache(dedup_ttl, max_entries)  # (chat_id, text)
+
+    def _suppressed(self, reason: str) -> None:
+        if self.on_suppressed:
+            self.on_suppressed(reason)
+
+    def plan(self, chat_id: int, candidates: Iterable[ReplyCandidate]) -> Optional[Reply]:
+        """Return the first candidate that may be sent in this chat, or None."""
+        chosen = None
+        for candidate in candidates:
+            if chosen is not None:
+                self._suppressed("extra")
+                continue
+            if (chat_id, candidate.kind) in self._cooldowns:
+                self._suppressed("cooldown")
+                continue
+            fresh = [text for text in candidate.texts if (chat_id, text) not in self._recent]
+            if not fresh:
+                self._suppressed("duplicate")
+                continue
+            chosen = Reply(candidate.kind, random.choice(fresh), candidate.parse_mode)
+        return chosen
+
+    def record(self, chat_id: int, reply: Reply) -> None:
+        """Start the cooldown for a reply that is being sent."""
+        self._cooldowns.put((chat_id, reply.kind))
+        self._recent.put((chat_id, reply.text))
@@ -0,0 +1,239 @@
+"""
+Min-heap job scheduler with wall-clock alignment.
+
+Each job runs every `interval` seconds on a fixed grid. Aligned jobs use
+multiples of the interval since the epoch (a 60s job fires at :00 of
+every minute). A run's duration never shifts the grid, and a random
+`jitter` only delays the individual firing, never the grid itself.
+
+If a slot is missed because the process was down, the loop was blocked or
+the job was paused, the job's misfire policy decides what happens:
+- SKIP waits for the next slot.
+- CATCH_UP runs once immediately (missed slots are coalesced), then
+  returns to the grid.
+A firing counts as missed once it is more than `grace` seconds late.
+
+A job that is still running when its next slot comes up skips that slot,
+also when the job was replaced by `add()` (e.g. rescheduled) meanwhile.
+
+The scheduler keeps no storage of its own. `on_change(job)` is called
+whenever a job's persistent state changes, and `restore()` accepts the
+saved states back.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+SKIP = "skip"
+CATCH_UP = "catch_up"
+
+
+@dataclass(eq=False)
+class Job:
+    """A periodic coroutine and its schedule."""
+    name: str
+    callback: Callable[[], Awaitable[Any]]
+    interval: float
+    jitter: float = 0.0
+    align: bool = True
+    misfire: str = SKIP
+    paused: bool = False
+    due: Optional[float] = None  # Grid time of the next run
+    fire_at: Optional[float] = None  # `due` plus jitter
+    anchor: float = 0.0  # Grid origin
+    last_run: Optional[float] = None
+    last_duration: Optional[float] = None
+    last_error: Optional[str] = None
+    run_count: int = 0
+    running: bool = False
+
+    def slot_after(self, t: float) -> float:
+        """First grid time strictly after `t`."""
+        return self.anchor + (math.floor((t - self.anchor) / self.interval) + 1) * self.interval
+
+    def state(self) -> dict:
+        """The part of the job that survives restarts."""
+        return {
+            "next_run": self.due,
+            "last_run": self.last_run,
+            "paused": self.paused,
+            "run_count": self.run_count,
+            "interval": self.interval,
+        }
+
+
+class Scheduler:
+    """Runs jobs from a heap ordered by firing time."""
+
+    def __init__(self, on_change: Optional[Callable[[Job], None]] = None,
+                 clock: Callable[[], float] = time.time, grace: float = 1.0):
+        self.on_change = on_change
+        self.clock = clock
+        self.grace = grace
+        self.jobs: Dict[str, Job] = {}
+        self._saved: Dict[str, dict] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._running: Set[asyncio.Task] = set()
+
+    # Job management
+
+    def restore(self, states: Dict[str, dict]) -> None:
+        """Remember saved job states; applied when jobs with those names are added."""
+        self._saved.update(states)
+
+    def add(self, job: Job) -> Job:
+        """Schedule a job, keeping the state of a previous job with the same name."""
+        now = self.clock()
+        previous = self.jobs.get(job.name)
+        state = previous.state() if previous else self._saved.pop(job.name, None)
+        if previous:
+            # A run of the replaced job may still be in progress
+            job.running = previous.running
+        if state:
+            job.paused = state["paused"]
+            job.run_count = state["run_count"]
+            job.last_run = state["last_run"]
+            if state.get("interval") == job.interval:
+                job.due = state["next_run"]
+
+        if job.due is None:
+            job.anchor = 0.0 if job.align else now + job.interval
+            job.due = job.slot_after(now) if job.align else job.anchor
+        else:
+            job.anchor = 0.0 if job.align else job.due
+            if job.due < now:
+                self._misfire(job, now)
+
+        self.jobs[job.name] = job
+        self._push(job)
+        return job
+
+    def clear(self) -> None:
+        """Forget all jobs (their persisted state is left alone)."""
+        self.jobs.clear()
+        self._heap.clear()
+        self._wakeup.set()
+
+    def remove(self, name: str) -> None:
+        self.jobs.pop(name, None)
+        self._wakeup.set()
+
+    def pause(self, name: str) -> bool:
+        job = self.jobs.get(name)
+        if job is None:
+            return False
+        job.paused = True
+        self._changed(job)
+        self._wakeup.set()
+        return True
+
+    def resume(self, name: str) -> bool:
+        job = self.jobs.get(name)
+        if job is None:
+            return False
+        job.paused = False
+        now = self.clock()
+        if job.due < now:
+            self._misfire(job, now)
+        self._push(job)
+        return True
+
+    def _misfire(self, job: Job, now: float) -> None:
+        if job.misfire == CATCH_UP:
+            job.due = now
+        else:
+            job.due = job.slot_after(now)
+
+    def _push(self, job: Job) -> None:
+        job.fire_at = job.due + (random.uniform(0, job.jitter) if job.jitter else 0.0)
+        heapq.heappush(self._heap, (job.fire_at, next(self._seq), job.name))
+        self._changed(job)
+        self._wakeup.set()
+
+    def _changed(self, job: Job) -> None:
+        if self.on_change:
+            try:
+                self.on_change(job)
+            except Exception as e:
+                logger.error(f"❌ Error saving state of job '{job.name}': {e}")
+
+    # Running
+
+    def _peek(self) -> Optional[Tuple[float, Job]]:
+        """Return the next live heap entry, discarding stale ones."""
+        while self._heap:
+            fire_at, _, name = self._heap[0]
+            job = self.jobs.get(name)
+            if job is not None and not job.paused and job.fire_at == fire_at:
+                return fire_at, job
+            heapq.heappop(self._heap)
+        return None
+
+    async def run(self) -> None:
+        """Fire due jobs until cancelled."""
+        try:
+            while True:
+                self._wakeup.clear()
+                entry = self._peek()
+                if entry is None:
+                    await self._wakeup.wait()
+                    continue
+                fire_at, job = entry
+                delay = fire_at - self.clock()
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                heapq.heappop(self._heap)
+                if job.running:
+                    logger.warning(f"⏭️ Job '{job.name}' is still running - skipping this slot")
+                elif job.misfire == SKIP and -delay > self.grace:
+                    logger.warning(f"⏭️ Job '{job.name}' missed its slot by {-delay:.0f}s - skipping it")
+                else:
+                    # Marked before the task starts, so a job replaced meanwhile inherits it
+                    job.running = True
+                    task = asyncio.create_task(self._run_job(job))
+                    self._running.add(task)
+                    task.add_done_callback(self._running.discard)
+
+                # This firing (or skip) covers every slot up to now, so a late one never
+                # counts as a misfire again: back to the next slot on the grid
+                job.due = job.slot_after(max(job.due, self.clock()))
+                self._push(job)
+        finally:
+            for task in list(self._running):
+                task.cancel()
+            for job in self.jobs.values():
+                job.running = False
+
+    async def _run_job(self, job: Job) -> None:
+        started = self.clock()
+        error = None
+        try:
+            await job.callback()
+        except Exception as e:
+            error = str(e)
+            logger.error(f"❌ Job '{job.name}' failed: {e}")
+        finally:
+            # A job that replaced this one while it ran takes over its outcome
+            current = self.jobs.get(job.name)
+            for target in (job,) if current is None or current is job else (job, current):
+                target.running = False
+                target.last_error = error
+                target.last_run = started
+                target.last_duration = self.clock() - started
+                target.run_count += 1
+            self._changed(current or job)
@@ -0,0 +1,325 @@
+"""
+Persistent write-behind store for bot state.
+
+Handlers only touch in-memory buffers; a background task flushes them to a
+SQLite database (WAL mode) in batches. All SQLite access happens on one
+dedicated worker thread so the event loop never waits on disk I/O.
+
+Group settings and chat breakers belong to one hosted bot and are keyed by
+(bot, chat_id); user activity, auto posts and scheduled jobs are shared.
+"""
+import asyncio
+import json
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_activity (
+    user_id INTEGER PRIMARY KEY,
+    username TEXT,
+    first_seen REAL NOT NULL,
+    last_activity REAL NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    activity_mask INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_user_activity_last ON user_activity(last_activity);
+CREATE TABLE IF NOT EXISTS auto_posts (
+    position INTEGER PRIMARY KEY,
+    content TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS group_settings (
+    bot TEXT NOT NULL,
+    chat_id INTEGER NOT NULL,
+    settings TEXT NOT NULL,
+    PRIMARY KEY (bot, chat_id)
+);
+CREATE TABLE IF NOT EXISTS scheduled_jobs (
+    name TEXT PRIMARY KEY,
+    state TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chat_breakers (
+    bot TEXT NOT NULL,
+    chat_id INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (bot, chat_id)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+UPSERT_USER = """
+INSERT INTO user_activity (user_id, username, first_seen, last_activity, message_count, activity_mask)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(user_id) DO UPDATE SET
+    username = COALESCE(excluded.username, user_activity.username),
+    first_seen = MIN(user_activity.first_seen, excluded.first_seen),
+    last_activity = MAX(user_activity.last_activity, excluded.last_activity),
+    message_count = user_activity.message_count + excluded.message_count,
+    activity_mask = user_activity.activity_mask | excluded.activity_mask
+"""
+
+# Rows written before bots were hosted together belong to the English bot
+LEGACY_BOT = "en"
+
+
+class BotStore:
+    """SQLite-backed store with an in-memory write buffer."""
+
+    def __init__(self, path: str, flush_interval: float = 5.0, batch_size: int = 500):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bot-store")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending_users: Dict[int, list] = {}
+        self._pending_auto_posts: Optional[List[str]] = None
+        self._pending_group_settings: Dict[Tuple[str, int], dict] = {}
+        self._pending_jobs: Dict[str, dict] = {}
+        self._pending_breakers: Dict[Tuple[str, int], dict] = {}
+        self._flush_wakeup: Optional[asyncio.Event] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+    # Worker-thread helpers
+
+    def _open(self) -> None:
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate_bot_keys()
+        self._conn.commit()
+
+    def _migrate_bot_keys(self) -> None:
+        """Key single-bot tables by (bot, chat_id) and prefix job names with the bot."""
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(group_settings)")]
+        if "bot" in columns:
+            return
+        with self._conn:
+            for table, column in (("group_settings", "settings"), ("chat_breakers", "state")):
+                self._conn.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+                self._conn.execute(
+                    f"CREATE TABLE {table} (bot TEXT NOT NULL, chat_id INTEGER NOT NULL, "
+                    f"{column} TEXT NOT NULL, PRIMARY KEY (bot, chat_id))"
+                )
+                self._conn.execute(
+                    f"INSERT INTO {table} (bot, chat_id, {column}) SELECT ?, chat_id, {column} FROM {table}_old",
+                    (LEGACY_BOT,),
+                )
+                self._conn.execute(f"DROP TABLE {table}_old")
+            self._conn.execute(
+                "UPDATE scheduled_jobs SET name = ? || '/' || name WHERE instr(name, '/') = 0", (LEGACY_BOT,)
+            )
+        logger.info(f"💾 Migrated group settings, breakers and jobs to bot '{LEGACY_BOT}'")
+
+    async def _run(self, fn: Callable, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    # Lifecycle
+
+    async def start(self) -> None:
+        """Open the database and start the background flush task."""
+        await self._run(self._open)
+        self._flush_wakeup = asyncio.Event()
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        logger.info(f"💾 Store opened at {self.path}")
+
+    async def close(self) -> None:
+        """Flush everything still buffered and close the database."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        if self._conn is not None:
+            await self.flush()
+            await self._run(self._conn.close)
+            self._conn = None
+        self._executor.shutdown(wait=True)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"❌ Error flushing store: {e}")
+
+    # Buffered writes (never block)
+
+    def record_user(self, user_id: int, username: Optional[str], first_seen: float,
+                    last_activity: float, message_delta: int, activity_mask: int) -> None:
+        """Buffer an activity update; deltas for the same user are coalesced."""
+        pending = self._pending_users.get(user_id)
+        if pending is None:
+            self._pending_users[user_id] = [username, first_seen, last_activity, message_delta, activity_mask]
+        else:
+            pending[0] = username or pending[0]
+            pending[1] = min(pending[1], first_seen)
+            pending[2] = max(pending[2], last_activity)
+            pending[3] += message_delta
+            pending[4] |= activity_mask
+        if len(self._pending_users) >= self.batch_size and self._flush_wakeup is not None:
+            self._flush_wakeup.set()
+
+    def save_auto_posts(self, posts: List[str]) -> None:
+        """Buffer a snapshot of the auto-post list."""
+        self._pending_auto_posts = list(posts)
+
+    def save_group_settings(self, bot: str, chat_id: int, settings: dict) -> None:
+        """Buffer the settings of one group of one bot."""
+        self._pending_group_settings[bot, chat_id] = dict(settings)
+
+    def save_job_state(self, name: str, state: dict) -> None:
+        """Buffer the persistent state of one scheduled job."""
+        self._pending_jobs[name] = dict(state)
+
+    def save_breaker(self, bot: str, chat_id: int, state: dict) -> None:
+        """Buffer the circuit-breaker state of one chat of one bot."""
+        self._pending_breakers[bot, chat_id] = dict(state)
+
+    async def flush(self) -> None:
+        """Write all buffered changes in one transaction.
+
+        If the transaction fails (e.g. "database is locked") the batch goes
+        back into the buffers, behind anything buffered since, and the error
+        is raised; the next flush retries it.
+        """
+        if self._conn is None:
+            return
+        users, self._pending_users = self._pending_users, {}
+        posts, self._pending_auto_posts = self._pending_auto_posts, None
+        groups, self._pending_group_settings = self._pending_group_settings, {}
+        jobs, self._pending_jobs = self._pending_jobs, {}
+        breakers, self._pending_breakers = self._pending_breakers, {}
+        if not users and posts is None and not groups and not jobs and not breakers:
+            return
+
+        user_rows = [(user_id, *p) for user_id, p in users.items()]
+        group_rows = [(bot, chat_id, json.dumps(settings)) for (bot, chat_id), settings in groups.items()]
+        job_rows = [(name, json.dumps(state)) for name, state in jobs.items()]
+        breaker_rows = [(bot, chat_id, json.dumps(state)) for (bot, chat_id), state in breakers.items()]
+
+        def write() -> None:
+            with self._conn:
+                if user_rows:
+                    self._conn.executemany(UPSERT_USER, user_rows)
+                if posts is not None:
+                    self._conn.execute("DELETE FROM auto_posts")
+                    self._conn.executemany(
+                        "INSERT INTO auto_posts (position, content) VALUES (?, ?)",
+                        list(enumerate(posts)),
+                    )
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES ('auto_posts_saved', '1')"
+                    )
+                if group_rows:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO group_settings (bot, chat_id, settings) VALUES (?, ?, ?)",
+                        group_rows,
+                    )
+                if job_rows:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO scheduled_jobs (name, state) VALUES (?, ?)",
+                        job_rows,
+                    )
+                if breaker_rows:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO chat_breakers (bot, chat_id, state) VALUES (?, ?, ?)",
+                        breaker_rows,
+                    )
+
+        try:
+            await self._run(write)
+        except BaseException:
+            self._requeue(users, posts, groups, jobs, breakers)
+            raise
+        logger.debug(f"💾 Flushed {len(user_rows)} users, {len(group_rows)} group settings")
+
+    def _requeue(self, users: Dict[int, list], posts: Optional[List[str]],
+                 groups: Dict[Tuple[str, int], dict], jobs: Dict[str, dict],
+                 breakers: Dict[Tuple[str, int], dict]) -> None:
+        """Put an unwritten batch back; snapshots buffered since it was taken win."""
+        for user_id, requeued in users.items():
+            pending = self._pending_users.get(user_id)
+            if pending is None:
+                self._pending_users[user_id] = requeued
+            else:
+                pending[0] = pending[0] or requeued[0]
+                pending[1] = min(pending[1], requeued[1])
+                pending[2] = max(pending[2], requeued[2])
+                pending[3] += requeued[3]
+                pending[4] |= requeued[4]
+        if self._pending_auto_posts is None:
+            self._pending_auto_posts = posts
+        self._pending_group_settings = {**groups, **self._pending_group_settings}
+        self._pending_jobs = {**jobs, **self._pending_jobs}
+        self._pending_breakers = {**breakers, **self._pending_breakers}
+
+    # Loading
+
+    async def load_auto_posts(self) -> Optional[List[str]]:
+        """Return the saved auto-post list, or None if it was never saved."""
+        def read() -> Optional[List[str]]:
+            saved = self._conn.execute("SELECT value FROM meta WHERE key = 'auto_posts_saved'").fetchone()
+            if not saved:
+                return None
+            return [row[0] for row in self._conn.execute("SELECT content FROM auto_posts ORDER BY position")]
+        return await self._run(read)
+
+    async def load_group_settings(self, bot: str) -> Dict[int, dict]:
+        """Return one bot's saved group settings keyed by chat ID."""
+        def read() -> Dict[int, dict]:
+            rows = self._conn.execute("SELECT chat_id, settings FROM group_settings WHERE bot = ?", (bot,))
+            return {chat_id: json.loads(settings) for chat_id, settings in rows}
+        return await self._run(read)
+
+    async def load_job_states(self) -> Dict[str, dict]:
+        """Return the saved state of every scheduled job keyed by name."""
+        def read() -> Dict[str, dict]:
+            rows = self._conn.execute("SELECT name, state FROM scheduled_jobs")
+            return {name: json.loads(state) for name, state in rows}
+        return await self._run(read)
+
+    async def load_breakers(self, bot: str) -> Dict[int, dict]:
+        """Return the saved circuit-breaker state of one bot's chats keyed by chat ID."""
+        def read() -> Dict[int, dict]:
+            rows = self._conn.execute("SELECT chat_id, state FROM chat_breakers WHERE bot = ?", (bot,))
+            return {chat_id: json.loads(state) for chat_id, state in rows}
+        return await self._run(read)
+
+    async def iter_users(self, since: float = 0, batch_size: int = 1000):
+        """Yield users active since `since`, oldest first, in batches of
+        (user_id, username, first_seen, last_activity, message_count, activity_mask)."""
+        after = (since, None)
+        while True:
+            def read(after=after) -> List[Tuple]:
+                last_activity, user_id = after
+                if user_id is None:
+                    cursor = self._conn.execute(
+                        "SELECT * FROM user_activity WHERE last_activity >= ? "
+                        "ORDER BY last_activity, user_id LIMIT ?",
+                        (last_activity, batch_size))
+                else:
+                    cursor = self._conn.execute(
+                        "SELECT * FROM user_activity WHERE (last_activity, user_id) > (?, ?) "
+                        "ORDER BY last_activity, user_id LIMIT ?",
+                        (last_activity, user_id, batch_size))
+                return cursor.fetchall()
+            rows = await self._run(read)
+            if not rows:
+                return
+            yield rows
+            after = (rows[-1][3], rows[-1][0])
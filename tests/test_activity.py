@@ -0,0 +1,52 @@
+from activity import ActivityTracker
+
+DAY = 86400
+NOW = 100 * DAY
+
+
+def saved(user_id: int, last_activity: int) -> tuple:
+    return user_id, f"saved{user_id}", last_activity - DAY, last_activity, 1, 1
+
+
+def tracker(max_users: int = 100) -> ActivityTracker:
+    return ActivityTracker(max_users=max_users, ttl=30 * DAY, evict_batch=1, clock=lambda: NOW)
+
+
+def test_merge_keeps_last_activity_order():
+    activity = tracker()
+    activity.track(1, "live", "message", now=NOW)
+    activity.merge([saved(2, NOW - 2 * DAY), saved(3, NOW - DAY)])
+    assert [user_id for user_id, _ in activity.items()] == [2, 3, 1]
+
+
+def test_expired_saved_users_are_evicted_after_merge():
+    activity = tracker()
+    activity.track(1, "live", "message", now=NOW)
+    activity.merge([saved(2, NOW - 40 * DAY), saved(3, NOW - DAY)])
+    assert 2 not in activity
+    activity.track(4, "live", "message", now=NOW + 1)
+    assert activity.evict_expired(NOW + 1) == 0
+    assert [user_id for user_id, _ in activity.items()] == [3, 1, 4]
+
+
+def test_cap_eviction_after_merge_keeps_live_users():
+    evicted = []
+    activity = ActivityTracker(max_users=3, ttl=30 * DAY, evict_batch=1, clock=lambda: NOW,
+                               on_evict=lambda user_id, record: evicted.append(user_id))
+    activity.track(1, "live", "message", now=NOW)
+    activity.merge([saved(2, NOW - 3 * DAY), saved(3, NOW - 2 * DAY), saved(4, NOW - DAY)])
+    assert evicted == [2]
+    activity.track(5, "live", "message", now=NOW + 1)
+    assert evicted == [2, 3]
+    assert 1 in activity and 5 in activity
+
+
+def test_merge_into_seen_user_combines_counts():
+    activity = tracker()
+    activity.track(1, None, "message", now=NOW)
+    activity.merge([saved(1, NOW - DAY)])
+    record = activity.get(1)
+    assert record.message_count == 2
+    assert record.username == "saved1"
+    assert record.first_seen == NOW - 2 * DAY
+    assert activity.total_messages == 2
@@ -0,0 +1,54 @@
+import asyncio
+
+from telegram.error import ChatMigrated, Forbidden
+
+from broadcast import BroadcastEngine
+from outbound import BROADCAST, OutboundShed
+
+
+class FailingBot:
+    def __init__(self, error_for):
+        self.error_for = error_for
+        self.calls = 0
+
+    async def send_message(self, chat_id, **kwargs):
+        self.calls += 1
+        raise self.error_for(chat_id)
+
+
+def run_rounds(error_for, rounds: int = 3):
+    saved = {}
+    engine = BroadcastEngine(global_rate=1000, chat_rate=1000, chat_burst=1000, max_retries=2,
+                             failure_threshold=3,
+                             on_breaker_change=lambda chat_id, breaker: saved.update({chat_id: breaker.to_dict()}))
+    bot = FailingBot(error_for)
+    stats = [asyncio.run(engine.broadcast(bot, [-100], "post")) for _ in range(rounds)]
+    return engine, stats, saved
+
+
+def test_shed_sends_never_open_the_chat_breaker():
+    engine, stats, saved = run_rounds(lambda chat_id: OutboundShed(BROADCAST, retry_after=0))
+    assert [round_stats.failed for round_stats in stats] == [1, 1, 1]
+    assert engine.open_breakers() == 0
+    assert -100 not in engine.breakers
+    assert saved == {}
+
+
+def test_chat_errors_open_the_breaker():
+    engine, stats, saved = run_rounds(lambda chat_id: Forbidden("bot was kicked"), rounds=1)
+    assert engine.breakers[-100].is_open
+    assert saved[-100]["backoff"] > 0
+
+
+def test_endless_migration_counts_towards_the_breaker():
+    engine, stats, _ = run_rounds(lambda chat_id: ChatMigrated(chat_id - 1), rounds=1)
+    assert stats[0].failed == 1
+    assert engine.breakers[engine.resolve_chat(-100)].failures == 1
+
+
+def test_restore_breakers_replace_drops_breakers_missing_from_the_store():
+    engine, _, saved = run_rounds(lambda chat_id: Forbidden("bot was kicked"), rounds=1)
+    # Another instance reset the breaker of -100 and opened one for -200
+    engine.restore_breakers({-200: saved[-100]}, replace=True)
+    assert set(engine.breakers) == {-200}
+    assert engine.breakers[-200].is_open
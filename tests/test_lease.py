@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+from lease import LeaderElection, Lease
+
+TTL = 0.6
+HEARTBEAT = 0.1
+
+
+class Candidate:
+    """One instance campaigning for the lease, recording when it was elected."""
+
+    def __init__(self, path: str, name: str):
+        self.elected = asyncio.Queue()
+        self.demoted = 0
+        self.election = LeaderElection(Lease(path, "scheduler", ttl=TTL, holder=name),
+                                       self.on_elected, self.on_demoted, heartbeat=HEARTBEAT)
+
+    async def on_elected(self, token: int) -> None:
+        self.elected.put_nowait((token, time.monotonic()))
+
+    async def on_demoted(self) -> None:
+        self.demoted += 1
+
+
+def test_graceful_and_crash_handoff(tmp_path):
+    async def scenario():
+        path = str(tmp_path / "leases.sqlite3")
+        a = Candidate(path, "A")
+        a.election.start()
+        token_a, _ = await asyncio.wait_for(a.elected.get(), timeout=1)
+        b = Candidate(path, "B")
+        b.election.start()
+        await asyncio.sleep(TTL)
+        assert b.elected.empty()
+
+        # Graceful: A releases the lease on shutdown, B takes over within a heartbeat
+        await a.election.stop()
+        stopped_at = time.monotonic()
+        token_b, elected_at = await asyncio.wait_for(b.elected.get(), timeout=1)
+        graceful = elected_at - stopped_at
+
+        # Crash: B dies without releasing, A only takes over once the lease expired
+        a = Candidate(path, "A")
+        a.election.start()
+        await asyncio.sleep(TTL)
+        assert a.elected.empty()
+        b.election.lease.release = lambda: None
+        await b.election.stop()
+        killed_at = time.monotonic()
+        token_a2, elected_at = await asyncio.wait_for(a.elected.get(), timeout=TTL * 3)
+        crash = elected_at - killed_at
+
+        await a.election.stop()
+        return (token_a, token_b, token_a2), graceful, crash, b.demoted
+
+    tokens, graceful, crash, demoted = asyncio.run(scenario())
+    assert tokens[0] < tokens[1] < tokens[2]
+    assert graceful <= HEARTBEAT * 2
+    assert TTL - HEARTBEAT * 2 <= crash <= TTL + HEARTBEAT * 2
+    assert demoted == 1
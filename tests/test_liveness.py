@@ -0,0 +1,50 @@
+from liveness import DEGRADED, HEALTHY, UNHEALTHY, LivenessMonitor
+
+
+class FakeClock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def monitor_at(monkeypatch, clock: FakeClock) -> LivenessMonitor:
+    monkeypatch.setattr("liveness.time.monotonic", clock)
+    return LivenessMonitor(poll_degraded=60.0, poll_unhealthy=180.0)
+
+
+def test_standby_bots_are_not_judged_on_get_updates(monkeypatch):
+    clock = FakeClock(1000.0)
+    monitor = monitor_at(monkeypatch, clock)
+    clock.now += 600
+    # Waiting for the instance lease: nothing polled, nothing stale
+    assert monitor.status()[0] == HEALTHY
+
+    monitor.start_polling("main")
+    clock.now += 30
+    state, details = monitor.status()
+    assert state == HEALTHY
+    assert details["seconds_since_get_updates"] == 30.0
+    assert details["polling_bots"] == ["main"]
+
+
+def test_poll_staleness_is_tracked_per_bot(monkeypatch):
+    clock = FakeClock(1000.0)
+    monitor = monitor_at(monkeypatch, clock)
+    monitor.start_polling("main")
+    monitor.start_polling("support")
+    clock.now += 100
+    monitor.mark_get_updates("main")
+    # One bot's fresh getUpdates does not hide the other's stall
+    assert monitor.status()[0] == DEGRADED
+    clock.now += 100
+    monitor.mark_get_updates("main")
+    assert monitor.status()[0] == UNHEALTHY
+
+    # The lease went to another instance: a late response does not bring the bot back
+    monitor.stop_polling("support")
+    monitor.mark_get_updates("support")
+    state, details = monitor.status()
+    assert state == HEALTHY
+    assert details["polling_bots"] == ["main"]
@@ -0,0 +1,103 @@
+import asyncio
+
+import aiohttp
+from telegram import Update
+from telegram.ext import ApplicationBuilder, TypeHandler
+
+from fake_bot_api import StubRequest
+from ordering import ChatOrderedApplication
+from web_server import WebServer
+
+QUEUE_SIZE = 10
+MAX_PENDING = 5
+WEBHOOK_PORT = 8591
+
+
+def message_update(update_id: int) -> dict:
+    chat = {"id": -1001000000000 - update_id % 50, "type": "supergroup", "title": "Group"}
+    sender = {"id": 1000 + update_id, "is_bot": False, "first_name": "User"}
+    return {"update_id": update_id,
+            "message": {"message_id": update_id, "date": 0, "chat": chat, "from": sender, "text": "hi"}}
+
+
+async def blocked_application(release: asyncio.Event):
+    application = (
+        ApplicationBuilder()
+        .token("123456:TEST")
+        .request(StubRequest())
+        .application_class(ChatOrderedApplication, kwargs={"max_running": 32})
+        .concurrent_updates(MAX_PENDING)
+        .update_queue(asyncio.Queue(maxsize=QUEUE_SIZE))
+        .updater(None)
+        .build()
+    )
+
+    async def handle(update, context):
+        await release.wait()
+
+    application.add_handler(TypeHandler(Update, handle))
+    await application.initialize()
+    await application.start()
+    return application
+
+
+def test_admission_bounds_pending_updates_and_fills_queue():
+    async def scenario():
+        release = asyncio.Event()
+        application = await blocked_application(release)
+        try:
+            queued = 0
+            for update_id in range(200):
+                try:
+                    application.update_queue.put_nowait(Update.de_json(message_update(update_id), application.bot))
+                except asyncio.QueueFull:
+                    break
+                queued += 1
+                await asyncio.sleep(0)
+            await asyncio.sleep(0.05)
+            state = (queued, application.update_queue.qsize(), application.admitted_updates,
+                     len(asyncio.all_tasks()))
+
+            release.set()
+            await asyncio.wait_for(application.update_queue.join(), timeout=5)
+            return state, application.admitted_updates
+        finally:
+            release.set()
+            await application.stop()
+            await application.shutdown()
+
+    (queued, queue_size, admitted, tasks), admitted_after = asyncio.run(scenario())
+    assert queued == MAX_PENDING + QUEUE_SIZE
+    assert queue_size == QUEUE_SIZE
+    assert admitted == MAX_PENDING
+    assert tasks < 20
+    assert admitted_after == 0
+
+
+def test_webhook_answers_503_while_admission_is_full():
+    async def scenario():
+        release = asyncio.Event()
+        application = await blocked_application(release)
+        server = WebServer({"/webhook": application}, host="127.0.0.1", port=WEBHOOK_PORT,
+                           enqueue_timeout=0.1)
+        await server.start()
+        statuses = []
+        try:
+            async with aiohttp.ClientSession() as session:
+                for update_id in range(MAX_PENDING + QUEUE_SIZE + 3):
+                    async with session.post(f"http://127.0.0.1:{WEBHOOK_PORT}/webhook",
+                                            json=message_update(update_id)) as response:
+                        statuses.append(response.status)
+            release.set()
+            await asyncio.wait_for(application.update_queue.join(), timeout=5)
+        finally:
+            release.set()
+            await server.stop()
+            await application.stop()
+            await application.shutdown()
+        return statuses, server.rejected_updates
+
+    statuses, rejected = asyncio.run(scenario())
+    assert statuses[:MAX_PENDING + QUEUE_SIZE] == [200] * (MAX_PENDING + QUEUE_SIZE)
+    assert statuses[MAX_PENDING + QUEUE_SIZE:] == [503] * 3
+    assert rejected == 3
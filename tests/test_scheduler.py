@@ -0,0 +1,108 @@
+import asyncio
+
+from scheduler import CATCH_UP, SKIP, Job, Scheduler
+
+
+class FakeClock:
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def run_briefly(scheduler: Scheduler, seconds: float = 0.05) -> None:
+    task = asyncio.create_task(scheduler.run())
+    await asyncio.sleep(seconds)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+def run_late(misfire: str):
+    """Add a 10s job at t=1000, jump the clock to t=1035 and let the scheduler run."""
+    async def scenario():
+        clock = FakeClock(1000.0)
+        runs = []
+
+        async def callback():
+            runs.append(clock())
+
+        scheduler = Scheduler(clock=clock)
+        job = scheduler.add(Job("post", callback, interval=10, misfire=misfire))
+        assert job.due == 1010.0
+        clock.now = 1035.0
+        await run_briefly(scheduler)
+        return runs, job
+
+    return asyncio.run(scenario())
+
+
+def test_late_catch_up_fires_once_and_returns_to_grid():
+    runs, job = run_late(CATCH_UP)
+    assert runs == [1035.0]
+    assert job.due == 1040.0
+
+
+def test_late_skip_waits_for_the_next_slot():
+    runs, job = run_late(SKIP)
+    assert runs == []
+    assert job.due == 1040.0
+
+
+def test_restored_catch_up_job_runs_once():
+    async def scenario():
+        clock = FakeClock(1035.0)
+        runs = []
+
+        async def callback():
+            runs.append(clock())
+
+        scheduler = Scheduler(clock=clock)
+        scheduler.restore({"post": {"next_run": 1010.0, "last_run": 1000.0, "paused": False,
+                                    "run_count": 1, "interval": 10}})
+        job = scheduler.add(Job("post", callback, interval=10, misfire=CATCH_UP))
+        await run_briefly(scheduler)
+        return runs, job
+
+    runs, job = asyncio.run(scenario())
+    assert runs == [1035.0]
+    assert job.due == 1040.0
+    assert job.run_count == 2
+
+
+def test_replaced_job_keeps_overlap_protection():
+    async def scenario():
+        clock = FakeClock(1009.5)
+        release = asyncio.Event()
+        runs = []
+
+        async def callback():
+            runs.append(clock())
+            await release.wait()
+
+        scheduler = Scheduler(clock=clock)
+        scheduler.add(Job("post", callback, interval=10))
+        task = asyncio.create_task(scheduler.run())
+        clock.now = 1010.0
+        scheduler._wakeup.set()
+        await asyncio.sleep(0.01)
+        assert runs == [1010.0]
+
+        # Rebuilt while the first run is still in progress, e.g. after a group joined
+        replacement = scheduler.add(Job("post", callback, interval=10))
+        assert replacement.running
+        clock.now = 1020.0
+        scheduler._wakeup.set()
+        await asyncio.sleep(0.01)
+        assert runs == [1010.0]
+
+        release.set()
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return replacement
+
+    replacement = asyncio.run(scenario())
+    assert not replacement.running
+    assert replacement.run_count == 1
+    assert replacement.last_run == 1010.0
@@ -0,0 +1,48 @@
+import asyncio
+import sqlite3
+
+from storage import BotStore
+
+
+def test_failed_flush_keeps_the_batch(tmp_path):
+    path = str(tmp_path / "bot.sqlite3")
+
+    async def scenario():
+        store = BotStore(path, flush_interval=3600)
+        await store.start()
+        try:
+            store.record_user(1, "alice", 100, 200, 2, 1)
+            store.save_group_settings("en", -100, {"auto_post_interval": 600})
+            store.save_auto_posts(["first"])
+
+            # Make the transaction fail from another connection
+            other = sqlite3.connect(path)
+            other.execute("ALTER TABLE user_activity RENAME TO user_activity_away")
+            other.commit()
+            try:
+                await store.flush()
+            except sqlite3.OperationalError:
+                pass
+            else:
+                raise AssertionError("flush should have failed")
+
+            # Changes buffered after the failed batch are coalesced with it
+            store.record_user(1, None, 50, 300, 3, 2)
+            store.save_group_settings("en", -100, {"auto_post_interval": 900})
+            other.execute("ALTER TABLE user_activity_away RENAME TO user_activity")
+            other.commit()
+            other.close()
+            await store.flush()
+
+            return (
+                await store._run(lambda: store._conn.execute("SELECT * FROM user_activity").fetchall()),
+                await store.load_group_settings("en"),
+                await store.load_auto_posts(),
+            )
+        finally:
+            await store.close()
+
+    users, groups, posts = asyncio.run(scenario())
+    assert users == [(1, "alice", 50.0, 300.0, 5, 3)]
+    assert groups == {-100: {"auto_post_interval": 900}}
+    assert posts == ["first"]
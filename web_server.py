@@ -0,0 +1,111 @@
+"""
+Async HTTP server for health checks and Telegram webhooks.
+
+The server runs on the same event loop as the bot applications. Each
+webhook path belongs to one `Application`; its updates are decoded and put
+straight into that application's `update_queue`, which
+is bounded (see `ApplicationBuilder.update_queue`); when it stays full for
+longer than `enqueue_timeout` the request is answered with 503 so Telegram
+retries it later instead of the process buffering without limit.
+"""
+import asyncio
+import logging
+from typing import Dict, Optional
+
+from aiohttp import web
+from telegram import Update
+from telegram.ext import Application
+
+from liveness import UNHEALTHY, LivenessMonitor
+from metrics import MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class WebServer:
+    """aiohttp server exposing /, /health, /metrics and (in webhook mode) one webhook per bot."""
+
+    def __init__(
+        self,
+        webhooks: Optional[Dict[str, Application]] = None,
+        host: str = "0.0.0.0",
+        port: int = 8000,
+        secret_token: Optional[str] = None,
+        enqueue_timeout: float = 1.0,
+        metrics: Optional[MetricsRegistry] = None,
+        liveness: Optional[LivenessMonitor] = None,
+    ):
+        self.webhooks = dict(webhooks or {})  # path -> application receiving its updates
+        self.host = host
+        self.port = port
+        self.secret_token = secret_token
+        self.enqueue_timeout = enqueue_timeout
+        self.metrics = metrics
+        self.liveness = liveness
+        self.rejected_updates = 0
+        self._runner: Optional[web.AppRunner] = None
+
+        self.app = web.Application()
+        self.app.router.add_get("/", self.home)
+        self.app.router.add_get("/health", self.health)
+        if metrics:
+            self.app.router.add_get("/metrics", self.metrics_endpoint)
+        for path in self.webhooks:
+            self.app.router.add_post(path, self.webhook)
+        if "/webhook" not in self.webhooks:
+            self.app.router.add_post("/webhook", self.webhook_disabled)
+
+    async def start(self) -> None:
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        logger.info(f"🌐 Web server listening on {self.host}:{self.port}")
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def home(self, request: web.Request) -> web.Response:
+        return web.Response(text="TrustCoin Bot FULL VERSION is running! ✅")
+
+    async def health(self, request: web.Request) -> web.Response:
+        """Report liveness; unhealthy answers 503 so orchestrators restart the process."""
+        if not self.liveness:
+            return web.json_response({"status": "healthy", "bot": "running", "version": "full"})
+        state, details = self.liveness.status()
+        return web.json_response(
+            {"status": state, "bot": "running", "version": "full", **details},
+            status=503 if state == UNHEALTHY else 200,
+        )
+
+    async def metrics_endpoint(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.metrics.render(), content_type="text/plain",
+                            headers={"X-Content-Type-Options": "nosniff"}, charset="utf-8")
+
+    async def webhook_disabled(self, request: web.Request) -> web.Response:
+        return web.Response(text="Webhook not configured for polling mode", status=404)
+
+    async def webhook(self, request: web.Request) -> web.Response:
+        """Decode an update and hand it to the bounded queue of the path's application."""
+        if self.secret_token and request.headers.get("X-Telegram-Bot-Api-Secret-Token") != self.secret_token:
+            return web.Response(text="Forbidden", status=403)
+        application = self.webhooks[request.match_info.route.resource.canonical]
+        try:
+            update = Update.de_json(await request.json(), application.bot)
+        except Exception as e:
+            logger.error(f"Error decoding webhook update: {e}")
+            return web.Response(text="Bad Request", status=400)
+
+        queue = application.update_queue
+        try:
+            queue.put_nowait(update)
+        except asyncio.QueueFull:
+            try:
+                await asyncio.wait_for(queue.put(update), timeout=self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected_updates += 1
+                logger.warning("⚠️ Update queue full - asking Telegram to retry")
+                return web.Response(text="Busy", status=503, headers={"Retry-After": "1"})
+        return web.Response(text="OK")
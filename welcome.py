@@ -0,0 +1,138 @@
+"""
+Per-chat coalescing of welcome messages.
+
+Instead of one message per join, joins are collected per chat and greeted
+together when the chat's window closes. The window adapts to the join
+rate: it starts at `min_window`, doubles every time a batch greets more
+than one member (a burst is going on) and halves back when a batch greets
+a single member, within `max_window`. After `max_window` without joins
+the window starts over at `min_window`. A lone join is welcomed after a
+couple of seconds; during a raid each chat gets about one message per
+`max_window`.
+
+Each message names at most `max_names` members; the rest are counted. With
+`delete_previous` the chat's previous welcome is deleted once the new one
+is out, so only one stays visible.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set
+
+from telegram import User
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChatWelcomes:
+    """Joins waiting to be greeted in one chat, and the chat's current window."""
+    title: str
+    window: float
+    pending: Dict[int, User] = field(default_factory=dict)
+    timer: Optional[asyncio.TimerHandle] = None
+    last_flush: float = 0.0
+    last_message_id: Optional[int] = None
+
+
+class WelcomeAggregator:
+    """Collects joins per chat and sends one welcome per window."""
+
+    def __init__(
+        self,
+        render: Callable[[str, List[User], int], str],
+        min_window: float = 2.0,
+        max_window: float = 60.0,
+        max_names: int = 10,
+        delete_previous: bool = False,
+        parse_mode: Optional[str] = "Markdown",
+        send_kwargs: Optional[dict] = None,
+    ):
+        self.render = render  # (chat title, members to name, number of others) -> text
+        self.min_window = min_window
+        self.max_window = max_window
+        self.max_names = max_names
+        self.delete_previous = delete_previous
+        self.parse_mode = parse_mode
+        self.send_kwargs = send_kwargs or {}  # Extra send/delete arguments, e.g. rate_limit_args
+        self.chats: Dict[int, ChatWelcomes] = {}
+        self._bot = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def add(self, bot, chat_id: int, title: str, user: User) -> None:
+        """Queue a welcome for `user`; the chat's window starts with its first pending join."""
+        self._bot = bot
+        chat = self.chats.get(chat_id)
+        if chat is None:
+            chat = self.chats[chat_id] = ChatWelcomes(title=title, window=self.min_window)
+        chat.title = title
+        chat.pending[user.id] = user
+        if chat.timer is None:
+            if time.monotonic() - chat.last_flush >= self.max_window:
+                chat.window = self.min_window
+            loop = asyncio.get_running_loop()
+            chat.timer = loop.call_later(chat.window, self._start_flush, chat_id)
+
+    def discard(self, chat_id: int, user_id: int) -> None:
+        """Drop a pending welcome, e.g. when the member left before it was sent."""
+        chat = self.chats.get(chat_id)
+        if chat is not None:
+            chat.pending.pop(user_id, None)
+
+    def pending(self) -> int:
+        return sum(len(chat.pending) for chat in self.chats.values())
+
+    def _start_flush(self, chat_id: int) -> None:
+        task = asyncio.create_task(self.flush(chat_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self, chat_id: int) -> None:
+        """Send the chat's pending welcomes now and adapt its window."""
+        chat = self.chats.get(chat_id)
+        if chat is None:
+            return
+        if chat.timer is not None:
+            chat.timer.cancel()
+            chat.timer = None
+        members = list(chat.pending.values())
+        chat.pending.clear()
+        chat.last_flush = time.monotonic()
+        if not members:
+            return
+
+        if len(members) > 1:
+            chat.window = min(self.max_window, chat.window * 2)
+        else:
+            chat.window = max(self.min_window, chat.window / 2)
+
+        named = members[: self.max_names]
+        text = self.render(chat.title, named, len(members) - len(named))
+        try:
+            message = await self._bot.send_message(
+                chat_id=chat_id, text=text, parse_mode=self.parse_mode, **self.send_kwargs
+            )
+        except Exception as e:
+            logger.error("Error sending welcome message: %s", e, extra={"chat_id": chat_id})
+            return
+        logger.info("Welcome message sent to %s new members in %s", len(members), chat.title,
+                    extra={"category": "reply", "chat_id": chat_id})
+
+        previous, chat.last_message_id = chat.last_message_id, message.message_id
+        if self.delete_previous and previous is not None:
+            try:
+                await self._bot.delete_message(chat_id=chat_id, message_id=previous, **self.send_kwargs)
+            except Exception as e:
+                logger.warning("Could not delete previous welcome in %s: %s", chat_id, e,
+                               extra={"chat_id": chat_id})
+
+    async def close(self) -> None:
+        """Cancel pending windows and in-flight sends."""
+        for chat in self.chats.values():
+            if chat.timer is not None:
+                chat.timer.cancel()
+                chat.timer = None
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)